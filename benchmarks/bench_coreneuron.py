@@ -0,0 +1,50 @@
+'''
+wall time of the 100mN protocol simulated by NEURON and by CoreNEURON: the
+network is created once and simulated by both, the spikes of the CoreNEURON
+run must be those of the NEURON one.
+
+run from the model directory (mods compiled with nrnivmodl -coreneuron mods):
+>> python benchmarks/bench_coreneuron.py [duration (ms)]
+e.g. python benchmarks/bench_coreneuron.py 5000
+'''
+
+import os
+import sys
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from netpyne import sim
+from cfg_mechanical import cfg
+import solver
+
+def bench(duration):
+    """
+    Returns [(solver, wall time (s), number of spikes, same spikes as the
+    NEURON run)] of the 100mN protocol simulated for duration ms
+    """
+    cfg.duration = duration
+    cfg.stim_ratios, cfg.freq, cfg.protocol = 0.25, '100mN', None
+    cfg.stream_window = None
+    cfg.analysis, cfg.saveJson, cfg.savePickle = {}, False, False
+    cfg.verbose, cfg.printPopAvgRates = False, False
+    from netParams_mechanical import netParams
+    sim.create(netParams, cfg)
+    results, ref = [], None
+    for name, use in (('NEURON', solver.use_neuron), ('CoreNEURON', solver.use_coreneuron)):
+        use(cfg)
+        start = time.time()
+        sim.simulate()
+        wall = time.time() - start
+        spikes = sorted(zip(sim.allSimData['spkt'], sim.allSimData['spkid']))
+        if ref is None:
+            ref = spikes
+        results.append((name, wall, len(spikes), spikes == ref))
+    solver.use_neuron(cfg)
+    return results
+
+if __name__ == '__main__':
+    duration = float(sys.argv[1]) if len(sys.argv) > 1 else cfg.duration
+    results = bench(duration)
+    print('\n%g ms of 100mN' %duration)
+    print('    solver  wall (s)  speedup  spikes  same')
+    for name, wall, nspikes, same in results:
+        print('%10s  %8.2f  %7.2f  %6d  %s' %(name, wall, results[0][1] / wall, nspikes, same))
@@ -0,0 +1,116 @@
+'''
+wall time and spike timing error of the variable time step runs of the 100mN
+protocol against the fixed step (cfg.dt) run: the network is simulated with
+the fixed step, global CVODE and the local variable time step, for a list of
+absolute tolerances. every run is made from a cold start in its own process
+(network created for its mode, mechanisms and tables built afresh), as a
+simulation would be.
+
+run from the model directory (mods compiled with nrnivmodl mods):
+>> python benchmarks/bench_cvode.py [duration (ms)] [atol ...]
+e.g. python benchmarks/bench_cvode.py 5000 1e-2 1e-3 1e-4
+'''
+
+import os
+import sys
+import time
+import pickle
+import tempfile
+import subprocess
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import numpy as np
+from netpyne import sim
+from cfg_mechanical import cfg
+import solver
+
+def spike_trains():
+    """
+    Returns {gid: sorted spike times (ms)} of the last run
+    """
+    trains = {}
+    for t, gid in zip(sim.allSimData['spkt'], sim.allSimData['spkid']):
+        trains.setdefault(int(gid), []).append(t)
+    return {gid: np.sort(t) for gid, t in trains.items()}
+
+def spike_error(ref, trains, window=2.0):
+    """
+    Returns (fraction of the spikes of ref matched in trains, mean and max
+    absolute timing error (ms) of the matched spikes, number of spikes of
+    trains matching none): a spike is matched by the nearest spike of its
+    cell within window ms
+    """
+    errors, matched, unmatched = [], 0, 0
+    for gid in set(ref) | set(trains):
+        r, s = ref.get(gid, np.zeros(0)), trains.get(gid, np.zeros(0))
+        if len(r) and len(s):
+            i = np.clip(np.searchsorted(s, r), 1, len(s)) - 1
+            j = np.clip(i + 1, 0, len(s) - 1)
+            d = np.minimum(np.abs(s[i] - r), np.abs(s[j] - r))
+            errors.extend(d[d <= window])
+            matched += int((d <= window).sum())
+        if len(s):
+            if len(r):
+                i = np.clip(np.searchsorted(r, s), 1, len(r)) - 1
+                j = np.clip(i + 1, 0, len(r) - 1)
+                unmatched += int((np.minimum(np.abs(r[i] - s), np.abs(r[j] - s)) > window).sum())
+            else:
+                unmatched += len(s)
+    nref = sum(len(r) for r in ref.values())
+    errors = np.array(errors)
+    return (matched / nref if nref else 1.0, errors.mean() if len(errors) else 0.0,
+            errors.max() if len(errors) else 0.0, unmatched)
+
+def run(mode, atol, duration):
+    """
+    Returns (wall time (s), spike_trains) of the 100mN protocol simulated for
+    duration ms in mode ('fixed', 'cvode' or 'lvardt'), the network created
+    for that mode
+    """
+    cfg.duration = duration
+    cfg.stim_ratios, cfg.freq, cfg.protocol = 0.25, '100mN', None
+    cfg.analysis, cfg.saveJson, cfg.savePickle = {}, False, False
+    cfg.verbose, cfg.printPopAvgRates = False, False
+    cfg.recordTraces = {}
+    if mode == 'fixed':
+        solver.use_fixed_step(cfg)
+    else:
+        solver.use_cvode(cfg, local=(mode == 'lvardt'), atol=atol)
+    from netParams_mechanical import netParams
+    sim.create(netParams, cfg)
+    start = time.time()
+    sim.simulate()
+    wall = time.time() - start
+    return wall, spike_trains()
+
+def bench(duration, atols):
+    """
+    Returns [(mode, atol, wall time (s), number of spikes, spike_error against
+    the fixed step run)] of the 100mN protocol simulated for duration ms, each
+    run in a new process
+    """
+    runs = [('fixed', None)] + [(mode, atol) for atol in atols for mode in ('cvode', 'lvardt')]
+    results, ref = [], None
+    with tempfile.TemporaryDirectory() as tmp:
+        for i, (mode, atol) in enumerate(runs):
+            out = os.path.join(tmp, 'run%d.pkl' %i)
+            subprocess.check_call([sys.executable, os.path.abspath(__file__), 'run', mode, repr(atol), repr(duration), out])
+            with open(out, 'rb') as f:
+                wall, trains = pickle.load(f)
+            if ref is None:
+                ref = trains
+            results.append((mode, atol, wall, sum(len(t) for t in trains.values()), spike_error(ref, trains)))
+    return results
+
+if __name__ == '__main__' and sys.argv[1:2] == ['run']:
+    mode, atol, duration, out = sys.argv[2], None if sys.argv[3] == 'None' else float(sys.argv[3]), float(sys.argv[4]), sys.argv[5]
+    with open(out, 'wb') as f:
+        pickle.dump(run(mode, atol, duration), f)
+elif __name__ == '__main__':
+    duration = float(sys.argv[1]) if len(sys.argv) > 1 else cfg.duration
+    atols = [float(a) for a in sys.argv[2:]] or [1e-2, 1e-3]
+    results = bench(duration, atols)
+    print('\n%g ms of 100mN, fixed step dt = %g ms' %(duration, cfg.dt))
+    print('  mode     atol  wall (s)  speedup  spikes  matched  mean err (ms)  max err (ms)  extra')
+    for mode, atol, wall, nspikes, (matched, mean, worst, extra) in results:
+        print('%6s  %7s  %8.2f  %7.2f  %6d  %7.3f  %13.4f  %12.4f  %5d' %(mode, '%g' %atol if atol else '-',
+              wall, results[0][2] / wall, nspikes, matched, mean, worst, extra))
@@ -0,0 +1,108 @@
+'''
+cost of the DynSyn synapses against their event-driven variants
+(cfg.eventSynapses): ns per synapse and step of n synapses on one compartment,
+silent and driven by Poisson events, then the 100mN protocol simulated on one
+network with both, the spike times of both runs being compared (the
+event-driven conductance leads by half a step, see mods/AMPA_DynSynEv.mod, so
+the spikes may shift).
+
+run from the model directory (mods compiled with nrnivmodl mods):
+>> python benchmarks/bench_evsyn.py [duration (ms)] [synapses]
+e.g. python benchmarks/bench_evsyn.py 5000 5000
+'''
+
+import os
+import sys
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import numpy as np
+from neuron import h
+from netpyne import sim
+from cfg_mechanical import cfg
+import connectivity
+
+def synapse_cost(mod, n, rate=0.0, tstop=200.0, dt=0.025, seed=1):
+    """
+    Returns the wall time (ns) per synapse and step of n synapses of mod on one
+    compartment, each receiving Poisson events at rate (Hz)
+    """
+    h.load_file('stdrun.hoc')
+    sec = h.Section(name='bench_evsyn')
+    sec.insert('pas')
+    rng = np.random.default_rng(seed)
+    syns, stims, ncs = [], [], []
+    for i in range(n):
+        syns.append(getattr(h, mod)(sec(0.5)))
+        if rate > 0:
+            t = np.cumsum(rng.exponential(1000.0 / rate, int(3 * rate * tstop / 1000) + 5))
+            stims.append((h.VecStim(), h.Vector(t[t < tstop])))
+            stims[-1][0].play(stims[-1][1])
+            ncs.append(h.NetCon(stims[-1][0], syns[-1]))
+            ncs[-1].weight[0] = 1e-6
+    h.dt = dt
+    h.finitialize(-65)
+    start = time.time()
+    h.continuerun(tstop)
+    return (time.time() - start) * 1e9 / (n * tstop / dt)
+
+def compare(ref, spikes):
+    """
+    Returns the number of cells whose spike count differs between ref and
+    spikes ({gid: spike times}), the number of spikes of the other cells
+    that moved, and the largest move (ms)
+    """
+    changed = shifted = 0
+    largest = 0.0
+    for gid in set(ref) | set(spikes):
+        a, b = ref.get(gid, []), spikes.get(gid, [])
+        if len(a) != len(b):
+            changed += 1
+            continue
+        moves = np.abs(np.array(a) - np.array(b))
+        shifted += int(np.sum(moves > 1e-9))
+        largest = max(largest, float(moves.max()) if len(moves) else 0.0)
+    return changed, shifted, largest
+
+def bench(duration):
+    """
+    Returns [(cfg.eventSynapses, wall time (s), number of spikes, number of
+    cells whose spike count changed, number of the other spikes that moved,
+    largest move (ms))] of the 100mN protocol simulated for duration ms
+    """
+    cfg.duration = duration
+    cfg.stim_ratios, cfg.freq, cfg.protocol = 0.25, '100mN', None
+    cfg.analysis, cfg.saveJson, cfg.savePickle = {}, False, False
+    cfg.verbose, cfg.printPopAvgRates = False, False
+    cfg.recordTraces = {}
+    results, ref = [], None
+    for event in (False, True):
+        cfg.eventSynapses = event
+        from netParams_mechanical import netParams
+        for params in netParams.synMechParams.values():
+            params['mod'] = params['mod'][:-2] if params['mod'].endswith('Ev') else params['mod']
+        connectivity.event_synapses(netParams, cfg)
+        sim.create(netParams, cfg)
+        start = time.time()
+        sim.simulate()
+        wall = time.time() - start
+        spikes = {}
+        for t, gid in sorted(zip(sim.allSimData['spkt'], sim.allSimData['spkid'])):
+            spikes.setdefault(int(gid), []).append(t)
+        if ref is None:
+            ref = spikes
+        results.append((event, wall, sum(len(times) for times in spikes.values())) + compare(ref, spikes))
+    return results
+
+if __name__ == '__main__':
+    duration = float(sys.argv[1]) if len(sys.argv) > 1 else cfg.duration
+    n = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    print('\nns per synapse and step, %d synapses' %n)
+    print('%-16s %10s %10s' %('mod', 'silent', '20 Hz'))
+    for mod in connectivity.EVENT_MODS:
+        for m in (mod, connectivity.EVENT_MODS[mod]):
+            print('%-16s %10.1f %10.1f' %(m, synapse_cost(m, n), synapse_cost(m, n, 20.0)))
+    results = bench(duration)
+    print('\n%g ms of 100mN' %duration)
+    print('eventSynapses  wall (s)  speedup  spikes  cells changed  spikes moved  max move (ms)')
+    for event, wall, nspikes, changed, shifted, largest in results:
+        print('%13s  %8.2f  %7.2f  %6d  %13d  %12d  %13.3f' %(event, wall, results[0][1] / wall, nspikes, changed, shifted, largest))
@@ -0,0 +1,213 @@
+'''
+per-mechanism microbenchmark: every density mechanism (SUFFIX) and synapse
+(POINT_PROCESS with a NET_RECEIVE) of mods/ is instantiated alone in a harness
+of nsec sections of nseg segments, the membrane driven through a voltage clamp
+per segment by a representative waveform (slow subthreshold oscillation and
+action potentials at a fixed rate) and the synapses by Poisson events. the cost
+of the harness without the mechanism is subtracted, the results (ns per
+segment-step, or per synapse-step, and memory per instance) go to JSON to
+track regressions and rank the kinetics worth optimizing.
+
+run from the model directory (mods compiled with nrnivmodl mods):
+>> python benchmarks/bench_mechs.py [--nsec 10] [--nseg 9] [--tstop 200] [--out bench_mechs.json] [mech ...]
+e.g. python benchmarks/bench_mechs.py --nsec 1 --nseg 1 HH2 AMPA_DynSyn
+'''
+
+import os
+import re
+import sys
+import glob
+import json
+import time
+import argparse
+import platform
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import numpy as np
+import neuron
+from neuron import h
+
+MOD_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'mods')
+
+def mechanisms(mod_dir=MOD_DIR):
+    """
+    Returns {name: (kind, number of weights)} of the mods of mod_dir, kind
+    'density' (SUFFIX) or 'synapse' (POINT_PROCESS with a NET_RECEIVE and a
+    membrane current), the weights being the leading NET_RECEIVE arguments
+    whose name starts with w. artificial cells and electrodes are left out.
+    """
+    mechs = {}
+    for path in sorted(glob.glob(os.path.join(mod_dir, '*.mod'))):
+        text = re.sub(r'COMMENT.*?ENDCOMMENT', '', open(path).read(), flags=re.S)
+        text = re.sub(r':.*', '', text)
+        suffix = re.search(r'\bSUFFIX\s+(\w+)', text)
+        pp = re.search(r'\bPOINT_PROCESS\s+(\w+)', text)
+        receive = re.search(r'\bNET_RECEIVE\s*\(([^)]*)\)', text)
+        if suffix:
+            mechs[suffix.group(1)] = ('density', 0)
+        elif pp and receive and not re.search(r'\bELECTRODE_CURRENT\b', text):
+            args = [arg.split('(')[0].strip() for arg in receive.group(1).split(',')]
+            nw = 0
+            while nw < len(args) and args[nw].startswith('w'):
+                nw += 1
+            mechs[pp.group(1)] = ('synapse', max(nw, 1))
+    return mechs
+
+def waveform(tstop, dt, rate=20.0, seed=1):
+    """
+    Returns (t, v) of the clamp command: -65 mV with a 5 mV, 10 Hz oscillation
+    and 1 ms action potentials to +30 mV at Poisson times of rate (Hz)
+    """
+    t = np.arange(0, tstop + dt, dt)
+    v = -65 + 5 * np.sin(2 * np.pi * t / 100.0)
+    rng = np.random.default_rng(seed)
+    spikes = np.cumsum(rng.exponential(1000.0 / rate, int(3 * rate * tstop / 1000) + 5)) if rate > 0 else []
+    for ts in spikes:
+        if ts >= tstop:
+            break
+        up, down = (t >= ts) & (t < ts + 0.3), (t >= ts + 0.3) & (t < ts + 1.0)
+        v[up] = -65 + 95 * (t[up] - ts) / 0.3
+        v[down] = 30 - 105 * (t[down] - ts - 0.3) / 0.7
+    return h.Vector(t), h.Vector(v)
+
+class harness(object):
+    """
+    nsec sections of nseg segments with pas and one voltage clamp per segment
+    playing the waveform, and (synapse harness) nsyn VecStims per segment
+    playing Poisson trains at syn_rate (Hz)
+    """
+    def __init__(self, nsec, nseg, tstop, dt, rate, nsyn=0, syn_rate=10.0, seed=1):
+        self.tstop, self.dt = tstop, dt
+        self.tvec, self.vvec = waveform(tstop, dt, rate, seed)
+        self.secs, self.clamps, self.stims = [], [], []
+        rng = np.random.default_rng(seed + 1)
+        for i in range(nsec):
+            sec = h.Section(name='bench_%d' %i)
+            sec.nseg, sec.L, sec.diam = nseg, 10.0 * nseg, 5.0
+            sec.insert('pas')
+            self.secs.append(sec)
+            for seg in sec:
+                clamp = h.SEClamp(seg)
+                clamp.dur1, clamp.rs = 1e9, 0.01
+                self.vvec.play(clamp._ref_amp1, self.tvec, 1)
+                self.clamps.append(clamp)
+                for j in range(nsyn):
+                    ts = np.cumsum(rng.exponential(1000.0 / syn_rate, int(3 * syn_rate * tstop / 1000) + 5))
+                    stim, tv = h.VecStim(), h.Vector(ts[ts < tstop])
+                    stim.play(tv)
+                    self.stims.append((seg, stim, tv))
+
+    def segments(self):
+        return [seg for sec in self.secs for seg in sec]
+
+    def run(self, repeat=3):
+        """
+        Returns the best wall time (s) of repeat runs to tstop
+        """
+        pc = h.ParallelContext()
+        pc.set_maxstep(10)
+        h.dt = self.dt
+        best = None
+        for i in range(repeat):
+            h.finitialize(-65)
+            start = time.perf_counter()
+            pc.psolve(self.tstop)
+            wall = time.perf_counter() - start
+            best = wall if best is None else min(best, wall)
+        return best
+
+def rss():
+    """
+    Returns the resident memory (bytes) of the process
+    """
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+def insert(harness, mech, kind, nw, weight):
+    """
+    Adds mech to every segment (density) or onto every VecStim of the
+    harness (synapse), returns the objects to keep alive
+    """
+    objs = []
+    if kind == 'density':
+        for sec in harness.secs:
+            sec.insert(mech)
+    else:
+        for seg, stim, tv in harness.stims:
+            syn = getattr(h, mech)(seg)
+            nc = h.NetCon(stim, syn)
+            for i in range(nw):
+                nc.weight[i] = weight
+            objs.append((syn, nc))
+    return objs
+
+def bench_mech(mech, kind, nw, args):
+    """
+    Returns the result dict of mech: ns per instance-step (harness cost
+    subtracted), instances and bytes per instance
+    """
+    nsyn = args.nsyn if kind == 'synapse' else 0
+    bench = harness(args.nsec, args.nseg, args.tstop, args.dt, args.rate, nsyn, args.syn_rate, args.seed)
+    base = bench.run(args.repeat)
+    objs = insert(bench, mech, kind, nw, args.weight)
+    wall = bench.run(args.repeat)
+    n = args.nsec * args.nseg * (nsyn if kind == 'synapse' else 1)
+    steps = int(round(args.tstop / args.dt))
+    del objs, bench
+
+    # memory on a separate harness of mem_instances instances, no clamps
+    nseg = min(args.mem_instances, 32767) if kind == 'density' else 1
+    sec = h.Section(name='bench_mem')
+    sec.nseg = nseg
+    h.finitialize(-65)
+    before = rss()
+    if kind == 'density':
+        sec.insert(mech)
+        objs, n_mem = None, nseg
+    else:
+        objs, n_mem = [getattr(h, mech)(sec(0.5)) for i in range(args.mem_instances)], args.mem_instances
+    h.finitialize(-65)
+    after = rss()
+    del objs, sec
+    return {'kind': kind, 'instances': n, 'steps': steps,
+            'wall_s': wall, 'harness_wall_s': base,
+            'ns_per_step': max(wall - base, 0.0) * 1e9 / (n * steps),
+            'bytes_per_instance': (after - before) / n_mem}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='per-mechanism microbenchmark of mods/')
+    parser.add_argument('mechs', nargs='*', help='mechanisms to bench, all of mods/ by default')
+    parser.add_argument('--nsec', type=int, default=10, help='sections of the harness')
+    parser.add_argument('--nseg', type=int, default=9, help='segments per section')
+    parser.add_argument('--nsyn', type=int, default=1, help='synapses per segment')
+    parser.add_argument('--tstop', type=float, default=200.0, help='ms simulated per run')
+    parser.add_argument('--dt', type=float, default=0.025, help='ms')
+    parser.add_argument('--rate', type=float, default=20.0, help='Hz of the action potentials of the waveform')
+    parser.add_argument('--syn-rate', type=float, default=10.0, help='Hz of the events of every synapse')
+    parser.add_argument('--weight', type=float, default=1e-3, help='uS, NetCon weights')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per measure, the best is kept')
+    parser.add_argument('--mem-instances', type=int, default=20000, help='instances of the memory measure')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--out', default='bench_mechs.json', help='JSON results')
+    args = parser.parse_args(argv)
+
+    h.load_file('stdrun.hoc')
+    h.celsius = 36
+    mechs = mechanisms()
+    names = args.mechs or sorted(mechs, key=lambda m: (mechs[m][0], m.lower()))
+    results = {}
+    print('%-18s %8s %12s %14s' %('mechanism', 'kind', 'ns/step', 'bytes/instance'))
+    for mech in names:
+        kind, nw = mechs[mech]
+        results[mech] = bench_mech(mech, kind, nw, args)
+        print('%-18s %8s %12.2f %14.0f' %(mech, kind, results[mech]['ns_per_step'], results[mech]['bytes_per_instance']))
+    report = {'date': time.strftime('%Y-%m-%d %H:%M:%S'), 'neuron': neuron.__version__,
+              'machine': platform.machine(), 'processor': platform.processor(),
+              'config': {k: v for k, v in vars(args).items() if k not in ('mechs', 'out')},
+              'results': results}
+    with open(args.out, 'w') as f:
+        json.dump(report, f, indent=1)
+    print('\nresults saved to %s' %args.out)
+    return report
+
+if __name__ == '__main__':
+    main()
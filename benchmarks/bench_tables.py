@@ -0,0 +1,63 @@
+'''
+accuracy and wall time of the rate tables: the max relative error of the
+tabulated rates of every probed mechanism against its direct formulas, then
+the 100mN protocol simulated on one network with the tables of the probed
+mechanisms off (direct formulas) and on, the spikes of both runs being
+compared.
+
+run from the model directory (mods compiled with nrnivmodl mods):
+>> python benchmarks/bench_tables.py [duration (ms)]
+e.g. python benchmarks/bench_tables.py 5000
+'''
+
+import os
+import sys
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from netpyne import sim
+from cfg_mechanical import cfg
+import ratetables
+
+def bench(duration):
+    """
+    Returns [(rate tables, wall time (s), number of spikes, number of
+    spikes shifted, max shift (ms))] of the 100mN protocol simulated for
+    duration ms, the spikes compared per cell to the run without tables
+    """
+    cfg.duration = duration
+    cfg.stim_ratios, cfg.freq, cfg.protocol = 0.25, '100mN', None
+    cfg.analysis, cfg.saveJson, cfg.savePickle = {}, False, False
+    cfg.verbose, cfg.printPopAvgRates = False, False
+    cfg.recordTraces = {}
+    from netParams_mechanical import netParams
+    sim.create(netParams, cfg)
+    results, ref = [], None
+    for use in (False, True):
+        ratetables.use_tables(use)
+        start = time.time()
+        sim.simulate()
+        wall = time.time() - start
+        trains = {}
+        for t, gid in zip(sim.allSimData['spkt'], sim.allSimData['spkid']):
+            trains.setdefault(int(gid), []).append(t)
+        if ref is None:
+            ref = trains
+        shifts = [abs(a - b) for gid in set(ref) | set(trains)
+                  for a, b in zip(ref.get(gid, []), trains.get(gid, []))]
+        same = all(len(ref.get(gid, [])) == len(trains.get(gid, [])) for gid in set(ref) | set(trains))
+        results.append((use, wall, sum(len(t) for t in trains.values()),
+                        sum(s > 0 for s in shifts) if same else None, max(shifts, default=0.0)))
+    ratetables.set_tables(cfg)
+    return results
+
+if __name__ == '__main__':
+    duration = float(sys.argv[1]) if len(sys.argv) > 1 else cfg.duration
+    print('\nmax relative error of the tabulated rates, -100 to 90 mV')
+    for mech in ratetables.PROBES:
+        print('%-7s %s' %(mech, '  '.join('%s %.1e' %kv for kv in ratetables.table_error(mech).items())))
+    results = bench(duration)
+    print('\n%g ms of 100mN' %duration)
+    print('tables  wall (s)  speedup  spikes  shifted  max shift (ms)')
+    for use, wall, nspikes, shifted, shift in results:
+        print('%6s  %8.2f  %7.2f  %6d  %7s  %14.4f' %(use, wall, results[0][1] / wall, nspikes,
+              'counts' if shifted is None else shifted, shift))
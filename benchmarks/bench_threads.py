@@ -0,0 +1,50 @@
+'''
+wall time of the 100mN protocol against the number of threads: the network is
+created once and simulated with every thread count, the spikes of each run
+must be those of the single-threaded one.
+
+run from the model directory (mods compiled with nrnivmodl mods):
+>> python benchmarks/bench_threads.py [duration (ms)] [threads ...]
+e.g. python benchmarks/bench_threads.py 5000 1 2 4 8
+'''
+
+import os
+import sys
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from netpyne import sim
+from cfg_mechanical import cfg
+import solver
+
+def bench(threads, duration):
+    """
+    Returns [(threads, wall time (s), number of spikes, same spikes as the
+    first run)] of the 100mN protocol simulated for duration ms
+    """
+    cfg.duration = duration
+    cfg.stim_ratios, cfg.freq, cfg.protocol = 0.25, '100mN', None
+    cfg.analysis, cfg.saveJson, cfg.savePickle = {}, False, False
+    cfg.verbose, cfg.printPopAvgRates = False, False
+    from netParams_mechanical import netParams
+    sim.create(netParams, cfg)
+    results, ref = [], None
+    for n in threads:
+        solver.set_threads(n)
+        start = time.time()
+        sim.simulate()
+        wall = time.time() - start
+        spikes = sorted(zip(sim.allSimData['spkt'], sim.allSimData['spkid']))
+        if ref is None:
+            ref = spikes
+        results.append((n, wall, len(spikes), spikes == ref))
+    solver.set_threads(1)
+    return results
+
+if __name__ == '__main__':
+    duration = float(sys.argv[1]) if len(sys.argv) > 1 else cfg.duration
+    threads = [int(n) for n in sys.argv[2:]] or sorted({1, 2, 4, os.cpu_count() or 1})
+    results = bench(threads, duration)
+    print('\n%d cores, %g ms of 100mN' %(os.cpu_count() or 1, duration))
+    print('threads  wall (s)  speedup  spikes  same')
+    for n, wall, nspikes, same in results:
+        print('%7d  %8.2f  %7.2f  %6d  %s' %(n, wall, results[0][1] / wall, nspikes, same))
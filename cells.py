@@ -3,6 +3,7 @@ from neuron import h
 
 # can use (EX)|(IN)|(PRO)cellRule with netpyne
 # can use create(EX)|(IN)|(PRO)\(\) with netpyne or python+neuron
+# create(EX)|(IN)|(PRO)\(d_lambda=0.1\) sets the nseg by the d_lambda rule (genrn.cal_nseg)
 
 EXtonicRule  = {
  'conds': {},
@@ -322,7 +323,7 @@ PROcellRule = {
 }
 
 
-def createIN():
+def createIN(d_lambda=None, freq=100):
     cellRule = {
         'secs': {
                  'soma'   : {'L': 10.0, 'diam': 10.0, 'nseg': 1 , 'Ra': 150},
@@ -335,7 +336,7 @@ def createIN():
                  ('dend', 'soma'),
                  ('soma', 'hillock')
                 )}
-    IN = genrn(**cellRule)
+    IN = genrn.genrn(**cellRule)
     IN/'soma'<{'B_Na': {'gnabar': 0.008},
                'B_A': {}, 'B_DR': {}, 'KDR': {},
                'KDRI': {'gkbar': 0.0043}}
@@ -347,9 +348,12 @@ def createIN():
                'KDR': {},
                'KDRI': {'gkbar':0.034}}
     IN.init_nernsts()
+    if d_lambda:
+        # nseg by the d_lambda rule instead of the values above
+        IN.set_nseg(freq, d_lambda)
     return IN
 
-def createEX():
+def createEX(d_lambda=None, freq=100):
     cellRule = {
         'secs': {
                  'dend'   : {'L': 400 , 'diam': 3.0 , 'nseg': 15, 'Ra': 150},
@@ -362,7 +366,7 @@ def createEX():
                  ('dend', 'soma'),
                  ('soma', 'hillock')
                 )}
-    EX = genrn(**cellRule)
+    EX = genrn.genrn(**cellRule)
     EX/'dend'<{'HH2': {'gnabar': 0, 'gkbar': 0.036},
                'CaIntraCellDyn': {'depth': 0.1, 'cai_tau': 2.0, 'cai_inf': 50e-6},
                'iKCa': {'gbar': 0.002}}
@@ -372,9 +376,12 @@ def createEX():
     EX/'hillock'<{'HH2': {'gnabar': 3.45, 'gkbar': 0.076, 'vtraub': -55}}
     # axon only has one mechanism besides pas, with 0 ion conductance
     EX.init_nernsts()
+    if d_lambda:
+        # nseg by the d_lambda rule instead of the values above
+        EX.set_nseg(freq, d_lambda)
     return EX
 
-def createPRO():
+def createPRO(d_lambda=None, freq=100):
     cellRule = {
         'secs': {
                  'soma'   : {'L': 20.0, 'diam': 20.0, 'nseg': 1 , 'Ra': 150},
@@ -387,7 +394,7 @@ def createPRO():
                  ('dend', 'soma'),
                  ('soma', 'hillock')
                 )}
-    PRO = genrn(**cellRule)
+    PRO = genrn.genrn(**cellRule)
     PRO/'soma'<{'HH2': {'gnabar': 0, 'gkbar': 0.001075, 'vtraub': -55},
                 'CaIntraCellDyn': {'depth': 0.1, 'cai_tau': 1.0, 'cai_inf': 50e-6},
                 'iCaL': {'pcabar': 0.001},
@@ -398,6 +405,9 @@ def createPRO():
                 'iCaL': {'pcabar': 3e-5},
                 'iKCa': {'gbar': 0.001}}
     PRO/'hillock'<{'HH2': {'gnabar': 3.45, 'gkbar': 0.076, 'vtraub': -55}}
+    if d_lambda:
+        # nseg by the d_lambda rule instead of the values above
+        PRO.set_nseg(freq, d_lambda)
     return PRO
 
 if __name__=='__main__':
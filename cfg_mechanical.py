@@ -12,6 +12,8 @@ cfg = specs.SimConfig()
 cfg.hParams = {'celsius': 36, 'v_init': -60 }
 cfg.vrest = cfg.hParams['v_init']
 cfg.duration = 5000
+cfg.nthreads = 1 # threads of the run, cells split over them (all the mechanisms are THREADSAFE)
+cfg.coreneuron = False # run through CoreNEURON, mods compiled with nrnivmodl -coreneuron mods (see solver.py)
  
 cfg.recordStep = 0.025
 
@@ -25,6 +27,28 @@ if cfg.stim_ratios == 1.0: cfg.freq = '400mN'
 elif cfg.stim_ratios == 0.5: cfg.freq = '200mN'
 elif cfg.stim_ratios == 0.25:cfg.freq = '100mN'
 else: cfg.freq = '50mN'
+cfg.spkt_published = False # use the published trains in spkt/ for cfg.freq (C_PEP and C_NP then share the C trains)
+cfg.spkt_seed = 1 # seed of the trains generated (and cached), every fiber its own random stream
+cfg.stream_window = None # ms, generate the afferent trains window by window during the run (long protocols)
+cfg.protocol = None # stimulus protocol (see protocol.py) replacing the fixed step at cfg.stim_ratios, e.g.
+# cfg.protocol = [{'type': 'press', 'start': 0, 'stop': 60000, 'period': 10000, 'width': 5000, 'amp': 0.25}]
+
+# CELLS
+cfg.cellTemplates = False # build the cells from compiled templates of their rules (see templates.py)
+cfg.d_lambda = None # e.g. 0.1, set the nseg of the cell rules by the d_lambda rule (see discretize.py)
+cfg.d_lambda_freq = 100 # Hz, frequency of the d_lambda rule
+cfg.prune_mechs = False # remove the mechanisms with zero conductances from the cell rules (see prune.py)
+cfg.rate_tables = False # evaluate the rates of HH2, borgka, iNaP and iCaL from tables (see ratetables.py)
+cfg.table_ranges = {} # ranges of the rate tables, e.g. {'HH2': (-50, 150)} (mV, of v - vtraub for HH2)
+cfg.steady_init = False # start the cells from the cached resting states of their rules instead of v_init (see steady.py)
+
+# CONNECTIVITY (see connectivity.py)
+cfg.connSampling = 'netpyne' # 'netpyne': probability rules, 'vectorized': one Bernoulli draw per pathway
+cfg.connSeed = 1 # seed of the 'vectorized' connection sampling
+cfg.shareSynapses = False # one synapse per post cell, mechanism and location, a NetCon per source
+cfg.fuseGlutamate = False # co-located AMPA and NMDA as one GLU_DynSyn and NetCon (same pairs, as 'vectorized' sampling)
+cfg.eventSynapses = False # event-driven variants of the DynSyn receptors, conductance decayed analytically (see connectivity.py), not with cfg.fuseGlutamate
+cfg.net_cache = False # reuse the connections of an identical network realized before (see net_cache.py)
 
 # SYNAPTIC WEIGHT
 cfg.Ab_EX_AMPA = 0.0221559
@@ -86,4 +110,7 @@ cfg.analysis['plotConn'] = {'includePre': ['all'], 'includePost': ['all'], 'feat
 cfg.verbose = True
 cfg.filename = 'sim_'
 cfg.printPopAvgRates = [ 0, 5000 ]
-cfg.dt = 0.025
\ No newline at end of file
+cfg.dt = 0.025
+cfg.cvode_active = False # variable time step (CVODE) instead of cfg.dt (see solver.py)
+cfg.use_local_dt = False # with cfg.cvode_active, one variable time step per cell
+cfg.cvode_atol = 0.001 # absolute error tolerance of the variable time step
\ No newline at end of file
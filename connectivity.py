@@ -0,0 +1,239 @@
+'''
+connectivity table of the Spinal Dorsal Horn Network Model
+from Sekiguchi et al. (2021)
+
+one row per pathway: (pre pop, post pop, delay (ms), probability, receptors),
+receptors lists (synMech, cfg weight name) of the receptors co-located on the
+post-synaptic dendrite. add_conn_params compiles the table into netpyne
+connParams labelled '<pre>_<receptor>-><post>'
+
+with cfg.fuseGlutamate, co-located AMPA and NMDA receptors are compiled into
+one 'GLU' receptor (GLU_DynSyn, one NetCon carrying both weights)
+
+with cfg.eventSynapses, the DynSyn receptors use their event-driven variants
+(<receptor>_DynSynEv, conductance decayed analytically, silent synapses
+skipped), not available for the fused GLU receptor
+'''
+
+import zlib
+import numpy as np
+
+CONNECTIVITY = [
+    # From Abeta Fibres to Spinal Interneurons
+    ('Ab_SAI' , 'PKC'   , 1.0 , 0.2, [('AMPA', 'Ab_EX_AMPA'), ('NMDA', 'Ab_EX_NMDA')]),
+    ('Ab_SAI' , 'VGLUT3', 1.0 , 0.2, [('AMPA', 'Ab_EX_AMPA'), ('NMDA', 'Ab_EX_NMDA')]),
+    ('Ab_SAI' , 'PV'    , 1.0 , 0.2, [('AMPA', 'Ab_IN_AMPA'), ('NMDA', 'Ab_IN_NMDA')]),
+    ('Ab_SAI' , 'DYN'   , 1.0 , 0.2, [('AMPA', 'Ab_IN_AMPA')]),
+    ('Ab_SAII', 'PKC'   , 1.0 , 0.2, [('AMPA', 'Ab_EX_AMPA'), ('NMDA', 'Ab_EX_NMDA')]),
+    ('Ab_SAII', 'VGLUT3', 1.0 , 0.2, [('AMPA', 'Ab_EX_AMPA'), ('NMDA', 'Ab_EX_NMDA')]),
+    ('Ab_SAII', 'PV'    , 1.0 , 0.2, [('AMPA', 'Ab_IN_AMPA'), ('NMDA', 'Ab_IN_NMDA')]),
+    ('Ab_SAII', 'DYN'   , 1.0 , 0.2, [('AMPA', 'Ab_IN_AMPA')]),
+    # From Adelta to Spinal Interneurons
+    ('Ad'     , 'DOR'   , 5.0 , 0.2, [('AMPA', 'Ad_AMPA'), ('NMDA', 'Ad_NMDA')]),
+    ('Ad'     , 'SOM'   , 5.0 , 0.2, [('AMPA', 'Ad_AMPA'), ('NMDA', 'Ad_NMDA')]),
+    ('Ad'     , 'CR'    , 5.0 , 0.2, [('AMPA', 'Ad_AMPA'), ('NMDA', 'Ad_NMDA')]),
+    # From Peptidergic C (C,TRPV1) to Spinal Interneurons
+    ('C_PEP'  , 'TrC'   , 10.0, 0.2, [('AMPA', 'C_TrC_AMPA')]),
+    ('C_PEP'  , 'SOM'   , 10.0, 0.2, [('AMPA', 'C_EX_AMPA'), ('NMDA', 'C_EX_NMDA')]),
+    ('C_PEP'  , 'CR'    , 10.0, 0.2, [('AMPA', 'C_EX_AMPA'), ('NMDA', 'C_EX_NMDA')]),
+    ('C_PEP'  , 'DYN'   , 10.0, 0.2, [('AMPA', 'C_DYN_AMPA')]),
+    ('C_PEP'  , 'ISLET' , 10.0, 0.2, [('AMPA', 'C_ISLET_AMPA')]),
+    ('C_PEP'  , 'NK1'   , 10.0, 0.2, [('AMPA', 'C_NK1_AMPA'), ('NMDA', 'C_NK1_NMDA'), ('NK13', 'C_NK1_NK1')]),
+    # From Non-Peptidergic C (C,IB4) to Spinal Interneurons
+    ('C_NP'   , 'TrC'   , 10.0, 0.2, [('AMPA', 'C_TrC_AMPA')]),
+    ('C_NP'   , 'SOM'   , 10.0, 0.2, [('AMPA', 'C_EX_AMPA'), ('NMDA', 'C_EX_NMDA')]),
+    ('C_NP'   , 'CR'    , 10.0, 0.2, [('AMPA', 'C_EX_AMPA'), ('NMDA', 'C_EX_NMDA')]),
+    ('C_NP'   , 'DYN'   , 10.0, 0.2, [('AMPA', 'C_DYN_AMPA')]),
+    ('C_NP'   , 'ISLET' , 10.0, 0.2, [('AMPA', 'C_ISLET_AMPA')]),
+    # Connectivity Betweeen Spinal Neurons (inh>ex, ex>ex, ex/inh>projection)
+    # TO ePKC NEURONS
+    ('VGLUT3' , 'PKC'   , 0.5 , 0.2, [('AMPA', 'VGLUT3_PKC_AMPA'), ('NMDA', 'VGLUT3_PKC_NMDA')]),
+    ('PV'     , 'PKC'   , 0.5 , 0.2, [('GABA', 'PV_GABA'), ('GLY', 'PV_GLY')]),
+    # TO eDOR NEURONS
+    ('PV'     , 'DOR'   , 0.5 , 0.2, [('GABA', 'PV_GABA'), ('GLY', 'PV_GLY')]),
+    ('VGLUT3' , 'DOR'   , 0.5 , 0.2, [('AMPA', 'VGLUT3_PKC_AMPA'), ('NMDA', 'VGLUT3_PKC_NMDA')]),
+    # TO eTrC NEURONS
+    ('PKC'    , 'TrC'   , 0.5 , 0.2, [('AMPA', 'PKC_AMPA')]),
+    ('ISLET'  , 'TrC'   , 0.5 , 0.2, [('GABA', 'ISLET_GABA')]),
+    # TO iISLET NEURONS
+    ('DYN'    , 'ISLET' , 0.5 , 0.2, [('GABA', 'DYN_ISLET_GABA')]),
+    # TO iDYN NEURONS
+    ('ISLET'  , 'DYN'   , 0.5 , 0.2, [('GABA', 'ISLET_GABA')]),
+    # TO eSOM NEURONS
+    ('DYN'    , 'SOM'   , 0.5 , 0.2, [('GABA', 'DYN_EX_GABA'), ('GLY', 'DYN_EX_GLY')]),
+    ('TrC'    , 'SOM'   , 0.5 , 0.2, [('AMPA', 'TrC_AMPA'), ('NMDA', 'TrC_NMDA')]),
+    ('PKC'    , 'SOM'   , 0.5 , 0.2, [('AMPA', 'PKC_AMPA'), ('NMDA', 'PKC_NMDA')]),
+    ('VGLUT3' , 'SOM'   , 0.5 , 0.2, [('AMPA', 'VGLUT3_SOM_AMPA'), ('NMDA', 'VGLUT3_SOM_NMDA')]),
+    ('DOR'    , 'SOM'   , 0.5 , 0.2, [('AMPA', 'DOR_AMPA'), ('NMDA', 'DOR_NMDA')]),
+    # TO eCR NEURONS
+    ('DYN'    , 'CR'    , 0.5 , 0.2, [('GABA', 'DYN_EX_GABA'), ('GLY', 'DYN_EX_GLY')]),
+    ('TrC'    , 'CR'    , 0.5 , 0.2, [('AMPA', 'TrC_AMPA'), ('NMDA', 'TrC_NMDA')]),
+    ('PKC'    , 'CR'    , 0.5 , 0.2, [('AMPA', 'PKC_AMPA'), ('NMDA', 'PKC_NMDA')]),
+    ('DOR'    , 'CR'    , 0.5 , 0.2, [('AMPA', 'DOR_AMPA'), ('NMDA', 'DOR_NMDA')]),
+    # TO pNK1 NEURONS
+    ('SOM'    , 'NK1'   , 0.5 , 0.2, [('AMPA', 'EX_NK1_AMPA'), ('NMDA', 'EX_NK1_NMDA'), ('NK13', 'EX_NK1_NK1')]),
+    ('CR'     , 'NK1'   , 0.5 , 0.2, [('AMPA', 'EX_NK1_AMPA'), ('NMDA', 'EX_NK1_NMDA'), ('NK13', 'EX_NK1_NK1')]),
+    ('DYN'    , 'NK1'   , 0.5 , 0.2, [('GABA', 'DYN_NK1_GABA'), ('GLY', 'DYN_NK1_GLY')]),
+]
+
+# receptor name used in the connParams label when it differs from the synMech
+RECEPTOR_LABELS = {'NK13': 'NK1'}
+
+# co-located receptors compiled into a single synMech with cfg.fuseGlutamate,
+# the weights of the fused receptors go to the NetCon weights in this order
+FUSED_RECEPTORS = {'GLU': ('AMPA', 'NMDA')}
+
+# synapse mods that can be shared by several NetCons (cfg.shareSynapses): linear
+# in the summed conductance, short-term plasticity state kept per NetCon in the
+# NET_RECEIVE arguments
+SHAREABLE_MODS = ('AMPA_DynSyn', 'NMDA_DynSyn', 'GLU_DynSyn', 'NK1_DynSyn',
+                  'GABAa_DynSyn', 'GABAb_DynSyn', 'Glycine_DynSyn',
+                  'AMPA_DynSynEv', 'NMDA_DynSynEv', 'NK1_DynSynEv',
+                  'GABAa_DynSynEv', 'Glycine_DynSynEv')
+
+# event-driven variants of the synapse mods (cfg.eventSynapses), same parameters
+EVENT_MODS = {'AMPA_DynSyn': 'AMPA_DynSynEv', 'NMDA_DynSyn': 'NMDA_DynSynEv',
+              'NK1_DynSyn': 'NK1_DynSynEv', 'GABAa_DynSyn': 'GABAa_DynSynEv',
+              'Glycine_DynSyn': 'Glycine_DynSynEv'}
+
+def conn_label(pre, synMech, post):
+    return '%s_%s->%s' %(pre, RECEPTOR_LABELS.get(synMech, synMech), post)
+
+def fuse_receptors(receptors):
+    """
+    Returns the receptors of a pathway with the co-located receptors of
+    FUSED_RECEPTORS replaced by their fused synMech, whose weight is the tuple
+    of the cfg weight names of the receptors it replaces.
+    """
+    weights = dict(receptors)
+    fused = []
+    for synMech, weight in receptors:
+        for label, parts in FUSED_RECEPTORS.items():
+            if synMech in parts and all(part in weights for part in parts):
+                if synMech == parts[0]:
+                    fused.append((label, tuple(weights[part] for part in parts)))
+                break
+        else:
+            fused.append((synMech, weight))
+    return fused
+
+def compile_table(cfg, table=CONNECTIVITY):
+    """
+    Returns the table as compiled for cfg (receptors fused if cfg.fuseGlutamate)
+    """
+    if not getattr(cfg, 'fuseGlutamate', False):
+        return table
+    return [(pre, post, delay, prob, fuse_receptors(receptors)) for pre, post, delay, prob, receptors in table]
+
+def weight_labels(table=CONNECTIVITY):
+    """
+    Returns {cfg weight name: [(connParams label, NetCon weight index)]}, the
+    rules (and weight of their NetCons) each cfg weight sets.
+    """
+    labels = {}
+    for pre, post, delay, prob, receptors in table:
+        for synMech, weight in receptors:
+            names = weight if isinstance(weight, tuple) else (weight,)
+            for i, name in enumerate(names):
+                labels.setdefault(name, []).append((conn_label(pre, synMech, post), i))
+    return labels
+
+def set_fused_weights(net, cfg, table=CONNECTIVITY):
+    """
+    Sets the NetCon weights after the first (netpyne only sets weight[0]) of the
+    fused receptors of the network created from table and cfg
+    """
+    labels = {}
+    for pre, post, delay, prob, receptors in compile_table(cfg, table):
+        for synMech, weight in receptors:
+            if isinstance(weight, tuple):
+                labels[conn_label(pre, synMech, post)] = [getattr(cfg, name) for name in weight]
+    for cell in net.cells:
+        for conn in cell.conns:
+            weights = labels.get(conn.get('label'))
+            if weights and 'hObj' in conn:
+                for i in range(1, len(weights)):
+                    conn['hObj'].weight[i] = weights[i]
+
+def event_synapses(netParams, cfg):
+    """
+    Replaces the mod of every synMech of netParams that has an event-driven
+    variant in EVENT_MODS (cfg.eventSynapses set). Raises ValueError with
+    cfg.fuseGlutamate, the fused GLU_DynSyn having no event-driven variant.
+    """
+    if not getattr(cfg, 'eventSynapses', False):
+        return
+    if getattr(cfg, 'fuseGlutamate', False):
+        raise ValueError('GLU_DynSyn has no event-driven variant, cfg.eventSynapses needs cfg.fuseGlutamate = False')
+    for params in netParams.synMechParams.values():
+        params['mod'] = EVENT_MODS.get(params['mod'], params['mod'])
+
+def sample_pathway(npre, npost, prob, seed, pathway):
+    """
+    Returns the [pre index, post index] pairs of a pathway, all pairs drawn at once
+    as an npre x npost Bernoulli matrix. Each pathway has its own random stream,
+    spawned from seed with the pathway label as key.
+    """
+    ss = np.random.SeedSequence(seed, spawn_key=(zlib.crc32(pathway.encode()),))
+    rng = np.random.Generator(np.random.PCG64(ss))
+    return np.argwhere(rng.random((npre, npost)) < prob).tolist()
+
+def share_synapses(netParams, cfg, table=CONNECTIVITY):
+    """
+    Returns whether the connections of the table can share their synapses
+    (cfg.shareSynapses set and every synMech used in SHAREABLE_MODS). The
+    synapse sharing of netpyne is a single switch (cfg.oneSynPerNetcon), so any
+    mechanism that cannot be shared keeps one synapse per NetCon for all.
+    """
+    if not getattr(cfg, 'shareSynapses', False):
+        return False
+    synMechs = set(synMech for pre, post, delay, prob, receptors in compile_table(cfg, table) for synMech, weight in receptors)
+    unshareable = sorted(synMech for synMech in synMechs if netParams.synMechParams[synMech]['mod'] not in SHAREABLE_MODS)
+    if unshareable:
+        print('  Synapses not shared, mechanisms without per-NetCon state: %s' %', '.join(unshareable))
+        return False
+    return True
+
+def add_conn_params(netParams, cfg, table=CONNECTIVITY):
+    """
+    Adds the connParams of every pathway and receptor of the table to netParams,
+    weights taken from cfg.
+
+    fused receptors (cfg.fuseGlutamate) get one rule, with the weight of their
+    first receptor, the others are set by set_fused_weights once the network is
+    created.
+
+    cfg.connSampling selects how the connections are drawn:
+        'netpyne'    - probability rules, pairs tested one at a time by netpyne
+                       (independently for every receptor, the published topology)
+        'vectorized' - one Bernoulli matrix per pathway (seeded by cfg.connSeed),
+                       shared by its receptors and passed to netpyne as a connList
+
+    with cfg.shareSynapses (see share_synapses) the connections onto the same
+    post-synaptic cell, mechanism and location share one synapse, each with its
+    own NetCon (sets cfg.oneSynPerNetcon).
+    """
+    sampling = getattr(cfg, 'connSampling', 'netpyne')
+    if sampling not in ('netpyne', 'vectorized'):
+        raise ValueError('unknown connSampling: %s' %(sampling))
+    shared = share_synapses(netParams, cfg, table)
+    cfg.oneSynPerNetcon = not shared
+    for pre, post, delay, prob, receptors in compile_table(cfg, table):
+        if sampling == 'vectorized':
+            pairs = sample_pathway(netParams.popParams[pre]['numCells'], netParams.popParams[post]['numCells'],
+                                   prob, getattr(cfg, 'connSeed', 0), '%s->%s' %(pre, post))
+        for synMech, weight in receptors:
+            rule = {
+                'oneSynPerNetcon': not shared,
+                'preConds': {'popLabel': pre},
+                'postConds': {'popLabel': post},
+                'weight': getattr(cfg, weight[0] if isinstance(weight, tuple) else weight),
+                'sec': 'dend',
+                'delay': delay,
+                'loc': 0.5,
+                'synMech': synMech}
+            if sampling == 'vectorized':
+                rule['connList'] = pairs
+            else:
+                rule['probability'] = prob
+            netParams.connParams[conn_label(pre, synMech, post)] = rule
@@ -0,0 +1,79 @@
+'''
+d_lambda discretization of the netpyne cell rules: the nseg of every section
+is set from its length constant at a chosen frequency, as genrn.cal_nseg does
+for instantiated sections (https://www.neuron.yale.edu/neuron/static/docs/d_lambda/d_lambda.html)
+'''
+
+import json
+import math
+import templates
+
+_nsegs = {} # (fingerprint, freq, d_lambda): {sec: nseg}
+
+def lambda_f(geom, freq):
+    """
+    Returns the AC length constant (um) at freq (Hz) of a section given by its
+    geom dict (L, diam, Ra, cm, or pt3d [(x, y, z, diam)]) divided into its L.
+    """
+    fpfrc = 4 * math.pi * freq * geom.get('Ra', 35.4) * geom.get('cm', 1.0)
+    pt3d = geom.get('pt3d', [])
+    if len(pt3d) < 2:
+        return 1e5 * math.sqrt(geom['diam'] / fpfrc)
+    lam = 0
+    for (x1, y1, z1, d1), (x2, y2, z2, d2) in zip(pt3d[:-1], pt3d[1:]):
+        lam += math.sqrt((x2-x1)**2 + (y2-y1)**2 + (z2-z1)**2) / math.sqrt(d1 + d2)
+    lam *= math.sqrt(2) * 1e-5 * math.sqrt(fpfrc)
+    return geom['L'] / lam
+
+def nseg(geom, freq=100, d_lambda=0.1):
+    """
+    Returns the (odd) number of segments of a section for which no segment is
+    longer than d_lambda length constants at freq
+    """
+    return int((geom['L'] / (d_lambda * lambda_f(geom, freq)) + 0.9) / 2) * 2 + 1
+
+def rule_nseg(rule, freq=100, d_lambda=0.1):
+    """
+    Returns {section: nseg} of a cell rule, cached per rule fingerprint
+    """
+    key = (templates.fingerprint(rule), freq, d_lambda)
+    if key not in _nsegs:
+        _nsegs[key] = {name: nseg(sec['geom'], freq, d_lambda) for name, sec in rule['secs'].items()
+                       if 'L' in sec.get('geom', {}) and ('diam' in sec['geom'] or 'pt3d' in sec['geom'])}
+    return _nsegs[key]
+
+def rule_cells(netParams, rule):
+    """
+    Returns the number of cells of the populations a cell rule applies to
+    """
+    conds = rule.get('conds', {})
+    return sum(pop.get('numCells', 0) for pop in netParams.popParams.values()
+               if conds and all(pop.get(k) == v for k, v in conds.items()))
+
+def discretize(netParams, freq=100, d_lambda=0.1):
+    """
+    Sets the nseg of every section of every cell rule of netParams by the
+    d_lambda rule (on copies of the rules, see templates.own_rules), prints and returns
+    the total number of compartments of the network before and after, and
+    {rule: {section: (old, new nseg)}}.
+    """
+    templates.own_rules(netParams)
+    # the same rule may be registered under several labels: keys and nsegs are
+    # all computed before any rule is changed, and its cells counted once
+    rules = [(label, rule, (json.dumps(rule.get('conds', {}), sort_keys=True, default=str), templates.fingerprint(rule)),
+              rule_nseg(rule, freq, d_lambda)) for label, rule in netParams.cellParams.items()]
+    report = {}
+    before = after = 0
+    seen = set()
+    for label, rule, key, nsegs in rules:
+        ncells = rule_cells(netParams, rule) if key not in seen else 0
+        seen.add(key)
+        report[label] = {name: (rule['secs'][name]['geom'].get('nseg', 1), n) for name, n in nsegs.items()}
+        for name, (old, n) in report[label].items():
+            before += ncells * old
+            after += ncells * n
+    for label, rule, key, nsegs in rules:
+        for name, n in nsegs.items():
+            rule['secs'][name]['geom']['nseg'] = n
+    print('  d_lambda %g at %g Hz: %d -> %d compartments' %(d_lambda, freq, before, after))
+    return before, after, report
@@ -5,11 +5,64 @@ calling from python calls genrn with t-junction electrophysiology and morphology
 peripheral fiber, drg with soma, central fiber
 properties taken from Waxman
 '''
-from neuron import h
+from neuron import h, nrn
+import numpy as np
 import logging as lgg
 import re
 
+def graded(value):
+    # per segment values: a function of x or a value per segment
+    return callable(value) or isinstance(value, (list, tuple, np.ndarray))
+
+_per_x = set() # functions of x that do not take arrays (warned once)
+
+def seg_values(sec, func):
+    """
+    Returns the values of func over the segments of sec as an array: func is a
+    value per segment (list or array), or a function of x called once with the
+    x of all segments (numpy-vectorized), or once per segment if it does not
+    take arrays (raises TypeError or ValueError on them, logged once per function).
+    """
+    xs = (np.arange(sec.nseg) + 0.5) / sec.nseg
+    if callable(func):
+        try:
+            vals = np.asarray(func(xs), dtype=float)
+        except (TypeError, ValueError) as err:
+            if func not in _per_x:
+                _per_x.add(func)
+                lgg.warning('%s does not take an array of x (%s), called once per segment' %(getattr(func, '__name__', func), err))
+            vals = np.array([func(x) for x in xs], dtype=float)
+    else:
+        vals = np.asarray(func, dtype=float)
+    if vals.ndim == 0:
+        return np.full(xs.shape, float(vals))
+    if vals.shape != xs.shape:
+        raise ValueError('%d values for the %d segments of %s' %(vals.size, sec.nseg, sec.name()))
+    return vals
+
+_fsetters = {}
+
+def fset_range(sec, attr, func):
+    """
+    Sets the range variable attr (e.g. gnabar_HH2 or diam) of every segment of
+    sec to the values of func (see seg_values), written in bulk from a Vector by
+    a hoc loop (compiled once per variable).
+    the loop is the fastest one-shot write (101 segments: ~1.5x faster than a
+    setattr per segment, ~7x faster than building and scattering a PtrVector):
+    pointers (PtrVector, setpointer) only pay off when kept and written again,
+    and Vector.play drives values during the run, not at build time.
+    """
+    if attr not in _fsetters:
+        if not re.match(r'^[A-Za-z_]\w*$', attr):
+            raise ValueError('not a range variable: %s' %(attr))
+        name = 'genrn_fset_%s' %(attr)
+        if not hasattr(h, name):
+            h('proc %s() { local i  i = 0  for (x, 0) { %s(x) = $o1.x[i]  i += 1 } }' %(name, attr))
+        _fsetters[attr] = getattr(h, name)
+    _fsetters[attr](h.Vector(seg_values(sec, func)), sec=sec)
+
 class gesec():
+    __slots__ = ('name', 'sec', 'mechs', 'pps', 'ions')
 
     def __init__(self, name='sec', ions={'na': 58, 'k': -92, 'ca': -129, 'cl': -89}):
         self.name  = name
@@ -19,10 +72,6 @@ class gesec():
         self.ions  = {}
         for ion in ions:
             self.ions[ion] = {'e': ions[ion], 'mechs': []}
-        self.insert = self.im = self.insert_mech
-        self.ims = self.insert_mechs
-        self.gm = self.get_mechs
-        self.gs = self.get_sec
 
     def insert_mechs(self, mechs, *mmechs):
         if isinstance(mechs, str):
@@ -63,7 +112,7 @@ class gesec():
                         setattr(self.sec, 'e%s' %(ion), post)
         for param in params:
             # if there is a function for the parameter, call it
-            if not callable(params[param]): setattr(self.sec, '%s_%s' %(param, mech), params[param])
+            if not graded(params[param]): setattr(self.sec, '%s_%s' %(param, mech), params[param])
             else: self.fset_mech(mech, param, params[param])
         # add mech to any ionlist
         for ion in self.ions.keys():
@@ -71,22 +120,18 @@ class gesec():
                 self.ions[ion]['mechs'].append(mech)
 
     def fset_mech(self, mech, param, func):
-        for seg in self.sec:
-            val = func(seg.x)
-            setattr(seg, '%s_%s' %(param, mech), val)
+        fset_range(self.sec, '%s_%s' %(param, mech), func)
 
     def set_props(self, props):
         for prop in props:
-            if callable(props[prop]):
-                self.fset_prop(self.sec, prop, props[prop])
+            if graded(props[prop]):
+                self.fset_prop(prop, props[prop])
             else:
                 setattr(self.sec, '%s' %(prop), props[prop])
 
     def fset_prop(self, prop, func):
         #set properties of the segment, diam
-        for seg in self.sec:
-            val = func(seg.x)
-            setattr(seg, prop, val)
+        fset_range(self.sec, prop, func)
 
     def get_mechs(self):
         return self.mechs
@@ -110,11 +155,17 @@ class gesec():
     def __call__(self, item):
         return self.sec(item)
 
+    insert = im = insert_mech
+    ims = insert_mechs
+    gm = get_mechs
+    gs = get_sec
+
 #    def __iter__(self):
 #    def __next__(self):
 #    def __getitem__(self, item):
 
 class genrn():
+    __slots__ = ('tags', 'secs', 'gesecs', 'v_init')
 
     def __init__(self,x=0,y=0,z=0,ID=0,v_init=None,
                  secs  = {'genrn': {}},
@@ -131,16 +182,21 @@ class genrn():
         self.connect_secs(cons)
         self.v_init = v_init
 
+    def __getattr__(self, item):
+        # sections by name (i.e. self.soma)
+        try: return object.__getattribute__(self, 'secs')[item].sec
+        except (AttributeError, KeyError): raise AttributeError(item)
+
     def return_sec(self, sec):
-        if isinstance(sec, type(h.Section())): return sec
+        if isinstance(sec, nrn.Section): return sec
         elif isinstance(sec, str): return self.secs[sec].sec
-        elif isinstance(sec, type(gesec())): return sec.sec
+        elif isinstance(sec, gesec): return sec.sec
         raise TypeError
 
     def return_gesec(self, sec):
-        if isinstance(self, type(h.Section())): return self.secs[sec.name]
+        if isinstance(sec, nrn.Section): return self.secs[sec.name()]
         elif isinstance(sec, str): return self.secs[sec]
-        elif isinstance(sec, type(gesec())): return sec
+        elif isinstance(sec, gesec): return sec
         raise TypeError
 
     def init_cell(self, secs, ions):
@@ -153,7 +209,6 @@ class genrn():
         # sec_ -> pointer
         self.secs[sec] = (sec_)
         self.tags['all'].append(sec_)
-        self.__dict__[sec] = sec_.sec
         for tag in tags:
             try: self.tags[tag].append(sec_)
             except: self.tags[tag] = [sec_]
@@ -181,7 +236,8 @@ class genrn():
             for mech in mechs:
                 sec.insert(mech)
                 for param in mechs[mech]:
-                    setattr(sec.sec, '%s_%s' %(param, mech), mechs[mech][param])
+                    if graded(mechs[mech][param]): fset_range(sec.sec, '%s_%s' %(param, mech), mechs[mech][param])
+                    else: setattr(sec.sec, '%s_%s' %(param, mech), mechs[mech][param])
             for ion in ions:
                 try: setattr(sec.sec, 'e%s' %(ion), ions[ion])
                 except: pass
@@ -193,8 +249,7 @@ class genrn():
     def connect_secs(self, cons):
         for con in cons:
             try:
-                exestr = 'self.%s.connect(self.%s)' %(con[0], con[1])
-                exec(exestr)
+                self.secs[con[0]].sec.connect(self.secs[con[1]].sec)
                 lgg.info('%s[1] -> %s[0]' %(con[1], con[0]))
             except:
                 lgg.info('failed to connect: %s[1] -> %s[0]' %(con[1], con[0]))
@@ -205,9 +260,15 @@ class genrn():
 
     def tag_fedit_mechs(self, tag, mech, param, func):
         for sec in self.tags[tag]:
-            for seg in sec.sec:
-                val = func(seg.x)
-                setattr(seg, '%s_%s' %(param, mech), val)
+            fset_range(sec.sec, '%s_%s' %(param, mech), func)
+
+    def set_nseg(self, freq, d_lambda, tag = 'all'):
+        # d_lambda rule (cal_nseg) for the sections of a tag, returns {sec: (old, new nseg)}
+        nsegs = {}
+        for sec in self.tags[tag]:
+            nsegs[sec.name] = (sec.sec.nseg, cal_nseg(sec.sec, freq, d_lambda))
+            sec.sec.nseg = nsegs[sec.name][1]
+        return nsegs
 
     def get_dict(self, tag = 'all'):
         rpr = {}
@@ -277,6 +338,99 @@ class genrn():
             rpr += 'mechs:\t%s\n\n' %(list(r['density_mechs'].keys()))
         return rpr
 
+def mech_params(mech):
+    # PARAMETER and ASSIGNED range variables of a density mechanism (e.g.
+    # gnabar_HH2), the states are set by its INITIAL block
+    name = h.ref('')
+    params = []
+    for vartype in (1, 2):
+        ms = h.MechanismStandard(mech, vartype)
+        for i in range(int(ms.count())):
+            if ms.name(name, i) == 1:
+                params.append(name[0])
+    return params
+
+class plan():
+    """
+    a built genrn read once into the NEURON calls that rebuild it: geometry,
+    mechanisms and their parameters, Nernst potentials and topology as found on
+    the sections of the prototype (whatever built it), so build() only makes the
+    NEURON calls (and copies the section bookkeeping).
+    """
+    __slots__ = ('secs', 'cons', 'v_init')
+
+    def __init__(self, proto):
+        names = {sec_.sec: name for name, sec_ in proto.secs.items()}
+        self.secs = []
+        self.cons = []
+        for name, sec_ in proto.secs.items():
+            sec = sec_.sec
+            inserts = list(dict.fromkeys(sec_.mechs))
+            attrs = ['cm', 'diam']
+            for mech in inserts:
+                attrs.extend(mech_params(mech))
+            attrs.extend('e%s' %(ion) for ion in sec_.ions if hasattr(sec, 'e%s' %(ion)))
+            # values of the prototype, set per section if uniform
+            psets, pfsets = [], []
+            for attr in attrs:
+                vals = [getattr(seg, attr) for seg in sec]
+                if len(set(vals)) == 1: psets.append((attr, vals[0]))
+                else: pfsets.append((attr, vals))
+            ions = [(ion, sec_.ions[ion]['e'], list(sec_.ions[ion]['mechs'])) for ion in sec_.ions]
+            tags = [tag for tag in proto.tags if tag != 'all' and sec_ in proto.tags[tag]]
+            sets = [('L', sec.L), ('Ra', sec.Ra), ('nseg', sec.nseg)]
+            self.secs.append((name, tags, sets, inserts, psets, pfsets, list(sec_.mechs), ions))
+            parent = sec.parentseg()
+            if parent is not None and parent.sec in names:
+                self.cons.append((name, names[parent.sec], parent.x, sec.orientation()))
+        self.v_init = proto.v_init
+
+    def build(self):
+        """
+        Returns a new genrn, identical to the prototype of the plan
+        """
+        cell = genrn.__new__(genrn)
+        cell.tags = {'all': []}
+        cell.secs = {}
+        cell.gesecs = cell.tags['all']
+        cell.v_init = self.v_init
+        for name, tags, sets, inserts, psets, pfsets, mechs, ions in self.secs:
+            sec_ = gesec.__new__(gesec)
+            sec_.name = name
+            sec_.sec = sec = h.Section(name=name)
+            sec_.mechs = list(mechs)
+            sec_.pps = []
+            sec_.ions = {ion: {'e': e, 'mechs': list(imechs)} for ion, e, imechs in ions}
+            cell.secs[name] = sec_
+            cell.tags['all'].append(sec_)
+            for tag in tags:
+                try: cell.tags[tag].append(sec_)
+                except KeyError: cell.tags[tag] = [sec_]
+            for prop, val in sets:
+                setattr(sec, prop, val)
+            for mech in inserts:
+                sec.insert(mech)
+            for attr, val in psets:
+                setattr(sec, attr, val)
+            for attr, vals in pfsets:
+                fset_range(sec, attr, vals)
+        for child, parent, parentX, childX in self.cons:
+            cell.secs[child].sec.connect(cell.secs[parent].sec(parentX), childX)
+        return cell
+
+def build_many(create, n):
+    """
+    Returns n cells built by create() (e.g. cells.createEX): the first by create
+    itself, the others from the plan of that prototype. [] if n is 0.
+    """
+    if n < 1:
+        return []
+    proto = create()
+    if n == 1:
+        return [proto]
+    plan_ = plan(proto)
+    return [proto] + [plan_.build() for i in range(n - 1)]
+
 def cal_nseg( sec, freq, d_lambda ):
 #neuron+python of https://www.neuron.yale.edu/neuron/static/docs/d_lambda/d_lambda.html
     nseq = lambda fc_: int((sec.L / (d_lambda * fc_) + 0.9) / 2) * 2 + 1
@@ -291,12 +445,12 @@ def cal_nseg( sec, freq, d_lambda ):
     x1 = sec.arc3d(0)
     d1 = sec.diam3d(0)
 
-    for i in range(n3d):
+    for i in range(1, n3d):
         x2 = sec.arc3d(i)
         d2 = sec.diam3d(i)
         fc += (x2 - x1) / h.sqrt(d1 + d2)
-        x2 = x1
-        d2 = d1
+        x1 = x2
+        d1 = d2
 
     fc *= h.sqrt(2) * 1e-5 * h.sqrt(fpfrc)
     return nseq(sec.L/fc)
@@ -5,9 +5,42 @@ from Sekiguchi et al. (2021)
 
 from netpyne import sim
 from neuron import h
+import spkt_stream
+import net_cache
+import connectivity
+import steady
+import templates
+import solver
+import ratetables
 					
 simConfig, netParams = sim.readCmdLineArgs(simConfigDefault='cfg_mechanical.py', netParamsDefault='netParams_mechanical.py')
+ratetables.set_tables(simConfig, netParams)
 
-# Create, Simulate, and Analyze the Network:
-sim.createSimulateAnalyze(netParams = netParams, simConfig = simConfig)
+if getattr(simConfig, 'steady_init', False):
+    # resting states of the cell rules, solved (once) before the network exists
+    steady.prepare(netParams, simConfig)
 
+# Create, Simulate, and Analyze the Network:
+with templates.compart_cell(simConfig):
+    if getattr(simConfig, 'net_cache', False):
+        # connections reloaded from the cache of realized networks
+        net_cache.create(netParams, simConfig)
+    else:
+        sim.create(netParams = netParams, simConfig = simConfig)
+connectivity.set_fused_weights(sim.net, simConfig)
+if getattr(simConfig, 'steady_init', False):
+    # cells initialized at the resting states of their rules
+    steady.init_steady(sim.net, simConfig)
+if getattr(simConfig, 'nthreads', 1) > 1:
+    solver.set_threads(simConfig.nthreads)
+if getattr(simConfig, 'cvode_active', False):
+    # variable time step, global or per cell
+    solver.use_cvode(simConfig, local=getattr(simConfig, 'use_local_dt', False))
+if getattr(simConfig, 'coreneuron', False):
+    # run through CoreNEURON (mods compiled with nrnivmodl -coreneuron mods)
+    solver.use_coreneuron(simConfig)
+if getattr(simConfig, 'stream_window', None):
+    # afferent spikes generated window by window during the run
+    stream = spkt_stream.afferent_stream(simConfig)
+sim.simulate()
+sim.analyze()
@@ -10,6 +10,7 @@ NEURON {
 	RANGE gkbar, ik
 	RANGE ninf, ntau, hinf, htau
 	RANGE tadj
+	THREADSAFE
 }
 
 UNITS {
@@ -74,16 +75,18 @@ FUNCTION trap(x,y) {
             trap = x/(exp(x/y) - 1)
     }
 }
-PROCEDURE rates(v) {
-	TABLE ninf, ntau, hinf, htau DEPEND tadj FROM -100 TO 100 WITH 200
+PROCEDURE rates(v) { LOCAL q10
+	TABLE ninf, ntau, hinf, htau DEPEND celsius FROM -100 TO 100 WITH 200
+
+	q10 = 3 ^ ((celsius - 23) / 10) : tadj, computed here since CVODE may build the table before INITIAL
 
 	nalpha = 0.032 * trap(-v - 64 - 0 , 6)
 	nbeta  = 0.203 * exp((-v - 40 - 0)/24)
 	ninf = nalpha / (nalpha + nbeta)
-	ntau = 1 / (nalpha + nbeta) / tadj
+	ntau = 1 / (nalpha + nbeta) / q10
 
 	halpha = 0.05/(exp((v + 86 + 0)/10)+1)
 	hbeta = 0.05/(exp((-v - 86 - 0)/10)+1)
 	hinf = halpha / (halpha + hbeta)
-	htau = 1 / (halpha + hbeta) / tadj
+	htau = 1 / (halpha + hbeta) / q10
 }
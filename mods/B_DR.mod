@@ -9,6 +9,7 @@ NEURON {
 	RANGE gkbar, ik
 	RANGE ninf, ntau
 	RANGE tadj
+	THREADSAFE
 }
 
 UNITS {
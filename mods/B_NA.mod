@@ -13,6 +13,7 @@ NEURON {
 	RANGE inf, tau
 	RANGE tadj, tau_factor, alpha_shift, beta_shift
 	: GLOBAL alpha_shift, beta_shift
+	THREADSAFE
 }
 
 UNITS {
@@ -89,7 +90,10 @@ FUNCTION trap(x,y) {
 }
 
 PROCEDURE rates(v) {
-	TABLE inf, tau DEPEND tadj FROM -100 TO 100 WITH 200
+	: built once for all instances with the tau_factor, alpha_shift and beta_shift
+	: of the instance that builds it, ratetables.set_tables turns it off
+	: (usetable_B_Na = 0) when a cell rule sets them away from their defaults
+	TABLE inf, tau DEPEND celsius FROM -100 TO 100 WITH 200
 	FROM i=0 TO 1 {
 		a[i] = alpha(v,i) b[i]=beta(v,i)
 		tau[i] = 1 / (a[i] + b[i]) / tau_factor
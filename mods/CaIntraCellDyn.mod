@@ -39,6 +39,7 @@ NEURON {
 	SUFFIX CaIntraCellDyn
 	USEION ca READ ica, cai WRITE cai	
         RANGE cai_new, depth, cai_inf, cai_tau
+        THREADSAFE
 }
 
 UNITS {
@@ -0,0 +1,128 @@
+TITLE GABA_A receptor with pre-synaptic short-term plasticity, event-driven
+
+COMMENT
+GABAa_DynSyn with its dual-exponential conductance advanced analytically
+instead of integrated every step: the amplitudes A, B of the two exponentials
+jump at every event (NET_RECEIVE) and are decayed at the time of the
+BREAKPOINT, once per time step, by the decay factors of the step (exact
+between events, exp evaluated again only when the step changes). once B has
+decayed below gtol of its value after the last event (B0) the synapse is
+silent, g = 0 without any exp, until its next event.
+the BREAKPOINT runs at t+dt/2 of the fixed step, while the DynSyn mod uses its
+states integrated to t: the conductance leads by half a step, so spike times
+are close to those of the DynSyn mod but not identical (see
+benchmarks/bench_evsyn.py).
+ENDCOMMENT
+
+
+NEURON {
+	POINT_PROCESS GABAa_DynSynEv
+	RANGE tau_rise, tau_decay
+	RANGE U1, tau_rec, tau_fac
+	RANGE i, g, e
+	GLOBAL gtol
+	NONSPECIFIC_CURRENT i
+	THREADSAFE
+}
+
+PARAMETER {
+	tau_rise  = 1.0   (ms)  : dual-exponential conductance profile
+	tau_decay = 20.0  (ms)  : IMPORTANT: tau_rise < tau_decay
+	U1        = 1.0   (1)   : The parameter U1, tau_rec and tau_fac define
+	tau_rec   = 0.1   (ms)  : the pre-synaptic short-term plasticity
+	tau_fac   = 0.1   (ms)  : mechanism (see Fuhrmann et al, 2002)
+	e         = -80.0 (mV)  : GABAa synapse reversal potential
+	gtol      = 1e-6  (1)   : B below gtol of its value after the last event -> silent synapse
+}
+
+
+ASSIGNED {
+	v	(mV)
+	i	(nA)
+	g	(umho)
+	factor
+	A	: the dual-exponential profile, g = B-A
+	B
+	A0	: A and B after the last event
+	B0
+	hd	(ms)	: step A and B were last decayed over
+	ea	: and their decay factors over it
+	eb
+	tg	(ms)	: time A and B were evaluated at
+	active	: 0 for a silent synapse
+}
+
+INITIAL{
+	LOCAL tp
+	A = 0
+	B = 0
+	A0 = 0
+	B0 = 0
+	tg = t
+	hd = -1
+	ea = 1
+	eb = 1
+	active = 0
+	tp = (tau_rise*tau_decay)/(tau_decay-tau_rise)*log(tau_decay/tau_rise)
+	factor = -exp(-tp/tau_rise)+exp(-tp/tau_decay)
+	factor = 1/factor
+}
+
+BREAKPOINT {
+	conductance()
+	i = g*(v-e)
+}
+
+PROCEDURE conductance() {
+	if (active) {
+		if (t != tg) { : once per step, the BREAKPOINT being evaluated twice
+			decay()
+			if (B < gtol*B0) {
+				active = 0
+				A = 0
+				B = 0
+			}
+		}
+		g = B-A
+	}else{
+		g = 0
+	}
+}
+
+PROCEDURE decay() {
+	: A and B from tg to t, the factors kept while the step stays the same
+	if (fabs(t-tg-hd) > 1e-9) {
+		hd = t-tg
+		ea = exp(-hd/tau_rise)
+		eb = exp(-hd/tau_decay)
+	}
+	A = A*ea
+	B = B*eb
+	tg = t
+}
+
+NET_RECEIVE (weight, Pv, P, Use, t0 (ms)){
+	INITIAL{
+		P=1
+		Use=0
+		t0=t
+	}
+
+	Use = Use * exp(-(t-t0)/tau_fac)
+	Use = Use + U1*(1-Use) 
+	P   = 1-(1- P) * exp(-(t-t0)/tau_rec)
+	Pv  = Use * P
+	P   = P - Use * P
+	
+	t0 = t
+
+	if (active) {
+		decay()
+	}
+	A0 = A + weight*factor*Pv
+	B0 = B + weight*factor*Pv
+	A = A0
+	B = B0
+	tg = t
+	active = 1
+}
@@ -17,6 +17,7 @@ NEURON {
 	RANGE U1, tau_rec, tau_fac
 	RANGE i, g, e
 	NONSPECIFIC_CURRENT i
+	THREADSAFE
 }
 
 PARAMETER {
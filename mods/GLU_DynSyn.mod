@@ -0,0 +1,122 @@
+TITLE Co-located AMPA and NMDA receptors with shared pre-synaptic short-term plasticity
+
+
+COMMENT
+AMPA_DynSyn and NMDA_DynSyn of a glutamatergic contact fused in a single point
+process: one pre-synaptic short-term plasticity state (Fuhrmann et al, 2002)
+drives two dual-exponential conductances. The AMPA weight is the first NetCon
+weight and the NMDA weight the second, so one NetCon activates both.
+NMDA conductance with Mg block (Jahr & Stevens 1990) and Ca influx as in NMDA_DynSyn
+ENDCOMMENT
+
+
+NEURON {
+	POINT_PROCESS GLU_DynSyn
+	USEION ca WRITE ica
+	USEION mg READ mgo VALENCE 2
+	RANGE tau_rise_ampa, tau_decay_ampa, tau_rise_nmda, tau_decay_nmda
+	RANGE U1, tau_rec, tau_fac
+	RANGE i, i_ampa, i_nmda, g_ampa, g_nmda, e, mg, inon, ica, ca_ratio
+	NONSPECIFIC_CURRENT inon
+	THREADSAFE
+}
+
+UNITS {
+	(nA) = (nanoamp)
+	(mV) = (millivolt)
+	(molar) = (1/liter)
+	(mM) = (millimolar)
+}
+
+PARAMETER {
+	tau_rise_ampa  = 0.1   (ms)  : dual-exponential conductance profiles
+	tau_decay_ampa = 5.0   (ms)  : IMPORTANT: tau_rise < tau_decay
+	tau_rise_nmda  = 5.0   (ms)
+	tau_decay_nmda = 70.0  (ms)
+	U1        = 1.0   (1)   : The parameter U1, tau_rec and tau_fac define
+	tau_rec   = 0.1   (ms)  : the pre-synaptic SP short-term plasticity
+	tau_fac   = 0.1   (ms)  : mechanism (see Fuhrmann et al, 2002)
+	e         = 0.0   (mV)  : synapse reversal potential
+	mgo		  = 1.0   (mM)  : external magnesium concentration
+	ca_ratio  = 0.1   (1)   : ratio of NMDA calcium current to total NMDA current
+}
+
+
+ASSIGNED {
+	v		(mV)
+	i		(nA)
+	i_ampa	(nA)
+	i_nmda	(nA)
+	g_ampa	(umho)
+	g_nmda	(umho)
+	factor_ampa	(1)
+	factor_nmda	(1)
+	ica		(nA)
+	inon	(nA)
+}
+
+STATE {
+	A_ampa	: state variables to construct the dual-exponential profiles
+	B_ampa
+	A_nmda
+	B_nmda
+}
+
+INITIAL{
+	A_ampa = 0
+	B_ampa = 0
+	A_nmda = 0
+	B_nmda = 0
+	factor_ampa = peak_factor(tau_rise_ampa, tau_decay_ampa)
+	factor_nmda = peak_factor(tau_rise_nmda, tau_decay_nmda)
+}
+
+BREAKPOINT {
+	SOLVE state METHOD cnexp
+	g_ampa = B_ampa-A_ampa
+	g_nmda = B_nmda-A_nmda
+	i_ampa = g_ampa*(v-e)
+	i_nmda = g_nmda*mgblock(v)*(v-e)
+	i = i_ampa + i_nmda
+	ica = ca_ratio*i_nmda
+	inon = i_ampa + (1-ca_ratio)*i_nmda
+}
+
+DERIVATIVE state{
+	A_ampa' = -A_ampa/tau_rise_ampa
+	B_ampa' = -B_ampa/tau_decay_ampa
+	A_nmda' = -A_nmda/tau_rise_nmda
+	B_nmda' = -B_nmda/tau_decay_nmda
+}
+
+FUNCTION peak_factor(tau_rise (ms), tau_decay (ms)) {
+	LOCAL tp
+	tp = (tau_rise*tau_decay)/(tau_decay-tau_rise)*log(tau_decay/tau_rise)
+	peak_factor = 1/(-exp(-tp/tau_rise)+exp(-tp/tau_decay))
+}
+
+FUNCTION mgblock(v(mV)) {
+	: from Jahr & Stevens 1990
+	mgblock = 1 / (1 + exp(0.062 (/mV) * -v) * (mgo / 3.57 (mM)))
+}
+
+NET_RECEIVE (w_ampa, w_nmda, Pv, P, Use, t0 (ms)){
+	INITIAL{
+		P=1
+		Use=0
+		t0=t
+	}
+
+	Use = Use * exp(-(t-t0)/tau_fac)
+	Use = Use + U1*(1-Use)
+	P = 1-(1- P) * exp(-(t-t0)/tau_rec)
+	Pv= Use * P
+	P = P - Use * P
+
+	t0=t
+
+	A_ampa = A_ampa + w_ampa*factor_ampa*Pv
+	B_ampa = B_ampa + w_ampa*factor_ampa*Pv
+	A_nmda = A_nmda + w_nmda*factor_nmda*Pv
+	B_nmda = B_nmda + w_nmda*factor_nmda*Pv
+}
@@ -12,6 +12,8 @@ TITLE Hippocampal HH channels
 :
 : Modifications by Arthur Houweling for use in MyFirstNEURON
 : Modifications by Paulo Aguiar: vh changed from 5 to 6 - NOT ANYMORE: vh=5 as originally set
+: rates tabulated in the traub convention v2 = v - vtraub, from v2min to v2max,
+: when tabulate is set (see ratetables.py)
 
 INDEPENDENT {t FROM 0 TO 1 WITH 1 (ms)}
 
@@ -24,6 +26,8 @@ NEURON {
 	RANGE tau_m, tau_h, tau_n
 	RANGE m_exp, h_exp, n_exp
 	RANGE ik, ina 
+	GLOBAL v2min, v2max, tabulate
+	THREADSAFE
 }
 
 
@@ -42,6 +46,9 @@ PARAMETER {
 	dt              (ms)
 	v               (mV)
 	vtraub	= -55	(mV)	: adjusts threshold
+	v2min	= -50	(mV)	: range of the rate tables (v - vtraub)
+	v2max	= 150	(mV)
+	tabulate = 0		: 1 to take the rates from the tables
 }
 
 STATE {
@@ -84,9 +91,6 @@ PROCEDURE states() {	: this discretized form is more stable
 	m = m + m_exp * (m_inf - m)
 	h = h + h_exp * (h_inf - h)
 	n = n + n_exp * (n_inf - n)
-	VERBATIM
-	return 0;
-	ENDVERBATIM
 }
 
 UNITSOFF
@@ -104,27 +108,58 @@ INITIAL {
 PROCEDURE evaluate_fct(v(mV)) { LOCAL a,b,v2,vh
 
 	v2 = v - vtraub : convert to traub convention
-	vh = 5
+	if (tabulate) {
+		rates(v2)
+	} else {
+		vh = 5
+	
+		a = 0.32 * (13-v2) / ( exp((13-v2)/4) - 1)
+		b = 0.28 * (v2-40) / ( exp((v2-40)/5) - 1)
+		tau_m = 1 / (a + b) / tadj
+		m_inf = a / (a + b)
+
+		:a = 0.128 * exp((17-v2)/18)
+		:b = 4 / ( 1 + exp((40-v2)/5) )
+		:tau_h = 1 / (a + b) / tadj
+		:h_inf = a / (a + b)
+	
+		a = 0.128 * exp((17-v2-vh)/18)
+		b = 4 / ( 1 + exp((40-v2-vh)/5) )
+		tau_h = 1 / (a + b) / tadj
+		h_inf = a / (a + b)	
+	
 	
-	a = 0.32 * (13-v2) / ( exp((13-v2)/4) - 1)
-	b = 0.28 * (v2-40) / ( exp((v2-40)/5) - 1)
-	tau_m = 1 / (a + b) / tadj
+		a = 0.032 * (15-v2) / ( exp((15-v2)/5) - 1)
+		b = 0.5 * exp((10-v2)/40)
+		tau_n = 1 / (a + b) / tadj
+		n_inf = a / (a + b)
+
+		m_exp = 1 - exp(-dt/tau_m)
+		h_exp = 1 - exp(-dt/tau_h)
+		n_exp = 1 - exp(-dt/tau_n)
+	}
+}
+
+PROCEDURE rates(v2(mV)) { LOCAL a,b,vh,q10
+	TABLE m_inf, h_inf, n_inf, tau_m, tau_h, tau_n, m_exp, h_exp, n_exp DEPEND dt, celsius, v2min, v2max FROM v2min TO v2max WITH 1000
+	: the tabulated rates and step factors of evaluate_fct, 0/0 trapped. q10
+	: is tadj, the table can be built before INITIAL
+	q10 = 3.0 ^ ((celsius-36)/ 10 )
+	vh = 5
+
+	a = 0.32 * expM1(13-v2, 4)
+	b = 0.28 * expM1(v2-40, 5)
+	tau_m = 1 / (a + b) / q10
 	m_inf = a / (a + b)
 
-	:a = 0.128 * exp((17-v2)/18)
-	:b = 4 / ( 1 + exp((40-v2)/5) )
-	:tau_h = 1 / (a + b) / tadj
-	:h_inf = a / (a + b)
-	
 	a = 0.128 * exp((17-v2-vh)/18)
 	b = 4 / ( 1 + exp((40-v2-vh)/5) )
-	tau_h = 1 / (a + b) / tadj
-	h_inf = a / (a + b)	
-	
-	
-	a = 0.032 * (15-v2) / ( exp((15-v2)/5) - 1)
+	tau_h = 1 / (a + b) / q10
+	h_inf = a / (a + b)
+
+	a = 0.032 * expM1(15-v2, 5)
 	b = 0.5 * exp((10-v2)/40)
-	tau_n = 1 / (a + b) / tadj
+	tau_n = 1 / (a + b) / q10
 	n_inf = a / (a + b)
 
 	m_exp = 1 - exp(-dt/tau_m)
@@ -132,4 +167,13 @@ PROCEDURE evaluate_fct(v(mV)) { LOCAL a,b,v2,vh
 	n_exp = 1 - exp(-dt/tau_n)
 }
 
+FUNCTION expM1(x,y) {
+	: traps for 0 in denominator of rate equations
+	if (fabs(x/y) < 1e-6) {
+		expM1 = y*(1 - x/y/2)
+	}else{
+		expM1 = x/(exp(x/y) - 1)
+	}
+}
+
 UNITSON
@@ -0,0 +1,164 @@
+TITLE Hippocampal HH channels
+:
+: Fast Na+ and K+ currents responsible for action potentials
+: Iterative equations
+:
+: Equations modified by Traub, for Hippocampal Pyramidal cells, in:
+: Traub & Miles, Neuronal Networks of the Hippocampus, Cambridge, 1991
+:
+: range variable vtraub adjust threshold
+:
+: Written by Alain Destexhe, Salk Institute, Aug 1992
+:
+: Modifications by Arthur Houweling for use in MyFirstNEURON
+: Modifications by Paulo Aguiar: vh changed from 5 to 6 - NOT ANYMORE: vh=5 as originally set
+
+: rates tabulated in the traub convention v2 = v - vtraub, from v2min to v2max,
+: when tabulate is set (see ratetables.py)
+
+INDEPENDENT {t FROM 0 TO 1 WITH 1 (ms)}
+
+: variable time step variant of HH2 (cfg.cvode_active, see solver.py): the states
+: are a DERIVATIVE block solved with cnexp, which CVODE integrates. HH2 keeps its
+: fixed step update
+
+NEURON {
+	SUFFIX HH2_CV
+	USEION na READ ena WRITE ina
+	USEION k READ ek WRITE ik
+	RANGE gnabar, gkbar, vtraub
+	RANGE m_inf, h_inf, n_inf
+	RANGE tau_m, tau_h, tau_n
+	RANGE ik, ina 
+	GLOBAL v2min, v2max, tabulate
+	THREADSAFE
+}
+
+
+UNITS {
+	(mA) = (milliamp)
+	(mV) = (millivolt)
+}
+
+PARAMETER {
+	gnabar	= .1 	(mho/cm2)
+	gkbar	= .06 	(mho/cm2)
+
+	ena		(mV)
+	ek		(mV)
+	celsius		(degC)
+	v               (mV)
+	vtraub	= -55	(mV)	: adjusts threshold
+	v2min	= -50	(mV)	: range of the rate tables (v - vtraub)
+	v2max	= 150	(mV)
+	tabulate = 0		: 1 to take the rates from the tables
+}
+
+STATE {
+	m h n
+}
+
+ASSIGNED {
+	ina	(mA/cm2)
+	ik	(mA/cm2)
+	il	(mA/cm2)
+	m_inf
+	h_inf
+	n_inf
+	tau_m
+	tau_h
+	tau_n
+	tadj
+}
+
+
+BREAKPOINT {
+	SOLVE states METHOD cnexp
+	ina = gnabar * m*m*m*h * (v - ena)
+	ik  = gkbar * n*n*n*n * (v - ek)
+}
+
+
+DERIVATIVE states {	: cnexp gives the stable discretized form m = m + (1 - exp(-dt/tau_m)) * (m_inf - m)
+	evaluate_fct(v)
+	m' = (m_inf - m) / tau_m
+	h' = (h_inf - h) / tau_h
+	n' = (n_inf - n) / tau_n
+}
+
+UNITSOFF
+INITIAL {
+:
+:  Q10 was assumed to be 3 for both currents
+:
+	tadj = 3.0 ^ ((celsius-36)/ 10 )
+	evaluate_fct(v)
+	m= m_inf
+	h= h_inf
+	n= n_inf
+}
+
+PROCEDURE evaluate_fct(v(mV)) { LOCAL a,b,v2,vh
+
+	v2 = v - vtraub : convert to traub convention
+	if (tabulate) {
+		rates(v2)
+	} else {
+		vh = 5
+	
+		a = 0.32 * (13-v2) / ( exp((13-v2)/4) - 1)
+		b = 0.28 * (v2-40) / ( exp((v2-40)/5) - 1)
+		tau_m = 1 / (a + b) / tadj
+		m_inf = a / (a + b)
+
+		:a = 0.128 * exp((17-v2)/18)
+		:b = 4 / ( 1 + exp((40-v2)/5) )
+		:tau_h = 1 / (a + b) / tadj
+		:h_inf = a / (a + b)
+	
+		a = 0.128 * exp((17-v2-vh)/18)
+		b = 4 / ( 1 + exp((40-v2-vh)/5) )
+		tau_h = 1 / (a + b) / tadj
+		h_inf = a / (a + b)	
+	
+	
+		a = 0.032 * (15-v2) / ( exp((15-v2)/5) - 1)
+		b = 0.5 * exp((10-v2)/40)
+		tau_n = 1 / (a + b) / tadj
+		n_inf = a / (a + b)
+	}
+}
+
+PROCEDURE rates(v2(mV)) { LOCAL a,b,vh,q10
+	TABLE m_inf, h_inf, n_inf, tau_m, tau_h, tau_n DEPEND celsius, v2min, v2max FROM v2min TO v2max WITH 1000
+	: the tabulated rates of evaluate_fct, 0/0 trapped. q10 is tadj, the
+	: table can be built before INITIAL
+	q10 = 3.0 ^ ((celsius-36)/ 10 )
+	vh = 5
+
+	a = 0.32 * expM1(13-v2, 4)
+	b = 0.28 * expM1(v2-40, 5)
+	tau_m = 1 / (a + b) / q10
+	m_inf = a / (a + b)
+
+	a = 0.128 * exp((17-v2-vh)/18)
+	b = 4 / ( 1 + exp((40-v2-vh)/5) )
+	tau_h = 1 / (a + b) / q10
+	h_inf = a / (a + b)
+
+	a = 0.032 * expM1(15-v2, 5)
+	b = 0.5 * exp((10-v2)/40)
+	tau_n = 1 / (a + b) / q10
+	n_inf = a / (a + b)
+}
+
+FUNCTION expM1(x,y) {
+	: traps for 0 in denominator of rate equations
+	if (fabs(x/y) < 1e-6) {
+		expM1 = y*(1 - x/y/2)
+	}else{
+		expM1 = x/(exp(x/y) - 1)
+	}
+}
+
+UNITSON
@@ -27,6 +27,7 @@ NEURON {
 	RANGE m_inf, h_inf, n_inf
 	RANGE tau_m, tau_h, tau_n
 	RANGE ik, ina 
+	THREADSAFE
 }
 
 
@@ -7,7 +7,8 @@ NEURON {
 	SUFFIX KDR
 	USEION k READ ek WRITE ik
 	RANGE gkbar, ik
-	GLOBAL inf
+	RANGE inf, fac
+	THREADSAFE
 }
 
 UNITS {
@@ -29,8 +30,8 @@ STATE {
 ASSIGNED {
 	ik (mA/cm2)
 	inf
+	fac
 }
-LOCAL	fac
 
 INITIAL {
 	rate(v*1(/mV))
@@ -45,9 +46,6 @@ BREAKPOINT {
 PROCEDURE states() {	: exact when v held constant
 	rate(v*1(/mV))
 	n = n + fac*(inf - n)
-	VERBATIM
-	return 0;
-	ENDVERBATIM
 }
 
 UNITSOFF
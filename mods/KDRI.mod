@@ -8,7 +8,8 @@ NEURON {
 	SUFFIX KDRI
 	USEION k READ ek WRITE ik
 	RANGE gkbar, ik
-	GLOBAL inf
+	RANGE inf, fac
+	THREADSAFE
 }
 
 UNITS {
@@ -30,9 +31,9 @@ STATE {
 ASSIGNED {
 	ik (mA/cm2)
 	inf[2]
+	fac[2]
 	
 }
-LOCAL	fac[2]
 
 INITIAL {
 	rate(v*1(/mV))
@@ -49,9 +50,6 @@ PROCEDURE states() {	: exact when v held constant
 	rate(v*1(/mV))
 	n = n + fac[0]*(inf[0] - n)
 	h = h + fac[1]*(inf[1] - h)
-	VERBATIM
-	return 0;
-	ENDVERBATIM
 }
 
 UNITSOFF
@@ -0,0 +1,82 @@
+TITLE HH k channel channel
+: Hodgkin - Huxley k channel
+
+: The model used in Safronov et al. 2000 
+
+: variable time step variant of KDR (cfg.cvode_active, see solver.py): the states
+: are a DERIVATIVE block solved with cnexp, which CVODE integrates. KDR keeps its
+: fixed step update
+
+NEURON {
+	SUFFIX KDR_CV
+	USEION k READ ek WRITE ik
+	RANGE gkbar, ik
+	RANGE inf, tau
+	THREADSAFE
+}
+
+UNITS {
+	(mA) = (milliamp)
+	(mV) = (millivolt)
+}
+
+INDEPENDENT {t FROM 0 TO 1 WITH 1 (ms)}
+PARAMETER {
+	v (mV)
+	gkbar=0 (mho/cm2) <0,1e9>
+	ek = -84 (mV)
+	celsius = 37 (degC)
+}
+STATE {
+	n
+}
+ASSIGNED {
+	ik (mA/cm2)
+	inf
+	tau (ms)
+}
+
+INITIAL {
+	rate(v*1(/mV))
+	n = inf
+}
+
+BREAKPOINT {
+	SOLVE states METHOD cnexp
+	ik = gkbar*n*n*n*n*(v - ek)
+}
+
+DERIVATIVE states {	: cnexp, exact when v held constant
+	rate(v*1(/mV))
+	n' = (inf - n)/tau
+}
+
+UNITSOFF
+FUNCTION alp(v(mV)) { LOCAL q10
+	v = v
+	q10 = 3^((celsius - 23)/10)
+	alp = q10 * .069*expM1(-v - 5, 10)
+}
+
+FUNCTION bet(v(mV)) { LOCAL q10
+	v = v
+	q10 = 3^((celsius - 23)/10)
+	bet = q10 * .024*exp((-v - 1)/30)
+}
+
+FUNCTION expM1(x,y) {
+        if (fabs(x/y) < 1e-6) {
+                expM1 = y*(1 - x/y/2)
+        }else{
+                expM1 = x/(exp(x/y) - 1)
+        }
+}
+
+
+PROCEDURE rate(v) {LOCAL a, b :rest = -70
+	TABLE inf, tau DEPEND celsius FROM -150 TO 100 WITH 200
+		a = alp(v)  b=bet(v)
+		tau = 1/(a+b)
+		inf = a/(a + b)
+}
+UNITSON
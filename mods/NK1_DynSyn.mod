@@ -50,6 +50,7 @@ NEURON {
 	RANGE U1, tau_rec, tau_fac
 	RANGE i, g, e, iNK1R, ica, ca_ratio
 	NONSPECIFIC_CURRENT iNK1R
+	THREADSAFE
 }
     
 UNITS {
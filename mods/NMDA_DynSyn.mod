@@ -17,6 +17,7 @@ NEURON {
 	RANGE U1, tau_rec, tau_fac
 	RANGE i, g, e, mg, inon, ica, ca_ratio
 	NONSPECIFIC_CURRENT inon
+	THREADSAFE
     }
     
 UNITS {
@@ -7,7 +7,8 @@ NEURON {
 	SUFFIX SS
 	USEION na READ ena WRITE ina
 	RANGE gnabar, ina
-	GLOBAL inf
+	RANGE inf, fac
+	THREADSAFE
 }
 
 UNITS {
@@ -29,8 +30,8 @@ STATE {
 ASSIGNED {
 	ina (mA/cm2)
 	inf[2]
+	fac[2]
 }
-LOCAL	fac[2]
 
 INITIAL {
 	rate(v*1(/mV))
@@ -47,9 +48,6 @@ PROCEDURE states() {	: exact when v held constant
 	rate(v*1(/mV))
 	m = m + fac[0]*(inf[0] - m)
 	h = h + fac[1]*(inf[1] - h)
-	VERBATIM
-	return 0;
-	ENDVERBATIM
 }
 
 UNITSOFF
@@ -0,0 +1,99 @@
+TITLE HH sodium channel
+: Hodgkin - Huxley squid sodium channel
+
+: The model used in Safronov et al. 2000
+
+: variable time step variant of SS (cfg.cvode_active, see solver.py): the states
+: are a DERIVATIVE block solved with cnexp, which CVODE integrates. SS keeps its
+: fixed step update
+
+NEURON {
+	SUFFIX SS_CV
+	USEION na READ ena WRITE ina
+	RANGE gnabar, ina
+	RANGE inf, tau
+	THREADSAFE
+}
+
+UNITS {
+	(mA) = (milliamp)
+	(mV) = (millivolt)
+}
+
+INDEPENDENT {t FROM 0 TO 1 WITH 1 (ms)}
+PARAMETER {
+	v (mV)
+	celsius = 37	(degC)
+	gnabar=0 (mho/cm2) <0,1e9>
+	ena = 53 (mV)
+}
+STATE {
+	m h
+}
+ASSIGNED {
+	ina (mA/cm2)
+	inf[2]
+	tau[2] (ms)
+}
+
+INITIAL {
+	rate(v*1(/mV))
+	m = inf[0]
+	h = inf[1]
+}
+
+BREAKPOINT {
+	SOLVE states METHOD cnexp
+	ina = gnabar*m*m*m*(v - ena)
+}
+
+DERIVATIVE states {	: cnexp, exact when v held constant
+	rate(v*1(/mV))
+	m' = (inf[0] - m)/tau[0]
+	h' = (inf[1] - h)/tau[1]
+}
+
+UNITSOFF
+FUNCTION alp(v(mV),i) { LOCAL a,b,c,q10 :rest = -70  order m,h
+	v = v :convert to hh convention
+	q10 = 3^((celsius - 23)/10)
+	if (i==0) {
+		alp = q10* 1 *.182*expM1(-v - 45, 9)
+	}else if (i==1){
+		alp = q10*.024*expM1(-v - 50, 5)
+
+
+	}
+}
+
+FUNCTION bet(v,i) { LOCAL a,b,c,q10 :rest = -70  order m,h
+	v = v 
+	q10 = 3^((celsius - 23)/10)
+	if (i==0) {
+		bet = q10* 1 *.124*expM1(v + 45, 9)
+	}else if (i==1){
+		bet = q10*.0091*expM1(v + 75, 5)
+	}
+}
+
+FUNCTION expM1(x,y) {
+	if (fabs(x/y) < 1e-6) {
+		expM1 = y*(1 - x/y/2)
+	}else{
+		expM1 = x/(exp(x/y) - 1)
+	}
+}
+
+PROCEDURE rate(v) {LOCAL a, b :rest = -70
+	TABLE inf, tau DEPEND celsius FROM -150 TO 100 WITH 200
+	FROM i=0 TO 1 {
+		a = alp(v,i)  b=bet(v,i)
+		tau[i] = 1/(a + b)
+		if (i==0) {		
+		inf[i] = a/(a+b)
+	}else if (i==1) {
+		inf[i] = 1/(1+exp((v+75)/9))
+	} 
+	}
+}
+UNITSON
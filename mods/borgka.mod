@@ -13,6 +13,11 @@ COMMENT
 	
 	Whyment et al. (2011), PMID: 21211550
 
+	With tabulate set (see ratetables.py) the rates come from tables in v, from
+	vmin to vmax. The tables are built once for all instances, so they hold
+	only while the kinetic parameters (vhalf*, a0*, zeta*, gm*) keep their
+	defaults, which ratetables.py checks in the cell rules.
+
 ENDCOMMENT
 
 
@@ -40,6 +45,9 @@ PARAMETER {
 	gml=1 	  	(1)
 	zetam=4		(1)
 	zetak=-5	(1)
+	vmin=-100	(mV)	: range of the rate tables
+	vmax=100	(mV)
+	tabulate=0		: 1 to take the rates from the tables
 }
 
 
@@ -47,7 +55,9 @@ NEURON {
 	SUFFIX borgka
 	USEION k READ ek WRITE ik
         RANGE gkabar,gka,vhalfn,vhalfl,a0l,a0n,zetan,zetal,gmn,gml,zetam,zetak,vhalfm,vhalfk
-        GLOBAL ninf,linf,taul,taun
+        RANGE ninf,linf,taul,taun
+        GLOBAL vmin,vmax,tabulate
+	THREADSAFE
 }
 
 STATE {
@@ -108,6 +118,19 @@ DERIVATIVE states {
 }
 
 PROCEDURE rates(v (mV)) { :callable from hoc
+        if (tabulate) {
+                tabrates(v)
+        } else {
+                calcrates(v)
+        }
+}
+
+PROCEDURE tabrates(v (mV)) {
+        TABLE ninf,taun,linf,taul DEPEND celsius,vmin,vmax FROM vmin TO vmax WITH 1000
+        calcrates(v)
+}
+
+PROCEDURE calcrates(v (mV)) {
         LOCAL a,q10,b
         q10=3^((celsius-30)/10)
         a = alpn(v)
@@ -39,6 +39,7 @@ NEURON {
         RANGE gbar, m_inf, tau_m
 	RANGE ican
 	GLOBAL beta, cac, taumin
+	THREADSAFE
 }
 
 
@@ -7,6 +7,10 @@ COMMENT
         found in:       hippocampal pyramidal cells
         *********************************************
 	Assembled for MyFirstNEURON by Arthur Houweling
+
+	m rates, the m step factor and the v dependent factors of the GHK current
+	tabulated in v, from vmin to vmax, when tabulate is set
+	(see ratetables.py)
 	
 ENDCOMMENT
 
@@ -19,7 +23,9 @@ INDEPENDENT {t FROM 0 TO 1 WITH 1 (ms)}
 NEURON {
 	SUFFIX iCaL
 	USEION ca READ cai,cao WRITE ica
-        RANGE pcabar, m_inf, tau_m, ica
+        RANGE pcabar, m_inf, tau_m, m_exp, ica
+        GLOBAL vmin, vmax, tabulate
+        THREADSAFE
 }
 
 UNITS {
@@ -37,6 +43,9 @@ PARAMETER {
 	cai			(mM)
 	cao			(mM)
 	pcabar= 0.000276	(cm/s)		
+	vmin	= -100		(mV)	: range of the rate tables
+	vmax	= 100		(mV)
+	tabulate = 0			: 1 to take the rates from the tables
 }
 
 STATE {
@@ -47,12 +56,17 @@ ASSIGNED {
 	ica		(mA/cm2)
 	tau_m		(ms)
 	m_inf 
+	m_exp
 	tadj
 }
 
 BREAKPOINT { 
 	SOLVE states :METHOD euler
-	ica = pcabar * m*m * ghk(v,cai,cao,2)
+	if (tabulate) {
+		ica = pcabar * m*m * ghkca(v,cai,cao)
+	} else {
+		ica = pcabar * m*m * ghk(v,cai,cao,2)
+	}
 }
 
 :DERIVATIVE states {
@@ -64,7 +78,7 @@ BREAKPOINT {
 PROCEDURE states() {
         rates(v)
 	
-        m= m + (1-exp(-dt/tau_m))*(m_inf-m)
+        m= m + m_exp*(m_inf-m)
 	:printf("\n iCaL tau_m=%g", tau_m)
 }
 
@@ -88,14 +102,49 @@ FUNCTION ghk( v(mV), ci(mM), co(mM), z)  (millicoul/cm3) {
 	
         ghk = - (.001) * z*FARADAY * (co-ci*exp(w)) * e
 }
+
+FUNCTION ghkca(v(mV), ci(mM), co(mM)) (millicoul/cm3) {
+	: ghk(v,ci,co,2) from the tables of its v dependent factors
+        ghkca = - (.001) * 2*FARADAY * (co-ci*ghk_x(v)) * ghk_e(v)
+}
+
+FUNCTION ghk_x(v(mV)) {
+	TABLE DEPEND celsius, vmin, vmax FROM vmin TO vmax WITH 1000
+        ghk_x = exp(v * (.001) * 2*FARADAY / (R*(celsius+273.16)))
+}
+
+FUNCTION ghk_e(v(mV)) { LOCAL w
+	TABLE DEPEND celsius, vmin, vmax FROM vmin TO vmax WITH 1000
+        w = v * (.001) * 2*FARADAY / (R*(celsius+273.16))
+	if (fabs(w)>1e-4) 
+          { ghk_e = w / (exp(w)-1) }
+        else
+        { ghk_e = 1-w/2 }
+}
 UNITSOFF
 
 PROCEDURE rates(v(mV)) { LOCAL a,b
+	if (tabulate) {
+		tabrates(v)
+	} else {
+		a = 1.6 / (1+ exp(-0.072*(v-5)))
+		b = 0.02 * vtrap( -(v-1.31), 5.36)
+
+		tau_m = 1/(a+b) / tadj
+		m_inf = 1/(1+exp((v+10)/-10))
+		m_exp = 1-exp(-dt/tau_m)
+	}
+}
+
+PROCEDURE tabrates(v(mV)) { LOCAL a,b,q10
+	TABLE m_inf, tau_m, m_exp DEPEND dt, celsius, vmin, vmax FROM vmin TO vmax WITH 1000
+	q10 = 3.0 ^ ((celsius-23.5)/10) : tadj, the table can be built before INITIAL
 	a = 1.6 / (1+ exp(-0.072*(v-5)))
 	b = 0.02 * vtrap( -(v-1.31), 5.36)
 
-	tau_m = 1/(a+b) / tadj
+	tau_m = 1/(a+b) / q10
 	m_inf = 1/(1+exp((v+10)/-10))
+	m_exp = 1-exp(-dt/tau_m)
 }
 
 FUNCTION vtrap(x,c) { 
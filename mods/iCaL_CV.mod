@@ -0,0 +1,150 @@
+TITLE high threshold calcium current (L-current)
+
+COMMENT
+        *********************************************
+        reference:      McCormick & Huguenard (1992) 
+			J.Neurophysiology 68(4), 1384-1400
+        found in:       hippocampal pyramidal cells
+        *********************************************
+	Assembled for MyFirstNEURON by Arthur Houweling
+
+	m rates and the v dependent factors of the GHK current
+	tabulated in v, from vmin to vmax, when tabulate is set
+	(see ratetables.py)
+	
+ENDCOMMENT
+
+
+
+
+INDEPENDENT {t FROM 0 TO 1 WITH 1 (ms)}
+
+
+: variable time step variant of iCaL (cfg.cvode_active, see solver.py): the states
+: are a DERIVATIVE block solved with cnexp, which CVODE integrates. iCaL keeps its
+: fixed step update
+
+NEURON {
+	SUFFIX iCaL_CV
+	USEION ca READ cai,cao WRITE ica
+        RANGE pcabar, m_inf, tau_m, ica
+        GLOBAL vmin, vmax, tabulate
+        THREADSAFE
+}
+
+UNITS {
+	(mA)	= (milliamp)
+	(mV)	= (millivolt)
+	(mM)	= (milli/liter)
+        FARADAY = 96480 (coul)
+        R       = 8.314 (volt-coul/degC)
+}
+
+PARAMETER {
+	v			(mV)
+	celsius			(degC)
+	cai			(mM)
+	cao			(mM)
+	pcabar= 0.000276	(cm/s)		
+	vmin	= -100		(mV)	: range of the rate tables
+	vmax	= 100		(mV)
+	tabulate = 0			: 1 to take the rates from the tables
+}
+
+STATE {
+	m
+}
+
+ASSIGNED {
+	ica		(mA/cm2)
+	tau_m		(ms)
+	m_inf 
+	tadj
+}
+
+BREAKPOINT { 
+	SOLVE states METHOD cnexp
+	if (tabulate) {
+		ica = pcabar * m*m * ghkca(v,cai,cao)
+	} else {
+		ica = pcabar * m*m * ghk(v,cai,cao,2)
+	}
+}
+
+DERIVATIVE states {	: cnexp, m = m + (1-exp(-dt/tau_m))*(m_inf-m)
+        rates(v)
+
+        m' = (m_inf-m) / tau_m
+}
+
+UNITSOFF
+
+INITIAL {
+	tadj = 3.0 ^ ((celsius-23.5)/10)
+	rates(v)
+	m = m_inf
+}
+
+FUNCTION ghk( v(mV), ci(mM), co(mM), z)  (millicoul/cm3) {
+        LOCAL e, w
+        w = v * (.001) * z*FARADAY / (R*(celsius+273.16))
+        
+	if (fabs(w)>1e-4) 
+          { e = w / (exp(w)-1) }
+        else
+	: denominator is small -> Taylor series
+        { e = 1-w/2 }
+	
+        ghk = - (.001) * z*FARADAY * (co-ci*exp(w)) * e
+}
+
+FUNCTION ghkca(v(mV), ci(mM), co(mM)) (millicoul/cm3) {
+	: ghk(v,ci,co,2) from the tables of its v dependent factors
+        ghkca = - (.001) * 2*FARADAY * (co-ci*ghk_x(v)) * ghk_e(v)
+}
+
+FUNCTION ghk_x(v(mV)) {
+	TABLE DEPEND celsius, vmin, vmax FROM vmin TO vmax WITH 1000
+        ghk_x = exp(v * (.001) * 2*FARADAY / (R*(celsius+273.16)))
+}
+
+FUNCTION ghk_e(v(mV)) { LOCAL w
+	TABLE DEPEND celsius, vmin, vmax FROM vmin TO vmax WITH 1000
+        w = v * (.001) * 2*FARADAY / (R*(celsius+273.16))
+	if (fabs(w)>1e-4) 
+          { ghk_e = w / (exp(w)-1) }
+        else
+        { ghk_e = 1-w/2 }
+}
+UNITSOFF
+
+PROCEDURE rates(v(mV)) { LOCAL a,b
+	if (tabulate) {
+		tabrates(v)
+	} else {
+		a = 1.6 / (1+ exp(-0.072*(v-5)))
+		b = 0.02 * vtrap( -(v-1.31), 5.36)
+
+		tau_m = 1/(a+b) / tadj
+		m_inf = 1/(1+exp((v+10)/-10))
+	}
+}
+
+PROCEDURE tabrates(v(mV)) { LOCAL a,b,q10
+	TABLE m_inf, tau_m DEPEND celsius, vmin, vmax FROM vmin TO vmax WITH 1000
+	q10 = 3.0 ^ ((celsius-23.5)/10) : tadj, the table can be built before INITIAL
+	a = 1.6 / (1+ exp(-0.072*(v-5)))
+	b = 0.02 * vtrap( -(v-1.31), 5.36)
+
+	tau_m = 1/(a+b) / q10
+	m_inf = 1/(1+exp((v+10)/-10))
+}
+
+FUNCTION vtrap(x,c) { 
+	: Traps for 0 in denominator of rate equations
+        if (fabs(x/c) < 1e-6) {
+          vtrap = c + x/2 }
+        else {
+          vtrap = x / (1-exp(-x/c)) }
+}
+UNITSON
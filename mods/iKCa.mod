@@ -33,6 +33,7 @@ NEURON {
     USEION ca READ cai
     RANGE gk, gbar, m_inf, tau_m
     GLOBAL beta, cac
+    THREADSAFE
 }
 
 
@@ -22,6 +22,11 @@ ENDCOMMENT
 : Written by Alain Destexhe, Salk Institute, Aug 1992
 :
 : Modifications by Arthur Houweling for use in MyFirstNEURON
+:
+: alpha and beta of m and alpha of h tabulated in their shifted potential
+: (v - vtraub - vsm, v - vtraub + vsm and v - vtraub - vsh), and beta of h in
+: gamma * (v - vtraub - vsh - 40), from xmin to xmax, when tabulate is set
+: (see ratetables.py)
 
 NEURON {
 	SUFFIX iNaP
@@ -30,6 +35,8 @@ NEURON {
 	RANGE m_inf, h_inf
 	RANGE tau_m, tau_h
 	RANGE ina 
+	GLOBAL xmin, xmax, tabulate
+	THREADSAFE
 }
 
 
@@ -47,6 +54,9 @@ PARAMETER {
 	vsm	= -2            (mV)	: collapses activation curve as increasingly -ve
 	vsh	= -5            (mV)	: shifts inactivation curve left as increasingly -ve
 	gamma	= 0.5		        : collapses inactivation curve when <1
+	xmin	= -50		(mV)	: range of the rate tables
+	xmax	= 150		(mV)
+	tabulate = 0			: 1 to take the rates from the tables
 }
 
 STATE {
@@ -89,15 +99,54 @@ PROCEDURE evaluate_fct(v(mV)) { LOCAL a,b,v2
 
 	v2 = v - vtraub : convert to traub convention
 
-	a = 0.32 * (vsm+13-v2) / ( exp((vsm+13-v2)/4) - 1)
-	b = 0.28 * (vsm+v2-40) / ( exp((vsm+v2-40)/5) - 1)
+	if (tabulate) {
+		a = alpha_m(v2 - vsm)
+		b = beta_m(v2 + vsm)
+	} else {
+		a = 0.32 * (vsm+13-v2) / ( exp((vsm+13-v2)/4) - 1)
+		b = 0.28 * (vsm+v2-40) / ( exp((vsm+v2-40)/5) - 1)
+	}
 	tau_m = 1 / (a + b) / tadj
 	m_inf = a / (a + b)
 
-	a = 0.128 * exp((vsh+17-v2)/18)
-	b = 4 / ( 1 + exp((vsh+40-v2)/5*gamma))
+	if (tabulate) {
+		a = alpha_h(v2 - vsh)
+		b = beta_h(gamma * (v2 - vsh - 40))
+	} else {
+		a = 0.128 * exp((vsh+17-v2)/18)
+		b = 4 / ( 1 + exp((vsh+40-v2)/5*gamma))
+	}
 	tau_h = 1 / (a + b) / tadj
 	h_inf = a / (a + b)
 }
 
+FUNCTION alpha_m(x(mV)) {
+	TABLE DEPEND xmin, xmax FROM xmin TO xmax WITH 1000
+	alpha_m = 0.32 * expM1(13-x, 4)
+}
+
+FUNCTION beta_m(x(mV)) {
+	TABLE DEPEND xmin, xmax FROM xmin TO xmax WITH 1000
+	beta_m = 0.28 * expM1(x-40, 5)
+}
+
+FUNCTION alpha_h(x(mV)) {
+	TABLE DEPEND xmin, xmax FROM xmin TO xmax WITH 1000
+	alpha_h = 0.128 * exp((17-x)/18)
+}
+
+FUNCTION beta_h(x(mV)) {
+	TABLE DEPEND xmin, xmax FROM xmin TO xmax WITH 1000
+	beta_h = 4 / ( 1 + exp(-x/5))
+}
+
+FUNCTION expM1(x,y) {
+	: traps for 0 in denominator of rate equations
+	if (fabs(x/y) < 1e-6) {
+		expM1 = y*(1 - x/y/2)
+	}else{
+		expM1 = x/(exp(x/y) - 1)
+	}
+}
+
 UNITSON
@@ -3,7 +3,7 @@
 NEURON {
 	THREADSAFE
 	ARTIFICIAL_CELL VecStim
-	POINTER ptr
+	BBCOREPOINTER ptr
 }
 
 ASSIGNED {
@@ -22,6 +22,18 @@ INITIAL {
 }
 
 NET_RECEIVE (w) {
+	if (flag == 0 && index == -1) {
+		: external event on an exhausted VecStim: restart on the vector passed
+		: to play(), used to refill the stimulus chunk by chunk (see spkt_stream.py)
+		index = 0
+		element()
+		if (index > 0) {
+			if (etime < t) {
+				etime = t
+			}
+			net_send(etime - t, 1)
+		}
+	}
 	if (flag == 1) {
 		net_event(t)
 		element()
@@ -33,10 +45,12 @@ NET_RECEIVE (w) {
 
 DESTRUCTOR {
 VERBATIM
+#if !NRNBBCORE
 	void* vv = (void*)(_p_ptr);  
         if (vv) {
 		hoc_obj_unref(*vector_pobj(vv));
 	}
+#endif
 ENDVERBATIM
 }
 
@@ -65,6 +79,7 @@ ENDVERBATIM
 
 PROCEDURE play() {
 VERBATIM
+#if !NRNBBCORE
 	void** pv;
 	void* ptmp = NULL;
 	if (ifarg(1)) {
@@ -76,5 +91,47 @@ VERBATIM
 		hoc_obj_unref(*vector_pobj(*pv));
 	}
 	*pv = ptmp;
+#endif
 ENDVERBATIM
 }
+
+VERBATIM
+/* transfer of the event vector to CoreNEURON: its size in iarray, its
+   elements in xarray */
+static void bbcore_write(double* xarray, int* iarray, int* xoffset, int* ioffset, _threadargsproto_) {
+	int i, dsize = 0;
+	double* dv;
+	void* vv = (void*)(_p_ptr);
+	if (vv) {
+		dsize = vector_capacity(vv);
+	}
+	if (iarray) {
+		iarray[*ioffset] = dsize;
+		if (dsize) {
+			dv = vector_vec(vv);
+			for (i = 0; i < dsize; ++i) {
+				xarray[*xoffset + i] = dv[i];
+			}
+		}
+	}
+	*ioffset += 1;
+	*xoffset += dsize;
+}
+
+static void bbcore_read(double* xarray, int* iarray, int* xoffset, int* ioffset, _threadargsproto_) {
+	int i, dsize;
+	double* dv;
+	void** pv = (void**)(&_p_ptr);
+	dsize = iarray[*ioffset];
+	if (!*pv) {
+		*pv = (void*)vector_new1(dsize);
+	}
+	assert(dsize == vector_capacity(*pv));
+	dv = vector_vec(*pv);
+	for (i = 0; i < dsize; ++i) {
+		dv[i] = xarray[*xoffset + i];
+	}
+	*ioffset += 1;
+	*xoffset += dsize;
+}
+ENDVERBATIM
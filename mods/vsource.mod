@@ -8,15 +8,16 @@ Clamp is on at time 0, and off after time toff.
 When clamp is off the injected current is 0.
 i is the injected current, vc measures the control voltage.
 
-For other comments and important implementational details, 
-especially "why SOLVE icur METHOD after_cvode ???", 
-see the comments in svclmp.mod
+i is computed in the BREAKPOINT (no SOLVE icur METHOD
+after_cvode) and the clamp is turned off by a self event at toff (no at_time),
+so that the mechanism also runs in CoreNEURON.
 ENDCOMMENT
 
 NEURON {
 	POINT_PROCESS Vsource
 	ELECTRODE_CURRENT i
 	RANGE toff, amp, rs, vc, i
+	THREADSAFE
 }
 
 UNITS {
@@ -39,11 +40,14 @@ ASSIGNED {
 }
 
 INITIAL {
-	on = 1
+	on = 0
+	if (toff > 0) {
+		on = 1
+		net_send(toff, 1)
+	}
 }
 
 BREAKPOINT {
-	SOLVE icur METHOD after_cvode
 	vstim()
 }
 
@@ -56,13 +60,16 @@ PROCEDURE icur() {
 }
 
 PROCEDURE vstim() {
-	on = 1
-	if (toff) {at_time(toff)}
-	if (t < toff) {
+	if (on) {
 		vc = amp
 	}else {
 		vc = 0
-		on = 0
 	}
 	icur()
 }
+
+NET_RECEIVE (w) {
+	if (flag == 1) {
+		on = 0
+	}
+}
@@ -0,0 +1,124 @@
+'''
+cache of the instantiated network for repeated runs: the realized connections
+(post gid, pre gid, rule, receptor, section, location, weight, delay) are saved
+once in netcache/ (numpy .npz), keyed by the network topology, and later runs
+with the same topology rebuild them without evaluating the connection rules
+'''
+
+import os
+import json
+import hashlib
+from numbers import Number
+import numpy as np
+from netpyne import sim
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'netcache')
+CACHE_VERSION = 1
+
+# parameters that do not change which cells and connections are created
+POP_INPUTS = ('spkTimes', 'rate', 'interval', 'noise', 'start', 'pulses')
+CONN_VALUES = ('weight',)
+
+def network_key(netParams, cfg):
+    """
+    Returns the hash identifying the realized network of netParams and cfg,
+    built from everything that determines its topology: populations (but not
+    their spike times or rates), cell rules, synaptic mechanism labels,
+    connection rules (but not their weights), network geometry, conn and loc
+    seeds, and the number of hosts. Weight or intensity sweeps share the key.
+    """
+    pops = {label: {k: v for k, v in pop.items() if k not in POP_INPUTS}
+            for label, pop in netParams.popParams.items()}
+    conns = {label: {k: v for k, v in rule.items() if k not in CONN_VALUES}
+             for label, rule in netParams.connParams.items()}
+    desc = {'pops': pops, 'cells': netParams.cellParams, 'conns': conns,
+            'subConns': netParams.subConnParams, 'synMechs': sorted(netParams.synMechParams.keys()),
+            'geom': [netParams.sizeX, netParams.sizeY, netParams.sizeZ, netParams.shape,
+                     netParams.defaultDelay, netParams.propVelocity],
+            'seeds': [cfg.seeds.get('conn'), cfg.seeds.get('loc'), getattr(cfg, 'connSeed', None)],
+            'nhosts': sim.nhosts, 'version': CACHE_VERSION}
+    return hashlib.sha1(json.dumps(desc, sort_keys=True, default=str).encode()).hexdigest()
+
+def save_conns(path, cells):
+    """
+    Saves the connections of cells (their conns lists) to path as flat arrays,
+    with the gids and populations of the cells.
+    """
+    labels, synMechs, secs = {}, {}, {}
+    rows = []
+    for cell in cells:
+        for conn in cell.conns:
+            rows.append((cell.gid, conn['preGid'], labels.setdefault(conn.get('label'), len(labels)),
+                         synMechs.setdefault(conn['synMech'], len(synMechs)), secs.setdefault(conn['sec'], len(secs)),
+                         conn['loc'], conn['weight'], conn['delay']))
+    rows = np.array(rows, dtype=float).reshape(-1, 8)
+    pops = sorted(set(cell.tags['pop'] for cell in cells))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    np.savez_compressed(path, gids=np.array([cell.gid for cell in cells], dtype=np.int64),
+                        pops=np.array(pops), cell_pops=np.array([pops.index(cell.tags['pop']) for cell in cells], dtype=np.int32),
+                        labels=np.array([str(l) for l in labels]), synMechs=np.array(list(synMechs)), secs=np.array(list(secs)),
+                        post=rows[:,0].astype(np.int64), pre=rows[:,1].astype(np.int64), label=rows[:,2].astype(np.int32),
+                        synMech=rows[:,3].astype(np.int32), sec=rows[:,4].astype(np.int32),
+                        loc=rows[:,5], weight=rows[:,6], delay=rows[:,7])
+
+def load_conns(path, net):
+    """
+    Recreates on the cells of net the connections saved in path, weights are
+    taken from the current connection rules when given as numbers (so weight
+    sweeps can reuse the cache) and from the cache otherwise. Returns the number
+    of connections made.
+    """
+    data = np.load(path)
+    gids = [cell.gid for cell in net.cells]
+    pops = [cell.tags['pop'] for cell in net.cells]
+    if gids != data['gids'].tolist() or pops != [str(p) for p in data['pops'][data['cell_pops']]]:
+        raise ValueError('cached network %s does not match the cells created' %path)
+    labels, synMechs, secs = data['labels'].tolist(), data['synMechs'].tolist(), data['secs'].tolist()
+    rules = [net.params.connParams.get(label, {}) for label in labels]
+    post, pre, label, synMech, sec = (data[k].tolist() for k in ('post', 'pre', 'label', 'synMech', 'sec'))
+    loc, weight, delay = data['loc'].tolist(), data['weight'].tolist(), data['delay'].tolist()
+    for i in range(len(post)):
+        rule = rules[label[i]]
+        params = {'preGid': pre[i], 'sec': secs[sec[i]], 'loc': loc[i], 'synMech': synMechs[synMech[i]],
+                  'weight': rule['weight'] if isinstance(rule.get('weight'), Number) else weight[i],
+                  'delay': delay[i], 'synsPerConn': 1}
+        for k in ('shape', 'plast', 'weightIndex'):
+            if k in rule: params[k] = rule[k]
+        if sim.cfg.includeParamsLabel:
+            params['label'] = labels[label[i]]
+        net.cells[net.gid2lid[post[i]]].addConn(params=params)
+    return len(post)
+
+def connect_cells(net, cfg, cache_dir=CACHE_DIR):
+    """
+    Replaces net.connectCells(): loads the connections from the cache if the
+    network was realized before, else connects the cells from the rules and
+    caches the result.
+    """
+    path = os.path.join(cache_dir, 'net_%s_%d.npz' %(network_key(net.params, cfg), sim.rank))
+    if not os.path.exists(path):
+        conns = net.connectCells()
+        save_conns(path, net.cells)
+        return conns
+    sim.timing('start', 'connectTime')
+    if sim.rank == 0:
+        print('Loading connections from %s...' %os.path.basename(path))
+    n = load_conns(path, net)
+    print('  Number of synaptic contacts on node %i: %i ' %(sim.rank, n))
+    sim.pc.barrier()
+    sim.timing('stop', 'connectTime')
+    if sim.rank == 0 and cfg.timing:
+        print('  Done; cell connection time = %0.2f s.' %sim.timingData['connectTime'])
+    return [cell.conns for cell in net.cells]
+
+def create(netParams, simConfig, cache_dir=CACHE_DIR):
+    """
+    sim.create() with the connections of the network taken from the cache
+    """
+    sim.initialize(netParams, simConfig)
+    sim.net.createPops()
+    sim.net.createCells()
+    connect_cells(sim.net, simConfig, cache_dir)
+    sim.net.addStims()
+    sim.net.addRxD()
+    sim.setupRecording()
@@ -0,0 +1,119 @@
+'''
+declarative stimulus protocols for the afferent fibers
+
+a protocol is a list of segments (dicts), times in ms, amplitudes in units of
+cfg.stim_ratios (0.25 ~ 100mN):
+    {'type': 'step', 'start': 0, 'stop': 5000, 'amp': 0.25}
+        sustained press, the fibers follow their step response (spkt_gen.RATE_PROFILES)
+        from 'start', scaled by 'amp'; the profiles are fitted on 0-10 s
+        (spkt_gen.FIT_SPAN) and wrapped around with np.mod past it, so longer
+        steps replay the 10 s response
+    {'type': 'ramp', 'start': 0, 'stop': 2000, 'amp': [0.0, 0.5]}
+        press with an intensity ramping linearly from amp[0] to amp[1]
+    {'type': 'press', 'start': 0, 'stop': 60000, 'period': 10000, 'width': 5000, 'amp': 0.25}
+        repeated von Frey-like presses of 'width' ms every 'period' ms
+    {'type': 'vibration', 'start': 0, 'stop': 5000, 'freq': 20.0, 'depth': 0.5}
+        sinusoidal modulation (Hz, relative depth) of the rates of all other segments
+stimulus segments add up, the fibers that do not scale with the stimulus
+intensity (SAI, SAII) fire their fixed profile whenever amp > 0
+
+a protocol is compiled once into per-fiber rate arrays (memoized) for the batch
+generators of spkt_gen, or evaluated window by window for spkt_stream
+'''
+
+import json
+import numpy as np
+from functools import lru_cache
+import spkt_gen
+
+SEGMENT_TYPES = ('step', 'ramp', 'press', 'vibration')
+
+def _check(protocol):
+    for seg in protocol:
+        if seg.get('type') not in SEGMENT_TYPES:
+            raise ValueError('unknown protocol segment type: %s' %(seg.get('type')))
+        if seg['stop'] < seg['start']:
+            raise ValueError('protocol segment stops before it starts: %s' %(seg))
+
+def _fiber_rate(fiber, since, amp):
+    # step response of a fiber class since the onset, at intensity amp; past the
+    # fitted span the profile is replayed (np.mod, as spkt_stream does) rather
+    # than extrapolated, holding its end value would silence SAI and SAII
+    since = np.mod(since, spkt_gen.FIT_SPAN)
+    rate = np.clip(spkt_gen.rate_at(fiber, since, 1.0), 0, None)
+    return rate * (amp if spkt_gen.RATE_PROFILES[fiber]['scaled'] else (amp > 0))
+
+def protocol_rate(protocol, fiber, t):
+    """
+    Returns the rate (Hz) of a fiber class at the times t (ms) under protocol.
+    """
+    _check(protocol)
+    t = np.asarray(t, dtype=float)
+    rate = np.zeros(t.shape)
+    for seg in protocol:
+        on = (t >= seg['start']) & (t < seg['stop'])
+        if seg['type'] == 'step':
+            rate[on] += _fiber_rate(fiber, t[on] - seg['start'], seg['amp'])
+        elif seg['type'] == 'ramp':
+            amp0, amp1 = seg['amp']
+            frac = (t[on] - seg['start']) / max(seg['stop'] - seg['start'], 1e-12)
+            rate[on] += _fiber_rate(fiber, t[on] - seg['start'], amp0 + (amp1 - amp0) * frac)
+        elif seg['type'] == 'press':
+            since = np.mod(t[on] - seg['start'], seg['period'])
+            pressed = since < seg['width']
+            rate[on] += np.where(pressed, _fiber_rate(fiber, since, seg['amp']), 0.0)
+    for seg in protocol:
+        if seg['type'] == 'vibration':
+            on = (t >= seg['start']) & (t < seg['stop'])
+            rate[on] *= np.clip(1 + seg['depth'] * np.sin(2 * np.pi * seg['freq'] * t[on] / 1000.0), 0, None)
+    return rate
+
+def protocol_key(protocol):
+    """
+    Returns the canonical (hashable) form of a protocol.
+    """
+    return json.dumps(protocol, sort_keys=True)
+
+@lru_cache(maxsize=64)
+def _compile(key, dt, duration):
+    protocol = json.loads(key)
+    t = np.arange(0, duration + dt, dt)
+    t.setflags(write=False)
+    rates = {}
+    for fiber in spkt_gen.RATE_PROFILES:
+        rates[fiber] = protocol_rate(protocol, fiber, t)
+        rates[fiber].setflags(write=False)
+    return rates, t
+
+def compile_protocol(protocol, dt=1.0, duration=None):
+    """
+    Returns ({fiber: rate}, t): the (read-only) rate arrays (Hz) of every fiber
+    class sampled every dt ms over [0, duration], by default up to the end of the
+    last segment. Compiled protocols are memoized.
+    """
+    if duration is None:
+        duration = max(seg['stop'] for seg in protocol)
+    return _compile(protocol_key(protocol), float(dt), float(duration))
+
+def protocol_trains(protocol, duration, seed=None, dt=1.0, afferents=None):
+    """
+    Returns {pop: (spikes, offsets)} for the afferent populations (default
+    spkt_gen.AFFERENTS) under protocol up to duration (ms), each population drawn
+    from its own random streams with the default generator of its fiber class.
+    """
+    if afferents is None:
+        afferents = spkt_gen.AFFERENTS
+    rates, t = compile_protocol(protocol, dt, duration)
+    trains = {}
+    for pop, (fiber, n) in afferents.items():
+        generator = spkt_gen.GENERATORS[spkt_gen.RATE_PROFILES[fiber]['method']]
+        trains[pop] = generator(rates[fiber], t, n, duration, seed=seed, stream=pop)
+    return trains
+
+def afferent_spkt(protocol, cfg):
+    """
+    Returns {pop: spike time lists} of the afferent populations for cfg.duration
+    and cfg.spkt_seed, as used for the 'spkTimes' of the VecStims.
+    """
+    trains = protocol_trains(protocol, cfg.duration, getattr(cfg, 'spkt_seed', None))
+    return {pop: spkt_gen.split_trains(*trains[pop]) for pop in trains}
@@ -0,0 +1,155 @@
+'''
+build-time pruning of the mechanisms of the cell rules whose maximal
+conductances are all zero: they pass no current but NEURON still integrates
+their gating states every step. mechanisms writing an ion concentration are
+never pruned, and every pruned rule is checked against the full rule on a
+single-cell reference run (rules that cannot be built for it are left unpruned)
+'''
+
+import os
+import re
+import copy
+import glob
+from neuron import h
+import numpy as np
+import templates
+import solver
+
+MOD_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'mods')
+
+# maximal conductances (or permeabilities) of the mechanisms that can be
+# pruned, any mechanism not listed here is always kept
+CONDUCTANCES = {
+    'pas'   : ('g',),
+    'HH2'   : ('gnabar', 'gkbar'),
+    'HH2new': ('gnabar', 'gkbar'),
+    'B_Na'  : ('gnabar',),
+    'B_A'   : ('gkbar',),
+    'B_DR'  : ('gkbar',),
+    'KDR'   : ('gkbar',),
+    'KDRI'  : ('gkbar',),
+    'SS'    : ('gnabar',),
+    'borgka': ('gkabar',),
+    'iNaP'  : ('gnabar',),
+    'iCaL'  : ('pcabar',),
+    'iCaAN' : ('gbar',),
+    'iKCa'  : ('gbar',),
+}
+# the CVODE variants of solver.CVODE_MECHS have the conductances of their mechanism
+CONDUCTANCES.update({variant: CONDUCTANCES[mech] for mech, variant in solver.CVODE_MECHS.items()})
+
+_writers = None
+_defaults = {}
+_scratch = None
+
+def concentration_writers(mod_dir=MOD_DIR):
+    """
+    Returns the set of mechanisms of mod_dir that write an ion concentration
+    (e.g. CaIntraCellDyn: USEION ca ... WRITE cai)
+    """
+    writers = set()
+    for path in glob.glob(os.path.join(mod_dir, '*.mod')):
+        text = re.sub(r'COMMENT.*?ENDCOMMENT', '', open(path).read(), flags=re.S)
+        text = re.sub(r':.*', '', text)
+        name = re.search(r'\b(?:SUFFIX|POINT_PROCESS|ARTIFICIAL_CELL)\s+(\w+)', text)
+        for ion, rest in re.findall(r'USEION\s+(\w+)([^\n]*)', text):
+            write = re.search(r'WRITE\s+([\w\s,]+?)(?:\s+VALENCE|\s+REPRESENTS|$)', rest)
+            if name and write and {ion + 'i', ion + 'o'} & set(re.split(r'[\s,]+', write.group(1))):
+                writers.add(name.group(1))
+    return writers
+
+def default(mech, param):
+    """
+    Returns the value of param of mech in a section it is just inserted in:
+    its PARAMETER default, or 0 for an ASSIGNED conductance (e.g. gnabar of B_Na)
+    """
+    global _scratch
+    if (mech, param) not in _defaults:
+        if _scratch is None:
+            _scratch = h.Section(name='prune_scratch')
+        _scratch.insert(mech)
+        _defaults[(mech, param)] = getattr(_scratch(0.5), '%s_%s' %(param, mech))
+        _scratch.uninsert(mech)
+    return _defaults[(mech, param)]
+
+def zero_mechs(mechs):
+    """
+    Returns the mechanisms of {mech: params} whose maximal conductances (given
+    in params, or their defaults) are all zero, but none writing a concentration
+    """
+    global _writers
+    if _writers is None:
+        _writers = concentration_writers()
+    return [mech for mech, params in mechs.items() if mech in CONDUCTANCES and mech not in _writers
+            and all(params.get(g, default(mech, g)) == 0 for g in CONDUCTANCES[mech])]
+
+def prune_rule(rule):
+    """
+    Removes the zero-conductance mechanisms of a netpyne cell rule
+    (secs: {sec: {mechs}}). Returns {section: [removed mechanisms]}.
+    """
+    removed = {}
+    secs = {name: sec.get('mechs', {}) for name, sec in rule.get('secs', {}).items()}
+    for name, mechs in secs.items():
+        for mech in zero_mechs(mechs):
+            removed.setdefault(name, []).append(mech)
+            del mechs[mech]
+    return removed
+
+def reference_run(rule, amp=0.1, delay=5, dur=50, tstop=100, dt=0.025, v_init=-65):
+    """
+    Returns the voltage of every segment of a single cell built from a netpyne
+    cell rule during a current step (amp nA) in its first section, an array
+    (time, segment).
+    """
+    cell = templates.build_cell(rule)
+    secs = [cell.secs[name]['hObj'] for name in rule['secs']]
+    stim = h.IClamp(secs[0](0.5))
+    stim.amp, stim.delay, stim.dur = amp, delay, dur
+    v = [h.Vector().record(seg._ref_v, dt) for sec in secs for seg in sec]
+    cvode = h.CVode().active()
+    h.CVode().active(0)
+    h.dt = dt
+    h.finitialize(v_init)
+    while h.t < tstop - dt/2:
+        h.fadvance()
+    h.CVode().active(cvode)
+    return np.array(v).T
+
+def verify(rule, pruned, tol=1e-6, **kwargs):
+    """
+    Returns the largest voltage difference (mV) between the reference runs (see
+    reference_run) of a rule and its pruned copy, raises ValueError above tol.
+    """
+    dv = np.abs(reference_run(rule, **kwargs) - reference_run(pruned, **kwargs)).max()
+    if dv > tol:
+        raise ValueError('pruned mechanisms change the membrane potential by %g mV' %dv)
+    return dv
+
+def prune(netParams, check=True):
+    """
+    Prunes the zero-conductance mechanisms of every cell rule of netParams (on
+    copies of the rules, see templates.own_rules, a rule registered under
+    several labels once), prints what was removed and, if
+    check, verifies each pruned rule against the full one on a reference run,
+    the rules that cannot be built outside netpyne (see templates.template)
+    being left unpruned. Returns {rule: {section: [removed mechanisms]}}.
+    """
+    templates.own_rules(netParams)
+    report, seen = {}, {}
+    for label, rule in netParams.cellParams.items():
+        if id(rule) in seen:
+            report[label] = report[seen[id(rule)]]
+            continue
+        seen[id(rule)] = label
+        if check and not templates.template.compilable(rule):
+            print('  %s: not pruned, no reference run to verify it' %label)
+            report[label] = {}
+            continue
+        full = copy.deepcopy(rule) if check else None
+        report[label] = prune_rule(rule)
+        for name, mechs in report[label].items():
+            print('  %s %s: pruned %s' %(label, name, ', '.join(mechs)))
+        if full and report[label]:
+            verify(full, rule)
+    return report
@@ -0,0 +1,171 @@
+'''
+rate tables of the channel kinetics: with tabulate_<mech> set, HH2, borgka,
+iNaP and iCaL evaluate their rate functions from tables built by NEURON (TABLE
+statements of mods/, linear interpolation on 1000 intervals) instead of
+calling exp at every segment and step. off by default, the direct formulas of
+the published model being kept. NMODL only takes a constant number of
+intervals (TABLE ... WITH 1000), but the ranges of the tables are GLOBALs, so
+that narrowing a range refines its tables, and every table is checked against
+the direct formulas. the tables that the published mechanisms
+always use (B_Na, B_A, B_DR, KDR, KDRI and SS) are not switched here, except
+the B_Na table, turned off when a cell rule sets the RANGE parameters it is
+built with away from their defaults (see UNTABLED). the CVODE variants of
+HH2 and iCaL (see solver.py) have the same tables, switched along with them.
+'''
+
+from neuron import h
+import numpy as np
+import prune
+import solver
+
+# mechanisms with switchable rate tables, and the GLOBALs bounding the
+# potential of their tables (HH2: v - vtraub, iNaP: v - vtraub shifted by vsm
+# or vsh)
+TABLES = {
+    'HH2'   : ('v2min', 'v2max'),
+    'borgka': ('vmin', 'vmax'),
+    'iNaP'  : ('xmin', 'xmax'),
+    'iCaL'  : ('vmin', 'vmax'),
+}
+
+# RANGE parameters the tables are built with once for all instances, which
+# must keep their defaults in every cell rule for the tables to hold
+FIXED = {
+    'borgka': ('vhalfn', 'vhalfl', 'vhalfm', 'vhalfk', 'a0l', 'a0n', 'zetan', 'zetal',
+               'gmn', 'gml', 'zetam', 'zetak'),
+}
+
+# RANGE parameters the always-on tables are built with, a cell rule setting one
+# away from its default turns the table of its mechanism off (usetable_<mech>)
+UNTABLED = {
+    'B_Na': ('tau_factor', 'alpha_shift', 'beta_shift'),
+}
+
+# procedure (called with v) and range variables it sets, compared by table_error
+PROBES = {
+    'HH2'   : ('evaluate_fct', ('m_inf', 'h_inf', 'n_inf', 'tau_m', 'tau_h', 'tau_n', 'm_exp', 'h_exp', 'n_exp')),
+    'borgka': ('rates', ('ninf', 'linf', 'taun', 'taul')),
+    'iNaP'  : ('evaluate_fct', ('m_inf', 'h_inf', 'tau_m', 'tau_h')),
+    'iCaL'  : ('rates', ('m_inf', 'tau_m', 'm_exp')),
+}
+
+def variants(mech):
+    # mech and its CVODE variant (solver.CVODE_MECHS), which has the same tables
+    return (mech,) + ((solver.CVODE_MECHS[mech],) if mech in solver.CVODE_MECHS else ())
+
+def use_tables(use=True, mechs=None):
+    """
+    Switches the rate tables of mechs, by default every mechanism of TABLES,
+    and of their CVODE variants on or off
+    """
+    for mech in (TABLES if mechs is None else mechs):
+        for name in variants(mech):
+            setattr(h, 'tabulate_' + name, int(use))
+
+def check_rules(netParams, mechs=None):
+    """
+    Raises ValueError if a cell rule of netParams sets a parameter of FIXED
+    away from its default, for mechs (by default every mechanism of FIXED)
+    """
+    fixed = {mech: FIXED[mech] for mech in FIXED if mechs is None or mech in mechs}
+    for mech, param, value, label, secName in off_default(netParams, fixed):
+        raise ValueError('the %s tables need the default %s, set to %s in %s %s (cfg.rate_tables = False)'
+                         %(mech, param, value, label, secName))
+
+def off_default(netParams, fixed):
+    # (mech, param, value, rule label, section) of the first parameter of fixed
+    # set away from its default in a cell rule of netParams, per mechanism
+    found = {}
+    for label, rule in netParams.cellParams.items():
+        for secName, sec in rule.get('secs', {}).items():
+            for mech, params in sec.get('mechs', {}).items():
+                for param in fixed.get(mech, ()):
+                    if mech not in found and param in params and params[param] != prune.default(mech, param):
+                        found[mech] = (mech, param, params[param], label, secName)
+    return list(found.values())
+
+def untable(netParams):
+    """
+    Turns off the tables of the mechanisms of UNTABLED whose parameters a cell
+    rule of netParams sets away from their defaults (on otherwise), returns
+    those mechanisms
+    """
+    off = off_default(netParams, UNTABLED)
+    for mech in UNTABLED:
+        setattr(h, 'usetable_' + mech, 1)
+    for mech, param, value, label, secName in off:
+        setattr(h, 'usetable_' + mech, 0)
+        print('  %s rates computed directly, %s set to %s in %s %s' %(mech, param, value, label, secName))
+    return [found[0] for found in off]
+
+def set_range(mech, lo, hi):
+    """
+    Sets the range of the rate tables of mech and of its CVODE variant
+    (rebuilt at the next use)
+    """
+    if mech not in TABLES:
+        raise ValueError('%s has no switchable rate tables' %mech)
+    for variant in variants(mech):
+        for name, value in zip(TABLES[mech], (lo, hi)):
+            setattr(h, '%s_%s' %(name, variant), value)
+
+def set_tables(cfg, netParams=None):
+    """
+    Applies cfg.rate_tables (tables on or off) and cfg.table_ranges
+    ({mech: (lo, hi)}) to the mechanisms, the cell rules of netParams checked
+    against FIXED when the tables are on, and against UNTABLED (see untable).
+    Raises ValueError if the tables are on for a CVODE run (cfg.cvode_active)
+    and the CVODE variant of a mechanism has no tables.
+    """
+    use = getattr(cfg, 'rate_tables', False)
+    if use and getattr(cfg, 'cvode_active', False):
+        for mech in TABLES:
+            for variant in variants(mech)[1:]:
+                if not hasattr(h, 'tabulate_' + variant):
+                    raise ValueError('%s has no rate tables, cfg.rate_tables needs cfg.cvode_active = False' %variant)
+    if netParams is not None:
+        untable(netParams)
+    if use and netParams is not None:
+        check_rules(netParams)
+    use_tables(use)
+    for mech, (lo, hi) in getattr(cfg, 'table_ranges', {}).items():
+        set_range(mech, lo, hi)
+
+def mode():
+    """
+    Returns the rate tables in use, ((mech, lo, hi), ...) of the mechanisms
+    whose tables are on (their CVODE variants switched with them), followed by (mech, 'direct') for the always-on tables
+    turned off (see untable), () with the published tables
+    """
+    return tuple((mech,) + tuple(getattr(h, '%s_%s' %(name, mech)) for name in TABLES[mech])
+                 for mech in TABLES if getattr(h, 'tabulate_' + mech)) + \
+           tuple((mech, 'direct') for mech in UNTABLED if not getattr(h, 'usetable_' + mech))
+
+def table_error(mech, v=None, celsius=None):
+    """
+    Returns {variable: max relative error} of the tabulated rates of mech
+    (see PROBES) against its direct formulas, over the potentials v (mV), by
+    default -100 to 90 mV in steps of 0.0137 mV (off the table points)
+    """
+    if v is None:
+        v = np.arange(-100, 90, 0.0137)
+    proc, names = PROBES[mech]
+    sec = h.Section(name='table_error')
+    sec.insert(mech)
+    saved = h.celsius, getattr(h, 'tabulate_' + mech)
+    if celsius is not None:
+        h.celsius = celsius
+    h.finitialize(-65)
+    mod = getattr(sec(0.5), mech)
+    values = []
+    for use in (0, 1):
+        setattr(h, 'tabulate_' + mech, use)
+        out = []
+        for x in v:
+            getattr(mod, proc)(x)
+            out.append([getattr(mod, name) for name in names])
+        values.append(np.array(out))
+    h.celsius = saved[0]
+    setattr(h, 'tabulate_' + mech, saved[1])
+    err = np.abs(values[1] - values[0]) / np.maximum(np.abs(values[0]), 1e-12)
+    return dict(zip(names, err.max(axis=0)))
@@ -0,0 +1,127 @@
+'''
+run modes of the network simulation: multithreaded runs (every mechanism of
+mods/ is THREADSAFE, the cells are split over the threads by NEURON), runs
+through CoreNEURON (mods compiled with nrnivmodl -coreneuron mods) and
+variable time step runs (the mechanisms advancing their states by a fixed step
+update are swapped for their CVODE variants of CVODE_MECHS)
+'''
+
+from neuron import h
+from netpyne import sim
+
+# mechanisms whose states are advanced by an explicit fixed step update (a
+# PROCEDURE, which CVODE cannot integrate) and their variants with the same
+# parameters whose states are a DERIVATIVE block
+CVODE_MECHS = {'HH2': 'HH2_CV', 'KDR': 'KDR_CV', 'KDRI': 'KDRI_CV', 'SS': 'SS_CV',
+               'iCaL': 'iCaL_CV', 'iCaAN': 'iCaAN_CV'}
+
+def local_sec(net=None):
+    """
+    Returns a section of the first compartmental cell of this node, None if
+    there is none
+    """
+    if net is None:
+        net = sim.net
+    for cell in net.cells:
+        if isinstance(getattr(cell, 'secs', None), dict):
+            for sec in cell.secs.values():
+                return sec['hObj']
+    return None
+
+_tclamp = None
+
+def set_threads(n, net=None):
+    """
+    Runs the simulation on n threads, to be called once the network is created.
+    The recording of h.t (sim.simData['t']) is tied to no section, so it is
+    attached to a null point process (IClamp with no current) of this node to
+    be assigned to a thread.
+    """
+    global _tclamp
+    sim.pc.nthread(n)
+    t = getattr(sim, 'simData', {}).get('t')
+    sec = local_sec(net)
+    if t is not None and hasattr(t, 'record') and sec is not None:
+        _tclamp = h.IClamp(sec(0.5))
+        _tclamp.amp, _tclamp.dur = 0, 0
+        t.record(_tclamp, h._ref_t, sim.cfg.recordStep)
+    return int(sim.pc.nthread())
+
+def use_coreneuron(cfg=None):
+    """
+    Runs the simulation through CoreNEURON, the network built by NEURON being
+    transferred in memory at psolve (netpyne cfg.coreneuron). CoreNEURON only
+    integrates with a fixed step and does not call back into Python during the
+    run, so afferent trains streamed by window (cfg.stream_window) are refused.
+    """
+    if cfg is None:
+        cfg = sim.cfg
+    if getattr(cfg, 'stream_window', None):
+        raise ValueError('CoreNEURON runs need the afferent trains in full (cfg.stream_window = None)')
+    if getattr(cfg, 'cvode_active', False):
+        raise ValueError('CoreNEURON runs use a fixed time step (cfg.cvode_active = False)')
+    from neuron import coreneuron
+    cfg.coreneuron = True
+    cfg.cache_efficient = True # CoreNEURON requires the cache efficient layout
+    h.CVode().cache_efficient(1)
+    coreneuron.enable = True
+    coreneuron.verbose = 1 if getattr(cfg, 'verbose', False) else 0
+
+def use_neuron(cfg=None):
+    """
+    Runs the simulation through NEURON again after use_coreneuron (e.g. to
+    check the spikes of both runs on one network)
+    """
+    if cfg is None:
+        cfg = sim.cfg
+    from neuron import coreneuron
+    cfg.coreneuron = False
+    coreneuron.enable = False
+
+def use_cvode(cfg=None, local=False, atol=None):
+    """
+    Runs the simulation with a variable time step: one CVODE integrator for
+    the whole network, or with local one integrator per cell (local variable
+    time step, each quiescent cell taking its own long steps). atol replaces
+    the absolute error tolerance cfg.cvode_atol. The network must have been
+    created with cfg.cvode_active set (see cvode_mechs).
+    """
+    if cfg is None:
+        cfg = sim.cfg
+    if getattr(cfg, 'coreneuron', False):
+        raise ValueError('CoreNEURON runs use a fixed time step (cfg.coreneuron = False)')
+    if atol is not None:
+        cfg.cvode_atol = atol
+    cfg.cvode_active = True
+    cfg.use_local_dt = bool(local)
+    cvode = h.CVode()
+    cvode.active(1)
+    cvode.use_local_dt(int(cfg.use_local_dt))
+    cvode.atol(cfg.cvode_atol)
+
+def cvode_mechs(netParams, cfg):
+    """
+    Replaces the mechanisms of CVODE_MECHS in the cell rules of netParams by
+    their variant (cfg.cvode_active set), to be called before the network is
+    created. The fixed step runs keep the original mechanisms.
+    """
+    if not getattr(cfg, 'cvode_active', False):
+        return
+    for rule in netParams.cellParams.values():
+        for sec in rule.get('secs', {}).values():
+            mechs = sec.get('mechs', {})
+            for mech in [mech for mech in mechs if mech in CVODE_MECHS]:
+                mechs[CVODE_MECHS[mech]] = mechs.pop(mech)
+
+def use_fixed_step(cfg=None):
+    """
+    Runs the simulation with the fixed time step cfg.dt again after use_cvode
+    (the network keeps the CVODE variants it was created with)
+    """
+    if cfg is None:
+        cfg = sim.cfg
+    cfg.cvode_active = False
+    cfg.use_local_dt = False
+    cvode = h.CVode()
+    cvode.use_local_dt(0)
+    cvode.active(0)
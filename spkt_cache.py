@@ -0,0 +1,61 @@
+'''
+content-addressed cache of the afferent spike trains, trains are generated with
+spkt_gen on a miss and stored in spkt/cache (binary, see spkt_store) for reuse
+by later runs
+'''
+
+import os
+import json
+import hashlib
+import spkt_gen
+import spkt_store
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'spkt', 'cache')
+
+def cache_key(fiber, n, stim_ratio, duration, seed, method, stream):
+    """
+    Returns the hash identifying a set of trains, built from everything that
+    determines them: fiber class, number of fibers, stim ratio, duration, seed,
+    generator method, random stream and spkt_gen.GENERATOR_VERSION.
+    """
+    desc = {'fiber': fiber, 'n': int(n), 'stim_ratio': float(stim_ratio),
+            'duration': float(duration), 'seed': seed, 'method': method,
+            'stream': stream, 'version': spkt_gen.GENERATOR_VERSION}
+    return hashlib.sha1(json.dumps(desc, sort_keys=True).encode()).hexdigest()
+
+def load_spkt(fiber, n, stim_ratio, duration, seed, method=None, stream=None, cache_dir=CACHE_DIR):
+    """
+    Returns the spike trains of n fibers of a fiber class as a memory mapped
+    spkt_store.spktrains, loaded from the cache or generated (and cached) on a miss.
+    """
+    if method is None:
+        method = spkt_gen.RATE_PROFILES[fiber]['method']
+    if stream is None:
+        stream = fiber
+    key = cache_key(fiber, n, stim_ratio, duration, seed, method, stream)
+    path = os.path.join(cache_dir, '%s_%s.spkt' %(stream, key))
+    if not os.path.exists(path):
+        spikes, offsets = spkt_gen.afferent_trains(fiber, n, duration, stim_ratio, seed=seed, method=method, stream=stream)
+        os.makedirs(cache_dir, exist_ok=True)
+        spkt_store.write_spkt(path, spikes, offsets)
+    return spkt_store.read_spkt(path)
+
+def afferent_spkt(pop, fiber, n, cfg):
+    """
+    Returns the spike times of the n fibers of population pop (of fiber class
+    fiber) for the run described by cfg, one list of floats per fiber: by
+    default the cached trains for cfg.stim_ratios, cfg.duration and
+    cfg.spkt_seed, drawn from the population's own random streams. With
+    cfg.spkt_published the published trains of spkt/ for cfg.freq (shared by
+    the populations of a fiber class), read from their binary conversion if it
+    was made (python spkt_store.py), else from the json.
+    """
+    if getattr(cfg, 'spkt_published', False):
+        path = os.path.join(os.path.dirname(CACHE_DIR), 'spkt_%s_%s' %(fiber, cfg.freq))
+        if os.path.exists(path + '.spkt'):
+            return spkt_store.read_spkt(path + '.spkt').tolist()
+        if os.path.exists(path + '.json'):
+            with open(path + '.json', 'rb') as fp:
+                return json.load(fp)
+        print('  No published %s trains for %s, generated trains used' %(fiber, cfg.freq))
+    return load_spkt(fiber, n, cfg.stim_ratios, cfg.duration, getattr(cfg, 'spkt_seed', 0), stream=pop, cache_dir=CACHE_DIR).tolist()
@@ -4,55 +4,82 @@ created by K. Sekiguchi (18th July 20)
 '''
 
 import numpy as np
-from cfg_mechanical import cfg
+from functools import lru_cache
 
-def rate_SAI():
-    t = [ x for x in np.arange(0, 10001, 1) ]
-
-    rate = []
+# rate profiles of the afferent fibers: polynomial fit (coefficients from the
+# highest order term down, t in ms) of the firing frequency during a step stimulus,
+# multiplied by the gain and, for the stimulus dependent fibers, by cfg.stim_ratios.
+# 'method' selects the default spike generator of the fiber class (see GENERATORS),
+# time rescaling wastes no draws on the decaying Ad and C profiles
+RATE_PROFILES = {
+    'SAI' : {'coefs': (-1.45433609113392e-10, 1.340603396708e-6, -0.00378224210238498, 4.52737468545426),
+             'gain': 8.0, 'scaled': False, 'method': 'thinning'},
+    'SAII': {'coefs': (-1.45433609113392e-10, 1.340603396708e-6, -0.00378224210238498, 4.52737468545426),
+             'gain': 8.0, 'scaled': False, 'method': 'thinning'},
+    'Ad'  : {'coefs': (-7.265297e-15, 1.573831e-10, -8.201529e-7, -0.002539930, 27.18412),
+             'gain': 1.0, 'scaled': True, 'method': 'rescaling'},
+    'C'   : {'coefs': (9.630390e-15, -2.844577e-10, 3.012887e-6, -0.01400381, 31.86546),
+             'gain': 1.0, 'scaled': True, 'method': 'rescaling'},
+}
 
-    for i, key in enumerate(t):
-        if i < len(t):
-            freq_SAI = (-1.45433609113392e-10 * key ** 3 + 1.340603396708e-6 * key ** 2 - 0.00378224210238498 * key + 4.52737468545426) * 8
-            rate.append(freq_SAI)
+# span (ms) over which the rate profiles are fitted, the polynomials diverge past it
+FIT_SPAN = 10000.0
 
-    return rate, t
-
-def rate_SAII():
-    t = [ x for x in np.arange(0, 10001, 1) ]
+# afferent populations of the network: fiber class and number of fibers
+AFFERENTS = {
+    'Ab_SAI' : ('SAI' , 10),
+    'Ab_SAII': ('SAII', 10),
+    'Ad'     : ('Ad'  , 20),
+    'C_PEP'  : ('C'   , 80),
+    'C_NP'   : ('C'   , 80),
+}
 
-    rate = []
+def _stim_ratio():
+    # cfg.stim_ratios, cfg imported on first use so that the generators run
+    # without NEURON
+    from cfg_mechanical import cfg
+    return cfg.stim_ratios
 
-    for i, key in enumerate(t):
-        if i < len(t):
-            freq_SAII = (-1.45433609113392e-10 * key ** 3 + 1.340603396708e-6 * key ** 2 - 0.00378224210238498 * key + 4.52737468545426) * 8
-            rate.append(freq_SAII)
+def rate_at(fiber, t, stim_ratio=None):
+    """
+    Evaluates the rate profile (Hz) of a fiber class at the times t (ms).
+    stim_ratio defaults to cfg.stim_ratios and only applies to the 'scaled' fibers.
+    """
+    profile = RATE_PROFILES[fiber]
+    if stim_ratio is None:
+        stim_ratio = _stim_ratio()
+    gain = profile['gain'] * stim_ratio if profile['scaled'] else profile['gain']
+    return np.polyval(profile['coefs'], np.asarray(t, dtype=float)) * gain
 
+@lru_cache(maxsize=256)
+def _rate_profile(fiber, stim_ratio, dt, duration):
+    t = np.arange(0, duration + dt, dt)
+    rate = rate_at(fiber, t, stim_ratio)
+    t.setflags(write=False)
+    rate.setflags(write=False)
     return rate, t
 
-def rate_Ad():
-    t = [ x for x in np.arange(0, 10001, 1) ]
+def rate_profile(fiber, stim_ratio=None, dt=1.0, duration=10000.0):
+    """
+    Returns the (read-only) arrays rate (Hz) and t (ms) of a fiber class sampled
+    every dt ms over [0, duration]. Profiles are memoized per
+    (fiber, stim_ratio, dt, duration), so sweeps only evaluate each profile once.
+    """
+    if stim_ratio is None:
+        stim_ratio = _stim_ratio()
+    return _rate_profile(fiber, float(stim_ratio), float(dt), float(duration))
 
-    rate = []
+def rate_SAI():
+    return rate_profile('SAI')
 
-    for i, key in enumerate(t):
-        if i < len(t):
-            freq_Ad = ( -7.265297e-15 * key ** 4 + 1.573831e-10 * key ** 3 - 8.201529e-7 * key ** 2 - 0.002539930 * key + 27.18412 ) * cfg.stim_ratios
-            rate.append(freq_Ad)
+def rate_SAII():
+    return rate_profile('SAII')
 
-    return rate, t
+def rate_Ad():
+    return rate_profile('Ad')
 
 def rate_C():
-    t = [ x for x in np.arange(0, 10001, 1) ]
-
-    rate  = []
-
-    for i, key in enumerate(t):
-        if i < len(t):
-            freq_C = (  9.630390e-15 * key ** 4 - 2.844577e-10 * key ** 3 + 3.012887e-6 * key ** 2 - 0.01400381 * key + 31.86546 ) * cfg.stim_ratios
-            rate.append(freq_C)
-
-    return rate, t
+    return rate_profile('C')
 
 def poisson_generator(rate, t_start=0.0, t_stop=1000.0, seed=None):
     """
@@ -65,6 +92,7 @@ def poisson_generator(rate, t_start=0.0, t_stop=1000.0, seed=None):
         rate    - the rate of the discharge (in Hz)
         t_start - the beginning of the SpikeTrain (in ms)
         t_stop  - the end of the SpikeTrain (in ms)
+        seed    - seed of the random number generator, or a np.random.RandomState
         array   - if True, a np array of sorted spikes is returned,
                     rather than a SpikeTrain object.
     Examples:
@@ -75,7 +103,7 @@ def poisson_generator(rate, t_start=0.0, t_stop=1000.0, seed=None):
     --------
         inh_poisson_generator, inh_gamma_generator, inh_adaptingmarkov_generator
     """
-    rng = np.random.RandomState(seed)
+    rng = seed if isinstance(seed, np.random.RandomState) else np.random.RandomState(seed)
     #number = int((t_stop-t_start)/1000.0*2.0*rate)
     # less wasteful than double length method above
     n = (t_stop-t_start)/1000.0*rate
@@ -92,19 +120,21 @@ def poisson_generator(rate, t_start=0.0, t_stop=1000.0, seed=None):
         spikes = np.array([])
     spikes+=t_start
     i = np.searchsorted(spikes, t_stop)
-    extra_spikes = []
     if i==len(spikes):
-        # ISI buf overrun
-        
-        t_last = spikes[-1] + rng.exponential(1.0/rate, 1)[0]*1000.0
-        while (t_last<t_stop):
-            extra_spikes.append(t_last)
-            t_last += rng.exponential(1.0/rate, 1)[0]*1000.0
-        
-        spikes = np.concatenate((spikes,extra_spikes))
+        # ISI buf overrun, extend the train a block of ISIs at a time
+        extra_spikes = [spikes]
+        t_last = spikes[-1] if len(spikes) else t_start
+        while t_last < t_stop:
+            n = (t_stop-t_last)/1000.0*rate
+            isi = rng.exponential(1.0/rate, int(np.ceil(n+3*np.sqrt(n)))+1)*1000.0
+            block = t_last + np.add.accumulate(isi)
+            extra_spikes.append(block)
+            t_last = block[-1]
+        spikes = np.concatenate(extra_spikes)
+        spikes = np.resize(spikes,(np.searchsorted(spikes, t_stop),))
     else:
         spikes = np.resize(spikes,(i,))
-        
+
     return spikes
 
 def inh_poisson_generator(rate, t, t_stop, seed=None):
@@ -143,18 +173,177 @@ def inh_poisson_generator(rate, t, t_stop, seed=None):
         raise ValueError('shape mismatch: t,rate must be of the same shape')
     # get max rate and generate poisson process to be thinned
     rmax = np.max(rate)
-    ps = poisson_generator(rate=rmax, t_start=t[0], t_stop=t_stop, seed=None)
+    ps = poisson_generator(rate=rmax, t_start=t[0], t_stop=t_stop, seed=rng)
     # return empty if no spikes
     if len(ps) == 0:
-        np.array([])
-        
+        return []
+
+
     # gen uniform rand on 0,1 for each spike
     rn = np.array(rng.uniform(0, 1, len(ps)))
     # instantaneous rate for each spike
     idx = np.searchsorted(t, ps) - 1
-    #spike_rate = rate[idx]
-    spike_rate = np.array([rate[i] for i in idx])
+    spike_rate = np.asarray(rate)[idx]
     # thin and return spikes
     spike_train = ps[rn<spike_rate/rmax]
     return list(spike_train)
 
+
+def stream_id(stream):
+    """
+    Returns the spawn key entry (int) of the stream label: the bytes of the
+    label behind a leading 1, so distinct labels never share a key.
+    """
+    return int.from_bytes(b'\x01' + stream.encode(), 'big')
+
+def fiber_generators(seed, n, stream='', first=0):
+    """
+    Returns the random generators of the fibers first..first+n-1 of a stream
+    (e.g. a population label): fiber i draws from a PCG64 seeded by the
+    SeedSequence of the root seed with spawn key (stream, i), so a fiber draws
+    the same train whether the fibers are generated together, in a process pool
+    or split over MPI ranks.
+    """
+    entropy = np.random.SeedSequence(seed).entropy
+    sid = stream_id(stream)
+    return [np.random.Generator(np.random.PCG64(np.random.SeedSequence(entropy, spawn_key=(sid, i))))
+            for i in range(first, first+n)]
+
+def unit_poisson(rngs, total):
+    """
+    Returns (events, counts): the events of a unit-rate poisson process on
+    [0, total] for every fiber generator of rngs, flat and sorted per fiber,
+    and the number of events of each fiber (a poisson count, then as many
+    sorted uniform times).
+    """
+    counts = np.array([rng.poisson(total) for rng in rngs], dtype=np.int64)
+    events = [np.sort(rng.random(c))*total for rng, c in zip(rngs, counts)]
+    return (np.concatenate(events) if events else np.array([])), counts
+
+def inh_poisson_batch(rate, t, n, t_stop, seed=None, stream='', first=0):
+    """
+    Returns n independent realizations of the inhomogeneous poisson process of
+    inh_poisson_generator (thinning), the candidates and thinning draws of all
+    fibers made and thinned in a single vectorized pass.
+    Inputs:
+    -------
+        rate   - an array of the rates (Hz) where rate[i] is active on interval
+                    [t[i],t[i+1]]
+        t      - an array specifying the time bins (in milliseconds) at which to
+                    specify the rate
+        n      - number of fibers (spike trains) to generate
+        t_stop - length of time to simulate process (in ms)
+        seed   - root seed of the per fiber random streams (see fiber_generators)
+        stream - label of the fiber stream, e.g. the population
+        first  - index of the first fiber of the stream to generate
+    Returns:
+    --------
+        spikes  - flat array of the spike times (ms) of all fibers, sorted per fiber
+        offsets - int array of length n+1, the spikes of fiber i are
+                    spikes[offsets[i]:offsets[i+1]]
+    Examples:
+    --------
+        >> rate, t = rate_profile('C')
+        >> spikes, offsets = inh_poisson_batch(rate, t, 80, 5000, seed=1, stream='C_PEP')
+    See also:
+    --------
+        inh_poisson_generator, split_trains, fiber_generators
+    """
+    rate = np.asarray(rate, dtype=float)
+    t = np.asarray(t, dtype=float)
+    if np.shape(t)!=np.shape(rate):
+        raise ValueError('shape mismatch: t,rate must be of the same shape')
+    rmax = np.max(rate)
+    if rmax <= 0 or n == 0 or t_stop <= t[0]:
+        return np.array([]), np.zeros(n+1, dtype=np.int64)
+    # homogeneous candidates at rmax, unit-rate events scaled to [t[0], t_stop]
+    rngs = fiber_generators(seed, n, stream, first)
+    lam = rmax*(t_stop-t[0])/1000.0
+    events, counts = unit_poisson(rngs, lam)
+    ps = t[0] + events*(1000.0/rmax)
+    # the thinning draws of a fiber follow its candidates in its stream,
+    # all fibers are then thinned at once
+    fiber = np.repeat(np.arange(n), counts)
+    draws = np.concatenate([rng.random(c) for rng, c in zip(rngs, counts)])
+    idx = np.searchsorted(t, ps, side='right') - 1
+    keep = draws < rate[idx]/rmax
+    spikes = ps[keep]
+    offsets = np.zeros(n+1, dtype=np.int64)
+    np.cumsum(np.bincount(fiber[keep], minlength=n), out=offsets[1:])
+    return spikes, offsets
+
+def split_trains(spikes, offsets):
+    """
+    Converts the (spikes, offsets) output of inh_poisson_batch into a list of
+    spike time lists, one per fiber (e.g. for the VecStim 'spkTimes' of netpyne).
+    """
+    return [spikes[offsets[i]:offsets[i+1]].tolist() for i in range(len(offsets)-1)]
+
+def cumulative_intensity(rate, t, t_stop):
+    """
+    Returns the knots (ms) and the cumulative intensity (expected spike count) at
+    the knots of the rate (Hz), piecewise constant as in inh_poisson_generator
+    (rate[i] is active on interval [t[i],t[i+1]], the last rate up to t_stop).
+    Negative rates are treated as 0, which is what thinning does with them.
+    """
+    rate = np.asarray(rate, dtype=float)
+    t = np.asarray(t, dtype=float)
+    if np.shape(t)!=np.shape(rate):
+        raise ValueError('shape mismatch: t,rate must be of the same shape')
+    k = max(np.searchsorted(t, t_stop), 1)
+    knots = np.append(t[:k], t_stop)
+    cint = np.zeros(k+1)
+    np.cumsum(np.clip(rate[:k], 0, None)*np.diff(knots)/1000.0, out=cint[1:])
+    return knots, cint
+
+def inh_poisson_rescaled(rate, t, n, t_stop, seed=None, stream='', first=0):
+    """
+    Returns n independent realizations of an inhomogeneous poisson process
+    using the exact time-rescaling method: the unit-rate poisson events of
+    each fiber (see unit_poisson) are mapped through the inverse of the
+    cumulative intensity, so no draws are rejected.
+    Inputs and outputs as inh_poisson_batch.
+    References:
+    -----------
+    Brown, E. N., Barbieri, R., Ventura, V., Kass, R. E., & Frank, L. M. (2002).
+    The time-rescaling theorem and its application to neural spike train data analysis.
+    Neural Comput. 14: 325-346.
+    See also:
+    --------
+        inh_poisson_batch, cumulative_intensity, fiber_generators
+    """
+    knots, cint = cumulative_intensity(rate, t, t_stop)
+    total = cint[-1]
+    if total <= 0 or n == 0:
+        return np.array([]), np.zeros(n+1, dtype=np.int64)
+    events, counts = unit_poisson(fiber_generators(seed, n, stream, first), total)
+    spikes = np.interp(events, cint, knots)
+    offsets = np.zeros(n+1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    return spikes, offsets
+
+# bump whenever a change to the generators alters the trains drawn for a seed,
+# cached trains (see spkt_cache) are keyed on it
+GENERATOR_VERSION = 4
+
+# generators by method, all called as generator(rate, t, n, t_stop, seed, stream, first)
+GENERATORS = {'thinning': inh_poisson_batch, 'rescaling': inh_poisson_rescaled}
+
+def afferent_trains(fiber, n, t_stop, stim_ratio=None, dt=1.0, seed=None, method=None, stream=None, first=0):
+    """
+    Generates the spike trains of n fibers of a fiber class (see RATE_PROFILES)
+    up to t_stop (ms), returns (spikes, offsets) as inh_poisson_batch.
+    method is 'thinning' or 'rescaling', by default the one of the fiber class.
+    stream labels the fibers' random streams (default: the fiber class), use the
+    population label to give populations of the same class distinct trains.
+    """
+    if stim_ratio is None:
+        stim_ratio = _stim_ratio()
+    if method is None:
+        method = RATE_PROFILES[fiber]['method']
+    if method not in GENERATORS:
+        raise ValueError('unknown generator method: %s' %(method))
+    if stream is None:
+        stream = fiber
+    rate, t = rate_profile(fiber, stim_ratio, dt, max(t_stop, dt))
+    return GENERATORS[method](rate, t, n, t_stop, seed, stream, first)
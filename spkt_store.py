@@ -0,0 +1,107 @@
+'''
+compact binary container for afferent spike trains
+
+layout (little endian):
+    8 bytes    magic 'SPKTBIN1'
+    int64      n, number of fibers
+    int64      m, total number of spikes
+    int64      offsets[n+1], the spikes of fiber i are spikes[offsets[i]:offsets[i+1]]
+    float64    spikes[m], spike times (ms)
+
+files are read with a memory map, so only the fibers actually used are paged in
+and the train of a fiber is a zero-copy view. netpyne takes the 'spkTimes' of a
+VecStim population as plain nested lists of floats (it saves and hashes the
+netParams through json), spktrains.tolist builds them
+
+run as a script to convert the json trains: python spkt_store.py [spkt/*.json]
+'''
+
+import os
+import sys
+import glob
+import json
+import numpy as np
+
+MAGIC = b'SPKTBIN1'
+HEADER = len(MAGIC) + 2 * 8
+
+class spktrains():
+
+    def __init__(self, spikes, offsets):
+        self.spikes  = spikes
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        # zero-copy view on the spike times of fiber i
+        return self.spikes[self.offsets[i]:self.offsets[i+1]]
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def tolist(self):
+        # nested lists of floats, as used for the 'spkTimes' of netpyne VecStims
+        return [self[i].tolist() for i in range(len(self))]
+
+    @classmethod
+    def from_lists(cls, trains):
+        offsets = np.zeros(len(trains)+1, dtype=np.int64)
+        np.cumsum([len(train) for train in trains], out=offsets[1:])
+        spikes = np.concatenate([np.asarray(train, dtype=float) for train in trains]) if trains else np.array([])
+        return cls(spikes, offsets)
+
+def write_spkt(path, spikes, offsets):
+    """
+    Writes spike times and offsets (as returned by spkt_gen.inh_poisson_batch)
+    to path, through a temporary file so readers never see a partial file.
+    """
+    spikes  = np.ascontiguousarray(spikes, dtype='<f8')
+    offsets = np.ascontiguousarray(offsets, dtype='<i8')
+    if len(offsets) == 0 or offsets[-1] != len(spikes):
+        raise ValueError('offsets do not match the number of spikes')
+    tmp = '%s.%d.tmp' %(path, os.getpid())
+    with open(tmp, 'wb') as fp:
+        fp.write(MAGIC)
+        fp.write(np.array([len(offsets)-1, len(spikes)], dtype='<i8').tobytes())
+        fp.write(offsets.tobytes())
+        fp.write(spikes.tobytes())
+    os.replace(tmp, path)
+
+def read_spkt(path, mmap=True):
+    """
+    Returns the spktrains stored in path, memory mapped (read-only) by default.
+    """
+    with open(path, 'rb') as fp:
+        head = fp.read(HEADER)
+    if head[:len(MAGIC)] != MAGIC:
+        raise ValueError('%s is not a spike train file' %(path))
+    n, m = np.frombuffer(head[len(MAGIC):], dtype='<i8')
+    if mmap:
+        offsets = np.memmap(path, dtype='<i8', mode='r', offset=HEADER, shape=(n+1,))
+        spikes  = np.memmap(path, dtype='<f8', mode='r', offset=HEADER+8*(n+1), shape=(m,)) if m else np.array([])
+    else:
+        with open(path, 'rb') as fp:
+            fp.seek(HEADER)
+            offsets = np.fromfile(fp, dtype='<i8', count=n+1)
+            spikes  = np.fromfile(fp, dtype='<f8', count=m)
+    return spktrains(spikes, offsets)
+
+def json_to_spkt(json_path, spkt_path=None):
+    """
+    Converts a json file of nested spike time lists (spkt/spkt_*.json) to the
+    binary format, by default next to it with the .spkt extension.
+    """
+    if spkt_path is None:
+        spkt_path = os.path.splitext(json_path)[0] + '.spkt'
+    with open(json_path, 'r') as fp:
+        trains = spktrains.from_lists(json.load(fp))
+    write_spkt(spkt_path, trains.spikes, trains.offsets)
+    return spkt_path
+
+if __name__ == '__main__':
+    paths = sys.argv[1:] or glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'spkt', '*.json'))
+    for path in paths:
+        print('%s -> %s' %(path, json_to_spkt(path)))
@@ -0,0 +1,109 @@
+'''
+streaming afferent stimulus for long protocols: the spike trains of the afferent
+VecStims are generated in fixed time windows and each VecStim's vector is refilled
+window by window as the simulation advances, so memory stays constant however long
+the protocol is
+
+usage (after sim.create, before sim.simulate):
+    stream = spkt_stream.afferent_stream(cfg)
+'''
+
+import numpy as np
+from neuron import h
+import spkt_gen
+import protocol
+
+class spkt_stream():
+
+    def __init__(self, window=1000.0, seed=None, dt=1.0):
+        self.window = window
+        self.seed   = seed
+        self.dt     = dt
+        self.pops   = {}
+        self.fih    = None
+        self.tstop  = None
+
+    def add_pop(self, pop, fiber, rate_fn=None, stim_ratio=None, method=None, period=spkt_gen.FIT_SPAN):
+        """
+        Streams the VecStims of population pop. rate_fn(t) returns the rate (Hz) at
+        the times t (ms), by default the profile of the fiber class repeated every
+        period ms (the profiles are fitted on 0-10 s, spkt_gen.FIT_SPAN).
+        """
+        if rate_fn is None:
+            rate_fn = lambda t: spkt_gen.rate_at(fiber, np.mod(t, period), stim_ratio)
+        if method is None:
+            method = spkt_gen.RATE_PROFILES[fiber]['method']
+        self.pops[pop] = {'fiber': fiber, 'rate_fn': rate_fn, 'method': method,
+                          'n': 0, 'index': [], 'cells': [], 'kicks': []}
+
+    def attach(self):
+        """
+        Collects the local VecStims of the streamed populations and (re)starts the
+        stream at every finitialize.
+        """
+        from netpyne import sim
+        first = self._first_gids(sim)
+        for pop, p in self.pops.items():
+            p['n']     = sim.net.pops[pop].tags['numCells']
+            p['cells'] = [cell for cell in sim.net.cells if cell.tags['pop'] == pop]
+            p['index'] = [cell.gid - first[pop] for cell in p['cells']]
+            # an external event makes the VecStim restart on its new vector
+            p['kicks'] = [h.NetCon(None, cell.hPointp) for cell in p['cells']]
+        self.tstop = sim.cfg.duration
+        # window 0 is played before the VecStim INITIAL blocks, which start it
+        self.fih = [h.FInitializeHandler(0, lambda: self._refill(0, start=False)),
+                    h.FInitializeHandler(1, lambda: self._schedule(1))]
+
+    def window_spikes(self, pop, k):
+        """
+        Returns (spikes, offsets) of all fibers of pop in window k. Window k of a
+        population is drawn from the streams '<pop>/<k>' of the seed, so it does
+        not depend on the other windows or on which rank generates it.
+        """
+        p = self.pops[pop]
+        t0 = k * self.window
+        t = np.arange(t0, t0 + self.window, self.dt)
+        rate = np.asarray(p['rate_fn'](t), dtype=float)
+        generator = spkt_gen.GENERATORS[p['method']]
+        return generator(rate, t, p['n'], t0 + self.window, seed=self.seed, stream='%s/%d' %(pop, k))
+
+    def _refill(self, k, start=True):
+        # called at the start of window k, all spikes of window k-1 are delivered
+        for pop, p in self.pops.items():
+            spikes, offsets = self.window_spikes(pop, k)
+            for i, cell, kick in zip(p['index'], p['cells'], p['kicks']):
+                cell.hSpkTimes.from_python(spikes[offsets[i]:offsets[i+1]])
+                cell.hPointp.play(cell.hSpkTimes)
+                if start:
+                    kick.event(h.t)
+        if start:
+            self._schedule(k + 1)
+
+    def _schedule(self, k):
+        if k * self.window < self.tstop:
+            h.CVode().event(k * self.window, lambda: self._refill(k))
+
+    @staticmethod
+    def _first_gids(sim):
+        # gids are assigned to the populations in order of creation
+        first, gid = {}, 0
+        for pop in sim.net.pops:
+            first[pop] = gid
+            gid += sim.net.pops[pop].tags.get('numCells', len(sim.net.pops[pop].cellGids))
+        return first
+
+def afferent_stream(cfg):
+    """
+    Streams all afferent populations (spkt_gen.AFFERENTS) of the created network
+    in windows of cfg.stream_window ms, seeded by cfg.spkt_seed. The rates follow
+    cfg.protocol if set, else the repeated profiles at cfg.stim_ratios.
+    """
+    stream = spkt_stream(cfg.stream_window, getattr(cfg, 'spkt_seed', None))
+    for pop, (fiber, n) in spkt_gen.AFFERENTS.items():
+        if getattr(cfg, 'protocol', None):
+            rate_fn = lambda t, fiber=fiber: protocol.protocol_rate(cfg.protocol, fiber, t)
+            stream.add_pop(pop, fiber, rate_fn=rate_fn)
+        else:
+            stream.add_pop(pop, fiber, stim_ratio=cfg.stim_ratios)
+    stream.attach()
+    return stream
@@ -0,0 +1,186 @@
+'''
+steady-state initialization of the network: the resting state of every cell
+rule (membrane potential, mechanism states such as gating variables and the
+CaIntraCellDyn calcium, and ion concentrations) is solved once on a single
+cell without input, cached per rule fingerprint, temperature and rate tables
+in use (see ratetables.mode) in statecache/ (numpy .npz, CACHE_VERSION bumped
+whenever the mods change), and injected into the cells of the rule at every
+finitialize instead of settling from v_init during the run
+'''
+
+import os
+import json
+import hashlib
+from neuron import h
+import numpy as np
+from netpyne import sim
+import genrn
+import templates
+import ratetables
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'statecache')
+CACHE_VERSION = 4 # bumped whenever the mods change, their states cached under the old version being stale
+
+_states = {} # (fingerprint, celsius, table mode): {section: (names, values)}
+_fih = None
+
+def state_names(sec):
+    """
+    Returns the range variables making up the state of a section: v, the
+    STATE variables of its mechanisms and the concentrations of its ions
+    """
+    names = ['v']
+    name = h.ref('')
+    for mech, params in sec.psection()['density_mechs'].items():
+        ms = h.MechanismStandard(mech, 3)
+        for i in range(int(ms.count())):
+            ms.name(name, i)
+            names.append(name[0])
+    for ion in sec.psection()['ions']:
+        names.extend(['%si' %ion, '%so' %ion])
+    return names
+
+def get_state(secs):
+    """
+    Returns the state of the sections {name: section} as {name: (state
+    names, values (variable, segment))}
+    """
+    state = {}
+    for name, sec in secs.items():
+        names = state_names(sec)
+        state[name] = (names, np.array([[getattr(seg, var) for seg in sec] for var in names]))
+    return state
+
+def set_state(secs, state):
+    """
+    Sets the state (see get_state) of the sections {name: section}, segment by
+    segment from bulk setters (see genrn.fset_range)
+    """
+    for name, (names, values) in state.items():
+        sec = secs[name]
+        for var, vals in zip(names, values):
+            genrn.fset_range(sec, var, vals)
+
+def solve(rule, celsius, v_init=-65, dt=0.025, tstep=100, tmax=60000, rtol=1e-7, atol=1e-9):
+    """
+    Returns the resting state (see get_state) of a cell built from a cell rule
+    at celsius, run without input from v_init until no state variable changes
+    by more than rtol of its value (plus atol, for states decaying to 0) over
+    tstep ms, None if it does not settle within tmax ms (spontaneous activity
+    or subthreshold oscillations).
+    """
+    cell = templates.build_cell(rule)
+    secs = {name: cell.secs[name]['hObj'] for name in rule['secs']}
+    h.load_file('stdrun.hoc')
+    saved = h.celsius, h.dt, h.CVode().active()
+    h.celsius, h.dt = celsius, dt
+    h.CVode().active(0)
+    h.finitialize(v_init)
+    state, last = None, get_state(secs)
+    while h.t < tmax:
+        h.continuerun(h.t + tstep)
+        state = get_state(secs)
+        if all((np.abs(state[name][1] - last[name][1]) <= rtol * np.abs(state[name][1]) + atol).all() for name in state):
+            break
+        state, last = None, state
+    h.celsius, h.dt = saved[:2]
+    h.CVode().active(saved[2])
+    return state
+
+def save_state(path, state):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    np.savez_compressed(path, names=json.dumps({name: names for name, (names, values) in state.items()}),
+                        **{'sec_%s' %name: values for name, (names, values) in state.items()})
+
+def load_state(path):
+    data = np.load(path)
+    return {name: (names, data['sec_%s' %name]) for name, names in json.loads(str(data['names'])).items()}
+
+def rule_state(rule, celsius, v_init=-65, dt=0.025, cache_dir=CACHE_DIR, solve_missing=True):
+    """
+    Returns the resting state of a cell rule at celsius (see solve), solved
+    once per rule fingerprint, temperature and rate tables in use and cached in
+    cache_dir. A state not cached is solved only if solve_missing, None otherwise.
+    """
+    key = (templates.fingerprint(rule), celsius, ratetables.mode())
+    if key not in _states:
+        tables = '_t' + hashlib.sha1(repr(key[2]).encode()).hexdigest()[:8] if key[2] else ''
+        path = os.path.join(cache_dir, 'state_%s_%g%s_v%d.npz' %(key[0], celsius, tables, CACHE_VERSION))
+        if os.path.exists(path):
+            _states[key] = load_state(path)
+        elif not solve_missing:
+            return None
+        else:
+            _states[key] = solve(rule, celsius, v_init, dt)
+            if _states[key] is not None:
+                save_state(path, _states[key])
+    return _states[key]
+
+def prepare(netParams, cfg, cache_dir=CACHE_DIR):
+    """
+    Solves (or loads) the resting states of the cell rules of netParams at the
+    temperature of cfg, to be called before the network is created: the
+    single cells are run on their own only while no other section exists.
+    Returns {rule: settled}.
+    """
+    celsius, v_init = cfg.hParams.get('celsius', h.celsius), cfg.hParams.get('v_init', -65)
+    return {label: rule_state(rule, celsius, v_init, cfg.dt, cache_dir) is not None
+            for label, rule in netParams.cellParams.items() if templates.template.compilable(rule)}
+
+def rule_cells(net):
+    """
+    Returns {cell rule label: [cells]}, the compartmental cells of net by the
+    first cell rule whose conds match their tags
+    """
+    cells = {}
+    for cell in net.cells:
+        if not isinstance(getattr(cell, 'secs', None), dict):
+            continue
+        for label, rule in net.params.cellParams.items():
+            conds = rule.get('conds', {})
+            if conds and all(cell.tags.get(k) == v for k, v in conds.items()):
+                cells.setdefault(label, []).append(cell)
+                break
+    return cells
+
+def init_steady(net=None, cfg=None, cache_dir=CACHE_DIR):
+    """
+    Initializes the cells of net from the resting states of their rules at
+    every finitialize (FInitializeHandler after the INITIAL blocks). States are
+    taken from the cache (see prepare), cells of rules not solved, not settled
+    or not buildable on their own keep v_init. Returns the number of cells
+    initialized.
+    """
+    global _fih
+    if net is None:
+        net = sim.net
+    if cfg is None:
+        cfg = sim.cfg
+    celsius = cfg.hParams.get('celsius', h.celsius)
+    inits = []
+    for label, cells in rule_cells(net).items():
+        rule = net.params.cellParams[label]
+        state = rule_state(rule, celsius, cache_dir=cache_dir, solve_missing=False)
+        if state is None:
+            print('  %s: no resting state, initialized at v_init' %label)
+            continue
+        skipped = []
+        for cell in cells:
+            secs = {name: sec['hObj'] for name, sec in cell.secs.items()}
+            if all(name in secs and secs[name].nseg == values.shape[1] for name, (names, values) in state.items()):
+                inits.append((secs, state))
+            else:
+                skipped.append(cell.gid)
+        if skipped:
+            print('  %s: sections or nseg differ from the resting state, cells %s initialized at v_init' %(label, skipped))
+
+    def restore():
+        for secs, state in inits:
+            set_state(secs, state)
+        if h.CVode().active():
+            h.CVode().re_init()
+        else:
+            h.fcurrent()
+
+    _fih = h.FInitializeHandler(1, restore)
+    return len(inits)
@@ -0,0 +1,191 @@
+'''
+cell templates for netpyne: every cell rule is fingerprinted and compiled once
+(per unique fingerprint) into a flat build plan, from which every cell of the
+rule is built instead of re-walking the nested rule dicts cell by cell. NEURON
+has no section copy, so "cloning" a cell replays the hoc calls of the plan
+(Section, connect, insert and setattr), only the rule walk is saved.
+the template of a rule is looked up by its label after the first cell, the
+fingerprint (json + sha1 of the whole rule) is computed once per rule.
+identical rules registered under the same conditions are applied only once.
+opt-in (cfg.cellTemplates): netpyne's CompartCell is replaced only while the
+network is created (see compart_cell).
+'''
+
+import copy
+import json
+import hashlib
+import contextlib
+from neuron import h
+from netpyne import sim
+from netpyne.cell import CompartCell
+from netpyne.specs import Dict
+
+# section parameters a template is built from, any other key (pointps,
+# synMechs, 3d points, ...) leaves the rule to netpyne
+TEMPLATE_KEYS = ('geom', 'ions', 'mechs', 'topol', 'threshold', 'spikeGenLoc', 'vinit', 'weightNorm')
+
+_templates = {} # fingerprint: template, None if the rule cannot be compiled
+_labels = {} # rule label: (rule, template), filled by the first cell of the rule
+
+def fingerprint(rule):
+    """
+    Returns the hash of a cell rule, its sections, mechanisms and parameters
+    (conds excluded): rules with the same fingerprint build identical cells.
+    """
+    desc = {k: v for k, v in rule.items() if k not in ('conds', 'label')}
+    return hashlib.sha1(json.dumps(desc, sort_keys=True, default=str).encode()).hexdigest()
+
+def _scalar(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+class template():
+    """
+    Compiled cell rule: per section, its geometry, its topology and the mechanism
+    and ion parameters as flat (attribute, value) lists set on whole sections.
+    Only rules whose parameters are plain numbers compile (see compilable).
+    """
+    def __init__(self, rule):
+        self.secs = []
+        self.topol = []
+        for name, sec in rule['secs'].items():
+            geom = [(k, v) for k, v in sec.get('geom', {}).items()]
+            mechs = [(mech, ['%s_%s' %(k, mech) for k in params],
+                      [v for v in params.values()]) for mech, params in sec.get('mechs', {}).items()]
+            ions = [(ion, [('%s%s' %(k, ion) if k == 'e' else '%s%s' %(ion, k), v) for k, v in params.items()],
+                     [('%s%s0_%s_ion' %(ion, k, ion), v) for k, v in params.items() if k in ('i', 'o')])
+                    for ion, params in sec.get('ions', {}).items()]
+            self.secs.append((name, geom, mechs, ions))
+            if sec.get('topol'):
+                topol = sec['topol']
+                self.topol.append((name, topol['parentSec'], topol['parentX'], topol['childX']))
+
+    @staticmethod
+    def compilable(rule):
+        """
+        Returns whether a rule can be compiled: no cell vars, no section keys
+        other than TEMPLATE_KEYS, and numeric geometry, mechanism and ion values.
+        """
+        if rule.get('vars') or not rule.get('secs'):
+            return False
+        for sec in rule['secs'].values():
+            if any(k not in TEMPLATE_KEYS for k in sec):
+                return False
+            values = list(sec.get('geom', {}).values())
+            for params in list(sec.get('mechs', {}).values()) + list(sec.get('ions', {}).values()):
+                values.extend(params.values())
+            if not all(_scalar(v) for v in values):
+                return False
+        return True
+
+    def instantiate(self, cell):
+        """
+        Builds the NEURON sections of cell (a netpyne CompartCell) from the
+        template, in the order netpyne uses: sections, topology, then geometry,
+        mechanisms and ions section by section.
+        """
+        secs = cell.secs
+        for name, geom, mechs, ions in self.secs:
+            if name not in secs:
+                secs[name] = Dict()
+            if secs[name].get('hObj') in (None, {}, []):
+                secs[name]['hObj'] = h.Section(name=name, cell=cell)
+        for name, parent, parentX, childX in self.topol:
+            secs[name]['hObj'].connect(secs[parent]['hObj'], parentX, childX)
+        for name, geom, mechs, ions in self.secs:
+            sec = secs[name]['hObj']
+            for k, v in geom:
+                setattr(sec, k, v)
+            for mech, attrs, values in mechs:
+                sec.insert(mech)
+                for k, v in zip(attrs, values):
+                    setattr(sec, k, v)
+            for ion, attrs, globals_ in ions:
+                sec.insert(ion + '_ion')
+                for k, v in attrs:
+                    setattr(sec, k, v)
+                for k, v in globals_:
+                    setattr(h, k, v)
+
+def get_template(rule):
+    """
+    Returns the template of a cell rule (compiled on first use, shared by all
+    rules with the same fingerprint), None if the rule cannot be compiled.
+    """
+    key = fingerprint(rule)
+    if key not in _templates:
+        _templates[key] = template(rule) if template.compilable(rule) else None
+    return _templates[key]
+
+class holder():
+    # sections of a cell built outside netpyne (see build_cell)
+    def __init__(self):
+        self.secs = {}
+
+def build_cell(rule):
+    """
+    Returns a single cell built from a compilable cell rule outside of the
+    network (reference and steady-state runs), its sections in secs[name]['hObj']
+    """
+    cell = holder()
+    template(rule).instantiate(cell)
+    return cell
+
+class templatecell(CompartCell):
+    """
+    netpyne CompartCell built from the compiled templates of its cell rules
+    """
+    def createNEURONObj(self, prop, propLabel=None):
+        entry = _labels.get(propLabel)
+        if entry is None or entry[0] is not prop:
+            entry = _labels[propLabel] = (prop, get_template(prop))
+        tmpl = entry[1]
+        if tmpl is None or sim.cfg.recordDipolesHNN:
+            return CompartCell.createNEURONObj(self, prop, propLabel)
+        tmpl.instantiate(self)
+
+def own_rules(netParams):
+    """
+    Replaces the cell rules of netParams by copies, one per rule object (labels
+    sharing a rule share its copy), so that the passes changing them
+    (discretize, prune) leave the rules of cells.py untouched.
+    """
+    copies = {}
+    for label, rule in list(netParams.cellParams.items()):
+        if id(rule) not in copies:
+            copies[id(rule)] = copy.deepcopy(rule)
+        netParams.cellParams[label] = copies[id(rule)]
+
+def dedup_cell_params(netParams):
+    """
+    Removes the cell rules registered more than once (same conds and
+    fingerprint), which netpyne would otherwise apply to the same cells once
+    per copy. Returns {removed label: kept label}.
+    """
+    kept, removed = {}, {}
+    for label, rule in list(netParams.cellParams.items()):
+        key = (json.dumps(rule.get('conds', {}), sort_keys=True, default=str), fingerprint(rule))
+        if key in kept:
+            removed[label] = kept[key]
+            del netParams.cellParams[label]
+        else:
+            kept[key] = label
+    return removed
+
+@contextlib.contextmanager
+def compart_cell(cfg):
+    """
+    Creates the compartmental cells as templatecells within the block
+    (cfg.cellTemplates set), netpyne's CompartCell being restored after it.
+    Runs recording HNN dipoles keep netpyne's cells.
+    """
+    if not getattr(cfg, 'cellTemplates', False) or getattr(cfg, 'recordDipolesHNN', None):
+        yield
+        return
+    saved = sim.CompartCell
+    sim.CompartCell = templatecell
+    _labels.clear()
+    try:
+        yield
+    finally:
+        sim.CompartCell = saved
+        _labels.clear()
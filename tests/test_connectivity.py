@@ -0,0 +1,61 @@
+'''
+checks of the connectivity table against the connParams of the published
+netParams_mechanical.py (tests/data/baseline_connParams.json, weights stored as
+their cfg names)
+'''
+
+import os
+import json
+from types import SimpleNamespace
+import pytest
+import connectivity
+
+BASELINE = os.path.join(os.path.dirname(__file__), 'data', 'baseline_connParams.json')
+
+def config(**kwargs):
+    # every weight set to its own cfg name, so the rules compare with the baseline
+    cfg = SimpleNamespace(**{name: name for name in connectivity.weight_labels()})
+    cfg.__dict__.update(kwargs)
+    return cfg
+
+def net_params():
+    pops = set(pop for row in connectivity.CONNECTIVITY for pop in row[:2])
+    return SimpleNamespace(connParams={}, popParams={pop: {'numCells': 10} for pop in pops},
+                           synMechParams={})
+
+def test_table_reproduces_baseline():
+    with open(BASELINE) as fp:
+        baseline = json.load(fp)
+    netParams = net_params()
+    connectivity.add_conn_params(netParams, config())
+    assert len(baseline) == 75
+    assert netParams.connParams == baseline
+
+def test_weight_labels_cover_every_rule():
+    with open(BASELINE) as fp:
+        baseline = json.load(fp)
+    labels = connectivity.weight_labels()
+    assert sorted(label for rules in labels.values() for label, i in rules) == sorted(baseline)
+    for name, rules in labels.items():
+        assert all(baseline[label]['weight'] == name for label, i in rules)
+
+def test_vectorized_sampling_shared_by_receptors():
+    netParams = net_params()
+    connectivity.add_conn_params(netParams, config(connSampling='vectorized', connSeed=4))
+    rules = netParams.connParams
+    assert rules['Ab_SAI_AMPA->PKC']['connList'] == rules['Ab_SAI_NMDA->PKC']['connList']
+    assert 'probability' not in rules['Ab_SAI_AMPA->PKC']
+    again = net_params()
+    connectivity.add_conn_params(again, config(connSampling='vectorized', connSeed=4))
+    assert again.connParams == rules
+
+def test_unknown_sampling_rejected():
+    with pytest.raises(ValueError):
+        connectivity.add_conn_params(net_params(), config(connSampling='dense'))
+
+def test_event_synapses():
+    netParams = SimpleNamespace(synMechParams={'AMPA': {'mod': 'AMPA_DynSyn'}, 'GABAb': {'mod': 'GABAb_DynSyn'}})
+    connectivity.event_synapses(netParams, config(eventSynapses=True))
+    assert netParams.synMechParams == {'AMPA': {'mod': 'AMPA_DynSynEv'}, 'GABAb': {'mod': 'GABAb_DynSyn'}}
+    with pytest.raises(ValueError):
+        connectivity.event_synapses(netParams, config(eventSynapses=True, fuseGlutamate=True))
@@ -0,0 +1,34 @@
+'''
+checks of the d_lambda discretization of the cell rules (needs NEURON and netpyne)
+'''
+
+import copy
+from types import SimpleNamespace
+import pytest
+pytest.importorskip('netpyne')
+from neuron import h
+import discretize
+import genrn
+
+RULE = {'conds': {'cellType': 'X'},
+        'secs': {'soma': {'geom': {'L': 20.0, 'diam': 20.0, 'nseg': 1, 'Ra': 150.0, 'cm': 1.0}},
+                 'dend': {'geom': {'L': 1371.0, 'diam': 1.4, 'nseg': 3, 'Ra': 150.0, 'cm': 1.0}}}}
+
+@pytest.mark.parametrize('freq, d_lambda', [(100, 0.1), (500, 0.05)])
+def test_nseg_as_cal_nseg(freq, d_lambda):
+    for geom in (sec['geom'] for sec in RULE['secs'].values()):
+        sec = h.Section(name='probe')
+        sec.L, sec.diam, sec.Ra, sec.cm = geom['L'], geom['diam'], geom['Ra'], geom['cm']
+        assert discretize.nseg(geom, freq, d_lambda) == genrn.cal_nseg(sec, freq, d_lambda)
+
+def test_discretize_works_on_copies(capsys):
+    rule = copy.deepcopy(RULE)
+    netParams = SimpleNamespace(cellParams={'A': rule, 'B': rule},
+                                popParams={'X': {'cellType': 'X', 'numCells': 4}})
+    before, after, report = discretize.discretize(netParams, 100, 0.1)
+    assert rule == RULE
+    assert netParams.cellParams['A'] is netParams.cellParams['B']
+    nsegs = discretize.rule_nseg(RULE, 100, 0.1)
+    assert {name: sec['geom']['nseg'] for name, sec in netParams.cellParams['A']['secs'].items()} == nsegs
+    # the cells of a shared rule counted once
+    assert before == 4 * 4 and after == 4 * sum(nsegs.values())
@@ -0,0 +1,62 @@
+'''
+checks of the batched genrn construction (needs NEURON and the compiled mods,
+run from the directory nrnivmodl was run in)
+'''
+
+import pytest
+h = pytest.importorskip('neuron').h
+
+def _compiled():
+    try:
+        h.Section(name='probe').insert('HH2')
+    except ValueError:
+        return False
+    return True
+
+pytestmark = pytest.mark.skipif(not _compiled(), reason='mods not compiled')
+
+import cells
+import genrn
+
+def psections(cell):
+    return {name: sec.sec.psection() for name, sec in cell.secs.items()}
+
+@pytest.mark.parametrize('create', [cells.createIN, cells.createEX, cells.createPRO])
+def test_plan_rebuilds_the_prototype(create):
+    proto, copy = genrn.build_many(create, 2)
+    pa, pb = psections(proto), psections(copy)
+    assert sorted(pa) == sorted(pb)
+    for name in pa:
+        for k in ('density_mechs', 'ions', 'nseg', 'Ra', 'cm'):
+            assert pa[name][k] == pb[name][k]
+        for k in ('L', 'diam'):
+            assert pa[name]['morphology'][k] == pb[name]['morphology'][k]
+        parents = [cell.secs[name].sec.parentseg() for cell in (proto, copy)]
+        assert [(seg.sec.name(), seg.x) if seg else None for seg in parents[:1]] == \
+               [(seg.sec.name(), seg.x) if seg else None for seg in parents[1:]]
+    assert copy.secs['soma'].mechs == proto.secs['soma'].mechs
+
+def test_build_many_none():
+    calls = []
+    assert genrn.build_many(lambda: calls.append(1), 0) == []
+    assert calls == []
+
+def test_seg_values():
+    sec = h.Section(name='graded')
+    sec.nseg = 5
+    xs = [seg.x for seg in sec]
+    assert list(genrn.seg_values(sec, lambda x: 2 * x)) == [2 * x for x in xs]
+    assert list(genrn.seg_values(sec, [1, 2, 3, 4, 5])) == [1, 2, 3, 4, 5]
+    with pytest.raises(ValueError):
+        genrn.seg_values(sec, [1, 2])
+
+def test_per_x_fallback_logged_once(caplog):
+    import math
+    sec = h.Section(name='graded')
+    sec.nseg = 3
+    func = lambda x: math.exp(x)
+    genrn.seg_values(sec, func)
+    genrn.seg_values(sec, func)
+    assert len([r for r in caplog.records if r.levelname == 'WARNING']) == 1
+    genrn.fset_range(sec, 'diam', func)
+    assert [seg.diam for seg in sec] == pytest.approx([math.exp(seg.x) for seg in sec])
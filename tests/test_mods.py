@@ -0,0 +1,54 @@
+'''
+checks that the CVODE variants of mods/ (solver.CVODE_MECHS) keep the
+parameters, GLOBALs and tables of the mechanisms they replace (read from the
+mod files, no NEURON needed)
+'''
+
+import os
+import re
+import pytest
+
+MOD_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'mods')
+
+# kept in step with solver.CVODE_MECHS, which needs NEURON to import
+CVODE_MECHS = {'HH2': 'HH2_CV', 'KDR': 'KDR_CV', 'KDRI': 'KDRI_CV', 'SS': 'SS_CV',
+               'iCaL': 'iCaL_CV', 'iCaAN': 'iCaAN_CV'}
+
+def read_mod(mech):
+    with open(os.path.join(MOD_DIR, mech + '.mod')) as fp:
+        text = fp.read()
+    text = re.sub(r'COMMENT.*?ENDCOMMENT', '', text, flags=re.S)
+    return re.sub(r':.*', '', text)
+
+def block(text, name):
+    match = re.search(r'\b%s\s*{(.*?)}' %name, text, flags=re.S)
+    return match.group(1) if match else ''
+
+def parameters(text):
+    # PARAMETER names, but dt (read by the fixed step updates only)
+    names = set(re.findall(r'^\s*([A-Za-z_]\w*)', block(text, 'PARAMETER'), flags=re.M))
+    return names - {'dt'}
+
+def globals_(text):
+    return set(name for line in re.findall(r'\bGLOBAL\b(.*)', block(text, 'NEURON'))
+               for name in re.findall(r'\w+', line))
+
+def tables(text):
+    # TABLE statements, but the fixed step factors x_exp = 1 - exp(-dt/tau_x)
+    # and their dependence on dt
+    return sorted(re.sub(r'\bdt\s*,\s*|,\s*dt\b|,\s*\w+_exp\b', '', ' '.join(table.split()))
+                  for table in re.findall(r'\bTABLE\b([^\n]*)', text))
+
+def test_variants_listed_as_in_solver():
+    solver = pytest.importorskip('solver')
+    assert solver.CVODE_MECHS == CVODE_MECHS
+
+@pytest.mark.parametrize('mech', sorted(CVODE_MECHS))
+def test_variant_keeps_parameters_and_tables(mech):
+    base, variant = read_mod(mech), read_mod(CVODE_MECHS[mech])
+    assert parameters(variant) == parameters(base)
+    assert globals_(variant) == globals_(base)
+    if mech in ('KDR', 'KDRI', 'SS'):
+        # tabulate tau rather than the fixed step factor fac = 1 - exp(-dt/tau)
+        base = base.replace('inf, fac', 'inf, tau')
+    assert tables(variant) == tables(base)
@@ -0,0 +1,69 @@
+'''
+checks of the cache of realized networks (needs NEURON, netpyne and the
+compiled mods, run from the directory nrnivmodl was run in)
+'''
+
+import copy
+import pytest
+pytest.importorskip('netpyne')
+from neuron import h
+
+def _compiled():
+    try:
+        h.Section(name='probe').insert('HH2')
+    except ValueError:
+        return False
+    return True
+
+pytestmark = pytest.mark.skipif(not _compiled(), reason='mods not compiled')
+
+from netpyne import specs, sim
+import cells
+import connectivity
+import net_cache
+
+TABLE = [('Ab_SAI', 'PKC', 1.0, 0.3, [('AMPA', 'Ab_EX_AMPA'), ('NMDA', 'Ab_EX_NMDA')]),
+         ('PKC'   , 'PKC', 0.5, 0.3, [('AMPA', 'PKC_AMPA')])]
+
+def small_network():
+    cfg = specs.SimConfig()
+    cfg.duration, cfg.dt = 50, 0.025
+    cfg.includeParamsLabel = True
+    cfg.verbose = False
+    cfg.Ab_EX_AMPA, cfg.Ab_EX_NMDA, cfg.PKC_AMPA = 0.0221559, 0.015, 0.0021
+    netParams = specs.NetParams()
+    netParams.popParams['Ab_SAI'] = {'cellModel': 'VecStim', 'numCells': 8, 'spkTimes': [[10.0]] * 8}
+    netParams.popParams['PKC'] = {'cellType': 'PKC', 'numCells': 5}
+    netParams.cellParams['PKC'] = dict(copy.deepcopy(cells.PKCRule), conds={'cellType': 'PKC'})
+    netParams.synMechParams['AMPA'] = {'mod': 'AMPA_DynSyn', 'tau_rise': 0.1, 'tau_decay': 5}
+    netParams.synMechParams['NMDA'] = {'mod': 'NMDA_DynSyn', 'tau_rise': 2, 'tau_decay': 100}
+    connectivity.add_conn_params(netParams, cfg, TABLE)
+    return netParams, cfg
+
+def conns():
+    return [sorted((c['preGid'], c['sec'], c['loc'], c['synMech'], c['weight'], c['delay']) for c in cell.conns)
+            for cell in sim.net.cells]
+
+def test_round_trip(tmp_path):
+    netParams, cfg = small_network()
+    sim.create(netParams=netParams, simConfig=cfg)
+    fresh = conns()
+    assert sum(len(c) for c in fresh) > 0
+    # realized and saved, then reloaded
+    for i in range(2):
+        netParams, cfg = small_network()
+        net_cache.create(netParams, cfg, cache_dir=str(tmp_path))
+        assert conns() == fresh
+        assert len(list(tmp_path.iterdir())) == 1
+
+def test_network_key():
+    netParams, cfg = small_network()
+    sim.initialize(netParams, cfg)
+    key = net_cache.network_key(netParams, cfg)
+    netParams.connParams['Ab_SAI_AMPA->PKC']['weight'] = 0.05
+    assert net_cache.network_key(netParams, cfg) == key
+    netParams.connParams['Ab_SAI_AMPA->PKC']['probability'] = 0.4
+    assert net_cache.network_key(netParams, cfg) != key
+    netParams, cfg = small_network()
+    cfg.connSeed = 2
+    assert net_cache.network_key(netParams, cfg) != key
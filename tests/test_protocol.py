@@ -0,0 +1,67 @@
+'''
+checks of the stimulus protocols (no NEURON needed)
+'''
+
+import numpy as np
+import pytest
+import spkt_gen
+import protocol
+
+STEP = [{'type': 'step', 'start': 0, 'stop': 5000, 'amp': 0.25}]
+
+@pytest.mark.parametrize('fiber', sorted(spkt_gen.RATE_PROFILES))
+def test_step_follows_the_profile(fiber):
+    rates, t = protocol.compile_protocol(STEP, dt=1.0, duration=6000)
+    on = t < 5000
+    assert np.allclose(rates[fiber][on], np.clip(spkt_gen.rate_at(fiber, t[on], 0.25 if spkt_gen.RATE_PROFILES[fiber]['scaled'] else 1.0), 0, None))
+    assert not rates[fiber][~on].any()
+
+@pytest.mark.parametrize('fiber', sorted(spkt_gen.RATE_PROFILES))
+def test_long_step_bounded(fiber):
+    # a 60 s step replays the fitted 10 s response instead of extrapolating it
+    step = [{'type': 'step', 'start': 0, 'stop': 60000, 'amp': 0.25}]
+    rates, t = protocol.compile_protocol(step, dt=1.0, duration=60000)
+    rate = rates[fiber][:-1]
+    peak = np.clip(spkt_gen.rate_profile(fiber, 1.0)[0], 0, None).max()
+    assert np.isfinite(rate).all() and rate.min() >= 0 and rate.max() <= peak
+    for window in rate.reshape(6, -1):
+        assert window.mean() > 0
+
+def test_press_repeats():
+    press = [{'type': 'press', 'start': 0, 'stop': 30000, 'period': 10000, 'width': 5000, 'amp': 0.25}]
+    rates, t = protocol.compile_protocol(press)
+    for fiber in rates:
+        first, second = rates[fiber][:10000], rates[fiber][10000:20000]
+        assert np.array_equal(first, second)
+        assert not first[5000:].any()
+
+def test_ramp_and_vibration():
+    ramp = [{'type': 'ramp', 'start': 0, 'stop': 2000, 'amp': [0.0, 0.5]}]
+    rates, t = protocol.compile_protocol(ramp)
+    assert rates['C'][0] == 0 and rates['C'][1000] == pytest.approx(spkt_gen.rate_at('C', 1000.0, 0.25))
+    vib = STEP + [{'type': 'vibration', 'start': 0, 'stop': 5000, 'freq': 20.0, 'depth': 0.5}]
+    vrates, t = protocol.compile_protocol(vib)
+    srates, t = protocol.compile_protocol(STEP)
+    # 20 Hz over whole periods averages out
+    assert vrates['C'][:5000].mean() == pytest.approx(srates['C'][:5000].mean(), rel=1e-2)
+
+def test_compiled_protocols_memoized_and_read_only():
+    a = protocol.compile_protocol(STEP)
+    b = protocol.compile_protocol([dict(STEP[0])])
+    assert a is b
+    with pytest.raises(ValueError):
+        a[0]['C'][0] = 1.0
+
+def test_bad_protocols_rejected():
+    with pytest.raises(ValueError):
+        protocol.protocol_rate([{'type': 'squeeze', 'start': 0, 'stop': 1}], 'C', [0.0])
+    with pytest.raises(ValueError):
+        protocol.protocol_rate([{'type': 'step', 'start': 10, 'stop': 1, 'amp': 1}], 'C', [0.0])
+
+def test_protocol_trains_reproducible():
+    a = protocol.protocol_trains(STEP, 5000.0, seed=3)
+    b = protocol.protocol_trains(STEP, 5000.0, seed=3)
+    assert sorted(a) == sorted(spkt_gen.AFFERENTS)
+    for pop in a:
+        assert np.array_equal(a[pop][0], b[pop][0])
+        assert len(a[pop][1]) == spkt_gen.AFFERENTS[pop][1] + 1
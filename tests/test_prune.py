@@ -0,0 +1,39 @@
+'''
+checks of the pruning of the zero-conductance mechanisms (needs NEURON,
+netpyne and the compiled mods, run from the directory nrnivmodl was run in)
+'''
+
+import copy
+from types import SimpleNamespace
+import pytest
+pytest.importorskip('netpyne')
+from neuron import h
+
+def _compiled():
+    try:
+        h.Section(name='probe').insert('HH2')
+    except ValueError:
+        return False
+    return True
+
+pytestmark = pytest.mark.skipif(not _compiled(), reason='mods not compiled')
+
+import prune
+
+RULE = {'conds': {'cellType': 'X'},
+        'secs': {'soma': {'geom': {'L': 20.0, 'diam': 20.0, 'nseg': 1},
+                          'mechs': {'pas': {'g': 1e-4, 'e': -65.0}, 'HH2': {'gnabar': 0.0, 'gkbar': 0.0},
+                                    'KDR': {'gkbar': 0.01}}}}}
+
+def test_zero_mechs():
+    assert prune.zero_mechs(RULE['secs']['soma']['mechs']) == ['HH2']
+
+def test_prune_works_on_copies(capsys):
+    rule = copy.deepcopy(RULE)
+    netParams = SimpleNamespace(cellParams={'A': rule, 'B': rule})
+    report = prune.prune(netParams, check=False)
+    assert rule == RULE
+    assert netParams.cellParams['A'] is netParams.cellParams['B']
+    assert 'HH2' not in netParams.cellParams['A']['secs']['soma']['mechs']
+    assert report['A'] == report['B'] == {'soma': ['HH2']}
+    assert 'A soma: pruned HH2' in capsys.readouterr().out
@@ -0,0 +1,77 @@
+'''
+checks of the rate tables (needs NEURON and the compiled mods, run from the
+directory nrnivmodl was run in)
+'''
+
+from types import SimpleNamespace
+import pytest
+h = pytest.importorskip('neuron').h
+
+def _compiled():
+    try:
+        h.Section(name='probe').insert('HH2')
+    except ValueError:
+        return False
+    return True
+
+pytestmark = pytest.mark.skipif(not _compiled(), reason='mods not compiled')
+
+import ratetables
+
+def net_params(**params):
+    mechs = {'B_Na': dict({'gnabar': 0.03}, **params)}
+    return SimpleNamespace(cellParams={'EX': {'secs': {'soma': {'mechs': mechs}}}})
+
+def b_na_rates(shifts):
+    # inf and tau of B_Na at -50 mV in sections with the given alpha_shift
+    secs = []
+    for shift in shifts:
+        sec = h.Section(name='b_na')
+        sec.insert('B_Na')
+        sec(0.5).B_Na.alpha_shift = shift
+        secs.append(sec)
+    h.finitialize(-50)
+    return [(sec(0.5).B_Na.inf[0], sec(0.5).B_Na.tau[0]) for sec in secs]
+
+def test_b_na_table_kept_with_defaults():
+    assert ratetables.untable(net_params(alpha_shift=0.0)) == []
+    assert h.usetable_B_Na == 1
+    assert ('B_Na', 'direct') not in ratetables.mode()
+
+def test_b_na_table_off_with_shifts(capsys):
+    assert ratetables.untable(net_params(alpha_shift=6.713)) == ['B_Na']
+    assert h.usetable_B_Na == 0
+    assert ('B_Na', 'direct') in ratetables.mode()
+    assert 'alpha_shift' in capsys.readouterr().out
+    # every instance with its own shift, as the direct formulas give
+    shifted, default = b_na_rates([6.713, 0.0])
+    assert shifted != default
+    ratetables.untable(net_params())
+
+@pytest.mark.parametrize('mech', sorted(ratetables.PROBES))
+def test_tables_match_the_formulas(mech):
+    for name, err in ratetables.table_error(mech).items():
+        assert err < 1e-3, (mech, name)
+
+def test_fixed_parameters_checked():
+    rule = {'secs': {'soma': {'mechs': {'borgka': {'gkabar': 0.1, 'vhalfn': -30.0}}}}}
+    with pytest.raises(ValueError):
+        ratetables.check_rules(SimpleNamespace(cellParams={'X': rule}))
+
+def test_cvode_variants_switched_along():
+    ratetables.use_tables(True)
+    try:
+        assert h.tabulate_HH2_CV == 1 and h.tabulate_iCaL_CV == 1
+        ratetables.set_range('HH2', -60, 140)
+        assert (h.v2min_HH2_CV, h.v2max_HH2_CV) == (-60, 140)
+    finally:
+        ratetables.set_range('HH2', -50, 150)
+        ratetables.use_tables(False)
+    assert h.tabulate_HH2_CV == 0
+
+def test_cvode_variant_without_tables_rejected(monkeypatch):
+    import solver
+    monkeypatch.setitem(solver.CVODE_MECHS, 'borgka', 'KDR_CV')
+    cfg = SimpleNamespace(rate_tables=True, cvode_active=True)
+    with pytest.raises(ValueError):
+        ratetables.set_tables(cfg)
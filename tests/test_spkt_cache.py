@@ -0,0 +1,72 @@
+'''
+checks of the reproducibility of the generated afferent trains and of their
+cache (no NEURON needed)
+'''
+
+import os
+import json
+from types import SimpleNamespace
+import numpy as np
+import pytest
+import spkt_gen
+import spkt_cache
+
+def config(**kwargs):
+    cfg = SimpleNamespace(stim_ratios=0.25, freq='100mN', duration=2000.0, spkt_seed=1)
+    cfg.__dict__.update(kwargs)
+    return cfg
+
+@pytest.mark.parametrize('method', sorted(spkt_gen.GENERATORS))
+def test_same_seed_same_trains(method):
+    a = spkt_gen.afferent_trains('C', 20, 2000.0, 0.25, seed=5, method=method, stream='C_PEP')
+    b = spkt_gen.afferent_trains('C', 20, 2000.0, 0.25, seed=5, method=method, stream='C_PEP')
+    c = spkt_gen.afferent_trains('C', 20, 2000.0, 0.25, seed=6, method=method, stream='C_PEP')
+    assert np.array_equal(a[0], b[0]) and np.array_equal(a[1], b[1])
+    assert not np.array_equal(a[0], c[0])
+
+@pytest.mark.parametrize('method', sorted(spkt_gen.GENERATORS))
+def test_fiber_train_independent_of_batch(method):
+    # the fibers of a stream split over two ranks draw the trains of one batch
+    whole = spkt_gen.split_trains(*spkt_gen.afferent_trains('Ad', 20, 2000.0, 0.5, seed=2, method=method, stream='Ad'))
+    head = spkt_gen.split_trains(*spkt_gen.afferent_trains('Ad', 8, 2000.0, 0.5, seed=2, method=method, stream='Ad'))
+    tail = spkt_gen.split_trains(*spkt_gen.afferent_trains('Ad', 12, 2000.0, 0.5, seed=2, method=method, stream='Ad', first=8))
+    assert whole == head + tail
+
+def test_populations_of_a_class_are_independent():
+    pep = spkt_gen.split_trains(*spkt_gen.afferent_trains('C', 80, 2000.0, 0.25, seed=1, stream='C_PEP'))
+    np_ = spkt_gen.split_trains(*spkt_gen.afferent_trains('C', 80, 2000.0, 0.25, seed=1, stream='C_NP'))
+    assert not any(a == b for a, b in zip(pep, np_) if a)
+
+def test_cached_trains_reloaded(tmp_path):
+    first = spkt_cache.load_spkt('C', 10, 0.25, 2000.0, 1, stream='C_PEP', cache_dir=str(tmp_path))
+    files = os.listdir(str(tmp_path))
+    again = spkt_cache.load_spkt('C', 10, 0.25, 2000.0, 1, stream='C_PEP', cache_dir=str(tmp_path))
+    assert len(files) == 1 and os.listdir(str(tmp_path)) == files
+    assert again.tolist() == first.tolist()
+    assert first.tolist() == spkt_gen.split_trains(*spkt_gen.afferent_trains('C', 10, 2000.0, 0.25, seed=1, stream='C_PEP'))
+
+def test_cache_key_changes_with_every_input():
+    args = ('C', 10, 0.25, 2000.0, 1, 'rescaling', 'C_PEP')
+    keys = {spkt_cache.cache_key(*args)}
+    for i, value in enumerate(('Ad', 11, 0.5, 3000.0, 2, 'thinning', 'C_NP')):
+        keys.add(spkt_cache.cache_key(*(args[:i] + (value,) + args[i+1:])))
+    assert len(keys) == 8
+
+def test_default_config_generates_per_population(tmp_path, monkeypatch):
+    monkeypatch.setattr(spkt_cache, 'CACHE_DIR', str(tmp_path / 'cache'))
+    cfg = config()
+    pep = spkt_cache.afferent_spkt('C_PEP', 'C', 80, cfg)
+    np_ = spkt_cache.afferent_spkt('C_NP', 'C', 80, cfg)
+    assert len(pep) == len(np_) == 80 and pep != np_
+    # nothing but the cache written next to it
+    assert os.listdir(str(tmp_path)) == ['cache']
+
+def test_published_trains_opt_in(tmp_path, monkeypatch):
+    trains = [[1.0, 2.0], [3.0]]
+    (tmp_path / 'spkt_C_100mN.json').write_text(json.dumps(trains))
+    monkeypatch.setattr(spkt_cache, 'CACHE_DIR', str(tmp_path / 'cache'))
+    cfg = config(spkt_published=True)
+    assert spkt_cache.afferent_spkt('C_PEP', 'C', 2, cfg) == trains
+    assert spkt_cache.afferent_spkt('C_NP', 'C', 2, cfg) == trains
+    # read in place, not converted
+    assert sorted(os.listdir(str(tmp_path))) == ['spkt_C_100mN.json']
@@ -0,0 +1,71 @@
+'''
+checks of the afferent rate profiles and spike generators (no NEURON needed)
+'''
+
+import numpy as np
+import pytest
+import spkt_gen
+
+def published_rate(fiber, key, stim_ratio):
+    # rate_SAI ... rate_C of the published model, term by term
+    if fiber in ('SAI', 'SAII'):
+        return (-1.45433609113392e-10 * key ** 3 + 1.340603396708e-6 * key ** 2 - 0.00378224210238498 * key + 4.52737468545426) * 8
+    if fiber == 'Ad':
+        return ( -7.265297e-15 * key ** 4 + 1.573831e-10 * key ** 3 - 8.201529e-7 * key ** 2 - 0.002539930 * key + 27.18412 ) * stim_ratio
+    return (  9.630390e-15 * key ** 4 - 2.844577e-10 * key ** 3 + 3.012887e-6 * key ** 2 - 0.01400381 * key + 31.86546 ) * stim_ratio
+
+@pytest.mark.parametrize('fiber', ['SAI', 'SAII', 'Ad', 'C'])
+@pytest.mark.parametrize('stim_ratio', [0.125, 0.25, 1.0])
+def test_rate_profile_matches_published(fiber, stim_ratio):
+    rate, t = spkt_gen.rate_profile(fiber, stim_ratio)
+    assert len(t) == 10001 and t[0] == 0 and t[-1] == 10000
+    expected = [published_rate(fiber, key, stim_ratio) for key in range(10001)]
+    assert np.allclose(rate, expected, rtol=1e-12, atol=1e-12)
+
+def test_rate_profile_memoized_read_only():
+    rate, t = spkt_gen.rate_profile('C', 0.25)
+    assert spkt_gen.rate_profile('C', 0.25)[0] is rate
+    with pytest.raises(ValueError):
+        rate[0] = 0
+
+def test_rate_at_scales_only_scaled_fibers():
+    t = np.array([0.0, 5000.0])
+    assert np.allclose(spkt_gen.rate_at('SAI', t, 1.0), spkt_gen.rate_at('SAI', t, 0.25))
+    assert np.allclose(spkt_gen.rate_at('C', t, 1.0), 4 * spkt_gen.rate_at('C', t, 0.25))
+
+@pytest.mark.parametrize('method', sorted(spkt_gen.GENERATORS))
+def test_afferent_trains_dispatch(method):
+    rate, t = spkt_gen.rate_profile('Ad', 0.5, 1.0, 2000.0)
+    spikes, offsets = spkt_gen.afferent_trains('Ad', 7, 2000.0, 0.5, seed=3, method=method, stream='Ad')
+    ref = spkt_gen.GENERATORS[method](rate, t, 7, 2000.0, 3, 'Ad', 0)
+    assert np.array_equal(spikes, ref[0]) and np.array_equal(offsets, ref[1])
+
+@pytest.mark.parametrize('method', sorted(spkt_gen.GENERATORS))
+def test_generators_follow_the_rate(method):
+    # 400 fibers, a rate stepping from 40 to 5 Hz at 500 ms
+    t = np.arange(0, 1001, 1.0)
+    rate = np.where(t < 500, 40.0, 5.0)
+    spikes, offsets = spkt_gen.GENERATORS[method](rate, t, 400, 1000.0, 1, 'step')
+    assert len(offsets) == 401 and offsets[-1] == len(spikes)
+    assert ((spikes >= 0) & (spikes <= 1000)).all()
+    for i in range(400):
+        assert (np.diff(spikes[offsets[i]:offsets[i+1]]) > 0).all()
+    # expected 20 and 2.5 spikes per fiber, 5 sigma bounds
+    early, late = (spikes < 500).sum(), (spikes >= 500).sum()
+    assert abs(early - 8000) < 5 * np.sqrt(8000)
+    assert abs(late - 1000) < 5 * np.sqrt(1000)
+
+def test_generators_silent_rate():
+    t = np.arange(0, 101, 1.0)
+    for generator in spkt_gen.GENERATORS.values():
+        spikes, offsets = generator(np.zeros(t.shape), t, 5, 100.0, 1, 'silent')
+        assert len(spikes) == 0 and list(offsets) == [0] * 6
+
+def test_fiber_generators_per_stream_and_fiber():
+    # 'plumless' and 'buckeroo' share a crc32, their stream ids must not
+    assert spkt_gen.stream_id('plumless') != spkt_gen.stream_id('buckeroo')
+    assert spkt_gen.stream_id('a') != spkt_gen.stream_id('a\x00')
+    a = [g.random() for g in spkt_gen.fiber_generators(5, 4, 'plumless')]
+    b = [g.random() for g in spkt_gen.fiber_generators(5, 4, 'buckeroo')]
+    c = [g.random() for g in spkt_gen.fiber_generators(5, 2, 'plumless', first=2)]
+    assert len(set(a) | set(b)) == 8 and c == a[2:]
@@ -0,0 +1,44 @@
+'''
+checks of the binary spike train container (no NEURON needed)
+'''
+
+import json
+import numpy as np
+import pytest
+import spkt_store
+
+TRAINS = [[1.5, 2.25, 10.0], [], [0.125], [3.0, 4.0]]
+
+@pytest.mark.parametrize('mmap', [True, False])
+def test_round_trip(tmp_path, mmap):
+    trains = spkt_store.spktrains.from_lists(TRAINS)
+    path = str(tmp_path / 'trains.spkt')
+    spkt_store.write_spkt(path, trains.spikes, trains.offsets)
+    loaded = spkt_store.read_spkt(path, mmap=mmap)
+    assert len(loaded) == len(TRAINS)
+    assert [list(train) for train in loaded] == TRAINS
+    assert loaded.tolist() == TRAINS
+
+def test_loaded_lists_survive_json(tmp_path):
+    # netpyne saves and hashes the spkTimes through json
+    path = str(tmp_path / 'trains.spkt')
+    trains = spkt_store.spktrains.from_lists(TRAINS)
+    spkt_store.write_spkt(path, trains.spikes, trains.offsets)
+    spkTimes = spkt_store.read_spkt(path).tolist()
+    assert all(type(train) == list for train in spkTimes)
+    assert json.loads(json.dumps({'spkTimes': spkTimes})) == {'spkTimes': TRAINS}
+
+def test_json_conversion(tmp_path):
+    path = tmp_path / 'spkt_C_100mN.json'
+    path.write_text(json.dumps(TRAINS))
+    out = spkt_store.json_to_spkt(str(path))
+    assert out == str(tmp_path / 'spkt_C_100mN.spkt')
+    assert spkt_store.read_spkt(out).tolist() == TRAINS
+
+def test_rejects_bad_files(tmp_path):
+    path = tmp_path / 'bad.spkt'
+    path.write_bytes(b'NOTSPKT!' + bytes(16))
+    with pytest.raises(ValueError):
+        spkt_store.read_spkt(str(path))
+    with pytest.raises(ValueError):
+        spkt_store.write_spkt(str(tmp_path / 'x.spkt'), np.array([1.0, 2.0]), np.array([0, 1]))
@@ -0,0 +1,49 @@
+'''
+checks of the streamed afferent stimulus (needs NEURON, netpyne and the
+compiled mods, run from the directory nrnivmodl was run in)
+'''
+
+import numpy as np
+import pytest
+pytest.importorskip('netpyne')
+from neuron import h
+
+def _compiled():
+    try:
+        h.Section(name='probe').insert('HH2')
+    except ValueError:
+        return False
+    return True
+
+pytestmark = pytest.mark.skipif(not _compiled(), reason='mods not compiled')
+
+from netpyne import specs, sim
+import spkt_stream
+
+WINDOW = 30.01 # ms, the window boundaries fall between time steps
+
+def rate(t):
+    # 150 Hz but in the second window, which is empty
+    return np.where((t >= WINDOW) & (t < 2*WINDOW), 0.0, 150.0)
+
+def test_stream_delivers_every_window():
+    cfg = specs.SimConfig()
+    cfg.duration, cfg.dt = 4*WINDOW + 5, 0.025
+    cfg.verbose = False
+    netParams = specs.NetParams()
+    netParams.popParams['A'] = {'cellModel': 'VecStim', 'numCells': 3, 'spkTimes': [[] for i in range(3)]}
+    sim.create(netParams=netParams, simConfig=cfg)
+    stream = spkt_stream.spkt_stream(WINDOW, seed=2)
+    stream.add_pop('A', 'SAI', rate_fn=rate, method='thinning')
+    stream.attach()
+    recs, ncs = [h.Vector() for cell in sim.net.cells], [h.NetCon(cell.hPointp, None) for cell in sim.net.cells]
+    for nc, rec in zip(ncs, recs):
+        nc.record(rec)
+    sim.simulate()
+    windows = [stream.window_spikes('A', k) for k in range(5)]
+    assert len(windows[1][0]) == 0
+    for i, rec in enumerate(recs):
+        expected = np.concatenate([spikes[offsets[i]:offsets[i+1]] for spikes, offsets in windows])
+        expected = expected[expected <= cfg.duration]
+        assert len(expected) > 0
+        assert np.allclose(rec.as_numpy(), expected, rtol=0, atol=1e-9)
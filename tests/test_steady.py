@@ -0,0 +1,90 @@
+'''
+checks of the steady-state initialization (needs NEURON, netpyne and the
+compiled mods, run from the directory nrnivmodl was run in)
+'''
+
+import copy
+from types import SimpleNamespace
+import numpy as np
+import pytest
+pytest.importorskip('netpyne')
+from neuron import h
+
+def _compiled():
+    try:
+        h.Section(name='probe').insert('HH2')
+    except ValueError:
+        return False
+    return True
+
+pytestmark = pytest.mark.skipif(not _compiled(), reason='mods not compiled')
+
+import steady
+import templates
+import ratetables
+
+RULE = {'conds': {'cellType': 'X'},
+        'secs': {'soma': {'geom': {'L': 20.0, 'diam': 20.0, 'nseg': 1},
+                          'mechs': {'pas': {'g': 1e-4, 'e': -70.0}, 'HH2': {'gnabar': 0.05, 'gkbar': 0.01}}},
+                 'dend': {'geom': {'L': 200.0, 'diam': 2.0, 'nseg': 3},
+                          'mechs': {'pas': {'g': 1e-4, 'e': -70.0}},
+                          'topol': {'parentSec': 'soma', 'parentX': 1.0, 'childX': 0.0}}}}
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(steady, '_states', {})
+    monkeypatch.setattr(steady, '_fih', None)
+    return str(tmp_path)
+
+def test_solved_state_settles():
+    state = steady.solve(RULE, 34.0)
+    assert state is not None and set(state) == {'soma', 'dend'}
+    cell = templates.build_cell(RULE)
+    secs = {name: sec['hObj'] for name, sec in cell.secs.items()}
+    h.load_file('stdrun.hoc')
+    h.dt = 0.025
+    h.celsius = 34.0
+    h.finitialize(-65)
+    steady.set_state(secs, state)
+    h.fcurrent()
+    v0 = np.array([seg.v for sec in secs.values() for seg in sec])
+    h.continuerun(100)
+    v1 = np.array([seg.v for sec in secs.values() for seg in sec])
+    assert np.abs(v1 - v0).max() / 100 < 1e-6
+
+def test_rule_state_cached(cache, monkeypatch):
+    calls = []
+    fake = lambda rule, celsius, v_init, dt: calls.append(celsius) or {'soma': (['v'], np.array([[-65.0]]))}
+    monkeypatch.setattr(steady, 'solve', fake)
+    first = steady.rule_state(RULE, 34.0, cache_dir=cache)
+    assert steady.rule_state(RULE, 34.0, cache_dir=cache) is first and calls == [34.0]
+    steady.rule_state(RULE, 36.0, cache_dir=cache)
+    assert calls == [34.0, 36.0]
+    # reloaded from cache_dir once solved
+    monkeypatch.setattr(steady, '_states', {})
+    assert steady.rule_state(RULE, 36.0, cache_dir=cache, solve_missing=False) is not None
+    assert calls == [34.0, 36.0]
+    monkeypatch.setattr(ratetables, 'mode', lambda: (('HH2', -50.0, 150.0),))
+    assert steady.rule_state(RULE, 34.0, cache_dir=cache, solve_missing=False) is None
+    steady.rule_state(RULE, 34.0, cache_dir=cache)
+    assert calls == [34.0, 36.0, 34.0]
+
+def test_init_steady_counts_the_cells(cache, capsys):
+    other = copy.deepcopy(RULE)
+    other['secs']['dend']['geom']['nseg'] = 5
+    unsolved = dict(copy.deepcopy(RULE), conds={'cellType': 'Y'})
+    unsolved['secs']['soma']['geom']['L'] = 30.0
+    params = SimpleNamespace(cellParams={'X': RULE, 'Y': unsolved})
+    cells = [SimpleNamespace(gid=gid, tags={'cellType': tag}, secs=templates.build_cell(rule).secs)
+             for gid, tag, rule in ((0, 'X', RULE), (1, 'X', RULE), (2, 'X', other), (3, 'Y', unsolved))]
+    net = SimpleNamespace(cells=cells, params=params)
+    cfg = SimpleNamespace(hParams={'celsius': 34.0}, dt=0.025)
+    state = steady.rule_state(RULE, 34.0, cache_dir=cache)
+    assert steady.init_steady(net, cfg, cache_dir=cache) == 2
+    out = capsys.readouterr().out
+    assert 'Y: no resting state' in out and 'cells [2]' in out
+    h.celsius = 34.0
+    h.finitialize(-65)
+    for cell in cells[:2]:
+        assert np.allclose([seg.v for seg in cell.secs['dend']['hObj']], state['dend'][1][0])
+    assert cells[3].secs['soma']['hObj'](0.5).v == -65
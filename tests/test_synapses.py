@@ -0,0 +1,86 @@
+'''
+checks of the event-driven synapses against the DynSyn mods they replace
+(needs NEURON and the compiled mods, run from the directory nrnivmodl was run in)
+'''
+
+import numpy as np
+import pytest
+h = pytest.importorskip('neuron').h
+
+def _compiled():
+    try:
+        h.Section(name='probe').insert('HH2')
+    except ValueError:
+        return False
+    return True
+
+pytestmark = pytest.mark.skipif(not _compiled(), reason='mods not compiled')
+
+import connectivity
+
+def conductance(mod, events, dt=0.025, tstop=60.0):
+    h.load_file('stdrun.hoc')
+    sec = h.Section(name='syn')
+    sec.insert('pas')
+    syn = getattr(h, mod)(sec(0.5))
+    stim, times = h.VecStim(), h.Vector(events)
+    stim.play(times)
+    nc = h.NetCon(stim, syn)
+    nc.weight[0] = 1e-3
+    g, t = h.Vector().record(syn._ref_g), h.Vector().record(h._ref_t)
+    h.dt = dt
+    h.finitialize(-65)
+    h.continuerun(tstop)
+    return np.array(t), np.array(g)
+
+@pytest.mark.parametrize('mod', sorted(connectivity.EVENT_MODS))
+def test_event_conductance_leads_half_a_step(mod):
+    events = [5.0, 5.3, 20.0, 20.05, 21.0]
+    t, g = conductance(mod, events)
+    tev, gev = conductance(connectivity.EVENT_MODS[mod], events)
+    # away from the events, the event-driven conductance is the DynSyn one half a step later
+    late = t < t[-1] - h.dt
+    for te in events:
+        late &= np.abs(t - te) > 3.0
+    shifted = np.interp(t, t - h.dt / 2, g)
+    assert np.abs(shifted - gev)[late].max() < 1e-4 * g.max()
+
+def test_fused_glutamate_is_ampa_plus_nmda():
+    # the three synapses on one clamped compartment, driven by the same events
+    h.load_file('stdrun.hoc')
+    sec = h.Section(name='glu')
+    sec.insert('pas')
+    clamp = h.SEClamp(sec(0.5))
+    clamp.dur1, clamp.amp1 = 1e9, -40.0
+    stp = {'U1': 0.3, 'tau_rec': 200.0, 'tau_fac': 50.0}
+    syns = {'GLU': h.GLU_DynSyn(sec(0.5)), 'AMPA': h.AMPA_DynSyn(sec(0.5)), 'NMDA': h.NMDA_DynSyn(sec(0.5))}
+    for name, value in dict(stp, tau_rise_ampa=0.1, tau_decay_ampa=5.0, tau_rise_nmda=2.0, tau_decay_nmda=100.0).items():
+        setattr(syns['GLU'], name, value)
+    for mod, taus in (('AMPA', (0.1, 5.0)), ('NMDA', (2.0, 100.0))):
+        syns[mod].tau_rise, syns[mod].tau_decay = taus
+        for name, value in stp.items():
+            setattr(syns[mod], name, value)
+    stim, times = h.VecStim(), h.Vector([5.0, 10.0, 12.0, 30.0, 31.0, 80.0])
+    stim.play(times)
+    ncs = {name: h.NetCon(stim, syn) for name, syn in syns.items()}
+    ncs['GLU'].weight[0], ncs['GLU'].weight[1] = 2e-3, 1e-3
+    ncs['AMPA'].weight[0], ncs['NMDA'].weight[0] = 2e-3, 1e-3
+    rec = {name: h.Vector().record(ref) for name, ref in (
+        ('g_ampa', syns['GLU']._ref_g_ampa), ('g_nmda', syns['GLU']._ref_g_nmda), ('i', syns['GLU']._ref_i),
+        ('ica', syns['GLU']._ref_ica), ('ampa_g', syns['AMPA']._ref_g), ('nmda_g', syns['NMDA']._ref_g),
+        ('ampa_i', syns['AMPA']._ref_i), ('nmda_i', syns['NMDA']._ref_i), ('nmda_ica', syns['NMDA']._ref_ica))}
+    h.dt = 0.025
+    h.finitialize(-40)
+    h.continuerun(150)
+    rec = {name: np.array(vec) for name, vec in rec.items()}
+    def close(a, b):
+        return np.abs(a - b).max() <= 1e-9 * np.abs(b).max()
+    assert rec['ampa_g'].max() > 0 and rec['nmda_i'].min() < 0
+    assert close(rec['g_ampa'], rec['ampa_g']) and close(rec['g_nmda'], rec['nmda_g'])
+    assert close(rec['i'], rec['ampa_i'] + rec['nmda_i'])
+    assert close(rec['ica'], rec['nmda_ica'])
+    # short-term plasticity state (Pv, P, Use, t0) after the last event, delivered at 81 ms
+    glu = [ncs['GLU'].weight[k] for k in range(2, 6)]
+    for name in ('AMPA', 'NMDA'):
+        assert np.allclose([ncs[name].weight[k] for k in range(1, 5)], glu, rtol=1e-12, atol=0)
+    assert glu[1] < 1 and glu[3] == 81.0
@@ -0,0 +1,45 @@
+'''
+checks of the compiled cell templates (needs NEURON and netpyne)
+'''
+
+from types import SimpleNamespace
+import pytest
+pytest.importorskip('netpyne')
+import templates
+
+RULE = {'conds': {'cellType': 'X'},
+        'secs': {'soma': {'geom': {'diam': 10.0, 'L': 10.0, 'Ra': 100.0, 'cm': 1.0},
+                          'mechs': {'pas': {'g': 1e-4, 'e': -65.0}}},
+                 'dend': {'geom': {'diam': 2.0, 'L': 200.0, 'nseg': 5},
+                          'mechs': {'pas': {'g': 2e-4, 'e': -70.0}},
+                          'topol': {'parentSec': 'soma', 'parentX': 1.0, 'childX': 0.0}}}}
+
+def test_template_builds_the_rule():
+    cell = templates.build_cell(RULE)
+    soma, dend = cell.secs['soma']['hObj'], cell.secs['dend']['hObj']
+    assert dend.nseg == 5 and dend.L == 200.0 and soma.diam == 10.0
+    assert dend.parentseg().sec == soma
+    assert dend(0.5).pas.g == 2e-4 and soma(0.5).pas.e == -65.0
+
+def test_fingerprint_ignores_conds():
+    other = dict(RULE, conds={'cellType': 'Y'})
+    assert templates.fingerprint(other) == templates.fingerprint(RULE)
+    assert templates.get_template(other) is templates.get_template(RULE)
+
+def test_not_compilable():
+    assert not templates.template.compilable(dict(RULE, vars={'a': 1}))
+    pointp = {'secs': {'soma': {'geom': {'L': 10.0}, 'pointps': {'ic': {'mod': 'IClamp'}}}}}
+    assert templates.get_template(pointp) is None
+
+def test_rule_fingerprinted_once_per_label(monkeypatch):
+    calls = []
+    fingerprint = templates.fingerprint
+    monkeypatch.setattr(templates, 'fingerprint', lambda rule: calls.append(1) or fingerprint(rule))
+    monkeypatch.setattr(templates, '_labels', {})
+    monkeypatch.setattr(templates.sim, 'cfg', SimpleNamespace(recordDipolesHNN=False), raising=False)
+    for i in range(5):
+        templates.templatecell.createNEURONObj(templates.holder(), RULE, 'X')
+    assert len(calls) == 1
+    # a new rule under the same label is looked up again
+    templates.templatecell.createNEURONObj(templates.holder(), dict(RULE), 'X')
+    assert len(calls) == 2
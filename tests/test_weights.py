@@ -0,0 +1,82 @@
+'''
+checks of the in-place weight updates of an instantiated network (needs NEURON,
+netpyne and the compiled mods, run from the directory nrnivmodl was run in)
+'''
+
+import copy
+import pytest
+pytest.importorskip('netpyne')
+from neuron import h
+
+def _compiled():
+    try:
+        h.Section(name='probe').insert('HH2')
+    except ValueError:
+        return False
+    return True
+
+pytestmark = pytest.mark.skipif(not _compiled(), reason='mods not compiled')
+
+from netpyne import specs, sim
+import cells
+import connectivity
+import weights
+
+TABLE = [('Ab_SAI', 'PKC', 1.0, 0.5, [('AMPA', 'Ab_EX_AMPA'), ('NMDA', 'Ab_EX_NMDA')])]
+
+def small_network(fuse):
+    # 6 afferents onto 4 PKC cells, the AMPA and NMDA weights of cfg_mechanical
+    cfg = specs.SimConfig()
+    cfg.duration, cfg.dt = 200, 0.025
+    cfg.hParams = {'celsius': 36, 'v_init': -60}
+    cfg.includeParamsLabel = True
+    cfg.verbose = False
+    cfg.fuseGlutamate = fuse
+    cfg.Ab_EX_AMPA, cfg.Ab_EX_NMDA = 0.0221559, 0.015
+    netParams = specs.NetParams()
+    netParams.popParams['Ab_SAI'] = {'cellModel': 'VecStim', 'numCells': 6,
+                                     'spkTimes': [[10.0 + 7*i + 20*k for k in range(8)] for i in range(6)]}
+    netParams.popParams['PKC'] = {'cellType': 'PKC', 'numCells': 4}
+    netParams.cellParams['PKC'] = dict(copy.deepcopy(cells.PKCRule), conds={'cellType': 'PKC'})
+    netParams.synMechParams['AMPA'] = {'mod': 'AMPA_DynSyn', 'tau_rise': 0.1, 'tau_decay': 5}
+    netParams.synMechParams['NMDA'] = {'mod': 'NMDA_DynSyn', 'tau_rise': 2, 'tau_decay': 100}
+    netParams.synMechParams['GLU'] = {'mod': 'GLU_DynSyn', 'tau_rise_ampa': 0.1, 'tau_decay_ampa': 5,
+                                      'tau_rise_nmda': 2, 'tau_decay_nmda': 100}
+    connectivity.add_conn_params(netParams, cfg, TABLE)
+    sim.create(netParams=netParams, simConfig=cfg)
+    connectivity.set_fused_weights(sim.net, cfg, TABLE)
+    weights.build_index()
+    return cfg
+
+def spikes():
+    return list(sim.allSimData['spkt']), list(sim.allSimData['spkid'])
+
+def netcon_weights(cfg, names):
+    labels = connectivity.weight_labels(connectivity.compile_table(cfg, TABLE))
+    return {(label, i, n): conn['hObj'].weight[i]
+            for name in names for label, i in labels[name]
+            for n, conn in enumerate(weights._index[label])}
+
+@pytest.mark.parametrize('fuse', [False, True])
+def test_update_and_restore(fuse):
+    cfg = small_network(fuse)
+    names = ('Ab_EX_AMPA', 'Ab_EX_NMDA')
+    before = netcon_weights(cfg, names)
+    assert before and (fuse == any(i == 1 for label, i, n in before))
+    saved = {name: getattr(cfg, name) for name in names}
+    weights.run({})
+    first = spikes()
+    assert first[0]
+    n = weights.update_weights({name: 2 * w for name, w in saved.items()})
+    after = netcon_weights(cfg, names)
+    assert n == len(before)
+    assert all(after[key] == 2 * before[key] for key in before)
+    weights.run({})
+    weights.run(saved)
+    assert netcon_weights(cfg, names) == before
+    assert spikes() == first
+
+def test_unknown_weight():
+    small_network(False)
+    with pytest.raises(KeyError):
+        weights.update_weights({'Ab_EX_GABA': 0.1})
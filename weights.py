@@ -0,0 +1,75 @@
+'''
+in-place update of the synaptic weights of the instantiated network (GA and
+weight sweeps): the NetCons of every connParams rule are indexed once after
+creation, and a dict of cfg weight names rewrites them and re-runs the
+simulation without rebuilding the network
+'''
+
+from netpyne import sim
+import connectivity
+
+_index = None
+_net = None
+
+def netcon_index(net=None):
+    """
+    Returns {connParams label: [conns]}, the connections (with their NetCon in
+    'hObj') created by every rule on this node. Requires cfg.includeParamsLabel.
+    """
+    if net is None:
+        net = sim.net
+    index = {label: [] for label in net.params.connParams}
+    for cell in net.cells:
+        for conn in cell.conns:
+            index.setdefault(conn.get('label'), []).append(conn)
+    if None in index:
+        raise ValueError('connections without label, set cfg.includeParamsLabel')
+    return index
+
+def build_index(net=None):
+    """
+    (Re)builds the label to NetCon index used by update_weights, to be called
+    after the network is created (done on the first update otherwise).
+    """
+    global _index, _net
+    _net = net if net is not None else sim.net
+    _index = netcon_index(_net)
+    return _index
+
+def update_weights(weights, cfg=None, table=connectivity.CONNECTIVITY):
+    """
+    Sets the cfg weights given as {cfg weight name: weight} (e.g. {'Ab_EX_AMPA':
+    0.02}) in the live network: the NetCons of every rule using the weight, the
+    conns and connParams of those rules, and cfg. Returns the number of NetCons
+    changed.
+    """
+    if cfg is None:
+        cfg = sim.cfg
+    index = _index if _net is sim.net else build_index()
+    labels = connectivity.weight_labels(connectivity.compile_table(cfg, table))
+    n = 0
+    for name, weight in weights.items():
+        if name not in labels:
+            raise KeyError('%s is not a synaptic weight of the connectivity table' %name)
+        setattr(cfg, name, weight)
+        for label, i in labels[name]:
+            if i == 0 and label in sim.net.params.connParams:
+                sim.net.params.connParams[label]['weight'] = weight
+            for conn in index.get(label, []):
+                if i == 0:
+                    conn['weight'] = weight
+                if 'hObj' in conn:
+                    conn['hObj'].weight[i] = weight
+                    n += 1
+    return n
+
+def run(weights, analyze=False):
+    """
+    Updates the weights and re-runs the simulation of the existing network
+    (reinitialized by sim.simulate), returns sim.allSimData.
+    """
+    update_weights(weights)
+    sim.simulate()
+    if analyze:
+        sim.analyze()
+    return sim.allSimData